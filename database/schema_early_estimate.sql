@@ -0,0 +1,5 @@
+-- Uploads analyzed in early estimate mode: items are queued as a stratified random
+-- sample (lambda/early_estimate.py) and the status reports projected revenue with a
+-- confidence interval while processing
+ALTER TABLE uploads
+ADD COLUMN IF NOT EXISTS early_estimate BOOLEAN DEFAULT FALSE;
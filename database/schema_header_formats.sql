@@ -0,0 +1,23 @@
+-- Known manifest header rows, keyed by a fingerprint of the normalized header row,
+-- with the format and column mapping picked for them
+
+CREATE TABLE IF NOT EXISTS header_formats (
+    fingerprint VARCHAR(64) PRIMARY KEY,  -- SHA-256 of the normalized header row
+    format VARCHAR(50) NOT NULL,
+    column_map JSONB,  -- field -> normalized header, for mapping-driven formats
+    headers JSONB NOT NULL,  -- normalized header row, for reference
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP  -- rows not seen for HEADER_FORMAT_TTL_DAYS expire
+);
+
+ALTER TABLE header_formats
+ADD COLUMN IF NOT EXISTS last_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
+
+CREATE INDEX IF NOT EXISTS idx_header_formats_last_seen ON header_formats(last_seen_at DESC);
+
+-- Data rows of headerless files learned as header rows (numeric or price cells)
+DELETE FROM header_formats
+WHERE EXISTS (
+    SELECT 1 FROM jsonb_array_elements_text(headers) AS cell
+    WHERE cell ~ '^[-+]?[$€£]?\s*[-+]?([0-9][0-9,]*\.?[0-9]*|\.[0-9]+)\s*%?$'
+);
@@ -0,0 +1,19 @@
+-- Fingerprint of the inputs of each item's analysis (identity, MSRP, condition, see
+-- lambda/item_reuse.py) and when the analysis was made, so re-uploaded manifests can
+-- reuse recent analyses of unchanged items instead of queueing them again. A reused
+-- analysis records the item it was first made for (reused_from), so copies are left out
+-- of the local pricing history and the similar item index
+ALTER TABLE items
+ADD COLUMN IF NOT EXISTS fingerprint VARCHAR(64),
+ADD COLUMN IF NOT EXISTS analyzed_at TIMESTAMP,
+ADD COLUMN IF NOT EXISTS reused_from INTEGER;
+
+-- Analyzed items count as analyzed when they were last updated
+UPDATE items
+SET analyzed_at = updated_at
+WHERE analyzed_at IS NULL
+AND status = 'processed';
+
+CREATE INDEX IF NOT EXISTS idx_items_fingerprint_analyzed
+ON items(fingerprint, analyzed_at DESC)
+WHERE status = 'processed';
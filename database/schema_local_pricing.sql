@@ -0,0 +1,9 @@
+-- Local pricing model (lambda/local_pricing.py): the brand of each item is stored as a
+-- model feature, and priced_by records which path priced it ('ai', 'local' or 'similar'), so the
+-- model is trained on AI analyses only, never on its own predictions
+ALTER TABLE items
+ADD COLUMN IF NOT EXISTS brand VARCHAR(255),
+ADD COLUMN IF NOT EXISTS priced_by VARCHAR(20);
+
+CREATE INDEX IF NOT EXISTS idx_items_priced_analyzed ON items(analyzed_at)
+WHERE status = 'processed';
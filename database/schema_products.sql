@@ -0,0 +1,41 @@
+-- Global product catalog, shared by all uploads and used as an enrichment cache
+
+CREATE TABLE IF NOT EXISTS products (
+    asin VARCHAR(20) PRIMARY KEY,
+    upc VARCHAR(20),
+    model VARCHAR(100),
+    normalized_title TEXT,
+    title TEXT,
+    brand VARCHAR(255),
+    category VARCHAR(255),
+    list_price DECIMAL(10, 2),
+    current_market_price DECIMAL(10, 2),
+    image_url TEXT,
+    features TEXT,  -- JSON array of features
+    -- When each field was last refreshed from an external source, e.g. {"title": "2025-01-01T00:00:00"}
+    field_updated_at JSONB NOT NULL DEFAULT '{}'::jsonb,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Secondary keys used to match manifest items without an ASIN
+CREATE INDEX IF NOT EXISTS idx_products_upc ON products(upc);
+CREATE INDEX IF NOT EXISTS idx_products_model ON products(model);
+CREATE INDEX IF NOT EXISTS idx_products_normalized_title ON products(normalized_title);
+
+DROP TRIGGER IF EXISTS update_products_updated_at ON products;
+CREATE TRIGGER update_products_updated_at
+    BEFORE UPDATE ON products
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- Lookups that found nothing, per source, so known-unmatched products skip
+-- external lookups until the miss expires (CATALOG_MISS_TTL_DAYS)
+CREATE TABLE IF NOT EXISTS lookup_misses (
+    source VARCHAR(50) NOT NULL,  -- amazon_upc, upc_database, amazon_search, ai_asin
+    lookup_key TEXT NOT NULL,  -- UPC or normalized title
+    missed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    miss_count INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (source, lookup_key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_lookup_misses_lookup_key ON lookup_misses(lookup_key);
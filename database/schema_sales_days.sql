@@ -0,0 +1,28 @@
+-- Sales time estimate of each item as a range of days, parsed once when the analysis
+-- is saved ("2-4 weeks" -> 14, 28), so sales time aggregates are numeric queries
+ALTER TABLE items
+ADD COLUMN IF NOT EXISTS sales_days_min INTEGER,
+ADD COLUMN IF NOT EXISTS sales_days_max INTEGER;
+
+-- Backfill analyzed items (same rules as normalization.parse_sales_days:
+-- month = 30 days, week = 7 days, lowest and highest number of the estimate)
+UPDATE items
+SET sales_days_min = parsed.low * parsed.unit_days,
+    sales_days_max = parsed.high * parsed.unit_days
+FROM (
+    SELECT id,
+           CASE
+               WHEN sales_time ILIKE '%month%' THEN 30
+               WHEN sales_time ILIKE '%week%' THEN 7
+               ELSE 1
+           END AS unit_days,
+           (SELECT MIN(n[1]::INTEGER) FROM regexp_matches(sales_time, '(\d+)', 'g') AS n) AS low,
+           (SELECT MAX(n[1]::INTEGER) FROM regexp_matches(sales_time, '(\d+)', 'g') AS n) AS high
+    FROM items
+    WHERE sales_days_max IS NULL
+    AND sales_time ~* '(month|week|day)'
+) AS parsed
+WHERE items.id = parsed.id
+AND parsed.high IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_items_manifest_sales_days ON items(manifest_id, sales_days_max);
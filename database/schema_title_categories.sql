@@ -0,0 +1,5 @@
+-- Title categories of each item, classified once when the items are inserted
+-- (lambda/title_classifier.py): chart category breakdown and mock pricing group
+ALTER TABLE items
+ADD COLUMN IF NOT EXISTS title_category VARCHAR(50),
+ADD COLUMN IF NOT EXISTS price_category VARCHAR(50);
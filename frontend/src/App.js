@@ -17,6 +17,9 @@ import SingleItemChecker from './components/SingleItemChecker';
 
 const API_BASE_URL = process.env.REACT_APP_API_URL || 'https://1biv76cy0j.execute-api.us-east-1.amazonaws.com';
 
+// Manifest files accepted for upload
+const MANIFEST_EXTENSIONS = ['.csv', '.gz', '.zip', '.xlsx'];
+
 function App() {
     const [uploadedFile, setUploadedFile] = useState(null);
     const [csvText, setCsvText] = useState('');
@@ -27,6 +30,8 @@ function App() {
     const [processingStatus, setProcessingStatus] = useState(null); // {processed: 0, total: 0}
     const [uploadId, setUploadId] = useState(null);
     const [uploadName, setUploadName] = useState('');
+    const [reuseAnalyses, setReuseAnalyses] = useState(false);
+    const [earlyEstimate, setEarlyEstimate] = useState(false);
     const [uploadHistory, setUploadHistory] = useState([]);
     const [showHistory, setShowHistory] = useState(false);
     const [mode, setMode] = useState('manifest'); // 'manifest' or 'single-item'
@@ -83,18 +88,21 @@ function App() {
 
     const onDrop = useCallback((acceptedFiles) => {
         const file = acceptedFiles[0];
-        if (file && file.type === 'text/csv') {
+        if (file && MANIFEST_EXTENSIONS.some((extension) => file.name.toLowerCase().endsWith(extension))) {
             setUploadedFile(file);
-            toast.success('CSV file uploaded successfully!');
+            toast.success('Manifest file uploaded successfully!');
         } else {
-            toast.error('Please upload a valid CSV file');
+            toast.error('Please upload a CSV, Excel, .gz or .zip manifest');
         }
     }, []);
 
     const { getRootProps, getInputProps, isDragActive } = useDropzone({
         onDrop,
         accept: {
-            'text/csv': ['.csv']
+            'text/csv': ['.csv'],
+            'application/gzip': ['.gz'],
+            'application/zip': ['.zip'],
+            'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet': ['.xlsx']
         },
         multiple: false
     });
@@ -158,13 +166,16 @@ function App() {
     const handleAnalysis = async () => {
         let fileContent = '';
         let filename = '';
+        let fileEncoding = null;
 
         if (uploadMethod === 'file') {
             if (!uploadedFile) {
                 toast.error('Please upload a CSV file first');
                 return;
             }
-            fileContent = await readFileAsText(uploadedFile);
+            // Files are sent as base64 bytes, the backend detects the encoding (UTF-8, Windows-1252)
+            fileContent = await readFileAsBase64(uploadedFile);
+            fileEncoding = 'base64';
             filename = uploadedFile.name;
         } else {
             if (!csvText.trim()) {
@@ -184,7 +195,10 @@ function App() {
             const response = await axios.post(`${API_BASE_URL}/prod/upload`, {
                 file: fileContent,
                 filename: filename,
-                upload_name: uploadName.trim() || null
+                file_encoding: fileEncoding,
+                upload_name: uploadName.trim() || null,
+                reuse_analyses: reuseAnalyses,
+                early_estimate: earlyEstimate
             }, {
                 headers: {
                     'Content-Type': 'application/json',
@@ -227,12 +241,13 @@ function App() {
         }
     };
 
-    const readFileAsText = (file) => {
+    const readFileAsBase64 = (file) => {
         return new Promise((resolve, reject) => {
             const reader = new FileReader();
-            reader.onload = (e) => resolve(e.target.result);
+            // Data URL is "data:<type>;base64,<data>"
+            reader.onload = (e) => resolve(e.target.result.split(',')[1] || '');
             reader.onerror = (e) => reject(e);
-            reader.readAsText(file);
+            reader.readAsDataURL(file);
         });
     };
 
@@ -332,6 +347,36 @@ function App() {
                                     A timestamp will be automatically appended to ensure uniqueness
                                 </p>
                             </div>
+                            <div className="mt-4 flex items-start">
+                                <input
+                                    type="checkbox"
+                                    id="reuse-analyses"
+                                    checked={reuseAnalyses}
+                                    onChange={(e) => setReuseAnalyses(e.target.checked)}
+                                    className="mt-1 h-4 w-4 text-blue-600 border-gray-300 rounded focus:ring-blue-500"
+                                />
+                                <label htmlFor="reuse-analyses" className="ml-2 text-sm text-gray-700">
+                                    Reuse recent results for unchanged items
+                                    <span className="block text-xs text-gray-500">
+                                        Items analyzed in a previous upload with the same MSRP and condition keep their recent prices, only new or changed items are analyzed
+                                    </span>
+                                </label>
+                            </div>
+                            <div className="mt-4 flex items-start">
+                                <input
+                                    type="checkbox"
+                                    id="early-estimate"
+                                    checked={earlyEstimate}
+                                    onChange={(e) => setEarlyEstimate(e.target.checked)}
+                                    className="mt-1 h-4 w-4 text-blue-600 border-gray-300 rounded focus:ring-blue-500"
+                                />
+                                <label htmlFor="early-estimate" className="ml-2 text-sm text-gray-700">
+                                    Early estimate
+                                    <span className="block text-xs text-gray-500">
+                                        Analyzes a representative sample first and shows projected revenue with a confidence range that narrows as items finish
+                                    </span>
+                                </label>
+                            </div>
                         </div>
 
                         {/* Upload Method Selection */}
@@ -263,6 +263,12 @@ const AnalysisResults = ({ results, onReset, fileName }) => {
                             <p className="text-2xl font-semibold text-gray-900">
                                 {formatCurrency(summary?.projectedRevenue || 0)}
                             </p>
+                            {summary?.partial && summary?.estimate && (
+                                <p className="text-xs text-gray-500 mt-1">
+                                    Full manifest: {formatCurrency(summary.estimate.projectedRevenue)}
+                                    {' '}({Math.round(summary.estimate.confidence * 100)}% range {formatCurrency(summary.estimate.low)} - {formatCurrency(summary.estimate.high)})
+                                </p>
+                            )}
                         </div>
                     </div>
                 </div>
@@ -79,6 +79,32 @@ resource "aws_s3_bucket_server_side_encryption_configuration" "csv_uploads_encry
   }
 }
 
+# Result exports are only downloaded through short-lived presigned URLs
+resource "aws_s3_bucket_lifecycle_configuration" "csv_uploads_exports" {
+  bucket = aws_s3_bucket.csv_uploads.id
+
+  rule {
+    id     = "expire-exports"
+    status = "Enabled"
+
+    filter {
+      prefix = "exports/"
+    }
+
+    expiration {
+      days = 7
+    }
+
+    noncurrent_version_expiration {
+      noncurrent_days = 1
+    }
+
+    abort_incomplete_multipart_upload {
+      days_after_initiation = 1
+    }
+  }
+}
+
 resource "aws_s3_bucket_public_access_block" "csv_uploads_pab" {
   bucket = aws_s3_bucket.csv_uploads.id
 
@@ -391,12 +417,14 @@ resource "aws_lambda_function" "csv_processor" {
 
   environment {
     variables = {
-      DB_HOST             = aws_db_instance.arbitrage_db.endpoint
-      DB_NAME             = aws_db_instance.arbitrage_db.db_name
-      DB_USER             = aws_db_instance.arbitrage_db.username
-      DB_PASSWORD         = var.db_password
-      SQS_QUEUE_URL       = aws_sqs_queue.item_analysis_queue.url
-      API_KEYS_SECRET_ARN = data.aws_secretsmanager_secret.api_keys.arn
+      DB_HOST                = aws_db_instance.arbitrage_db.endpoint
+      DB_NAME                = aws_db_instance.arbitrage_db.db_name
+      DB_USER                = aws_db_instance.arbitrage_db.username
+      DB_PASSWORD            = var.db_password
+      SQS_QUEUE_URL          = aws_sqs_queue.item_analysis_queue.url
+      SQS_PRIORITY_QUEUE_URL = aws_sqs_queue.item_analysis_priority_queue.url
+      API_KEYS_SECRET_ARN    = data.aws_secretsmanager_secret.api_keys.arn
+      EXPORTS_BUCKET         = aws_s3_bucket.csv_uploads.bucket
     }
   }
 
@@ -487,7 +515,8 @@ resource "aws_iam_role_policy" "lambda_policy" {
         Effect = "Allow"
         Action = [
           "s3:GetObject",
-          "s3:PutObject"
+          "s3:PutObject",
+          "s3:AbortMultipartUpload"
         ]
         Resource = [
           "${aws_s3_bucket.csv_uploads.arn}/*"
@@ -639,11 +668,32 @@ resource "aws_lambda_permission" "api_gateway" {
 resource "aws_api_gateway_deployment" "arbitrage_api" {
   depends_on = [
     aws_api_gateway_integration.upload_integration,
-    aws_api_gateway_integration.upload_options_integration
+    aws_api_gateway_integration.upload_options_integration,
+    aws_api_gateway_method.export_get,
+    aws_api_gateway_integration.export_lambda,
+    aws_api_gateway_method.export_options,
+    aws_api_gateway_integration.export_options
   ]
 
   rest_api_id = aws_api_gateway_rest_api.arbitrage_api.id
   stage_name  = "prod"
+
+  # Redeploy the stage when the routes change (a deployment is a snapshot of the API)
+  triggers = {
+    redeployment = sha1(jsonencode([
+      aws_api_gateway_integration.upload_integration,
+      aws_api_gateway_integration.upload_options_integration,
+      aws_api_gateway_resource.export_id,
+      aws_api_gateway_method.export_get,
+      aws_api_gateway_integration.export_lambda,
+      aws_api_gateway_method.export_options,
+      aws_api_gateway_integration.export_options
+    ]))
+  }
+
+  lifecycle {
+    create_before_destroy = true
+  }
 }
 
 # Variables
@@ -714,6 +764,19 @@ resource "aws_sqs_queue" "item_analysis_queue" {
   })
 }
 
+# High priority items (the ones covering most of a manifest's value), consumed by their own workers
+resource "aws_sqs_queue" "item_analysis_priority_queue" {
+  name                       = "arbitrage-item-analysis-priority-queue"
+  visibility_timeout_seconds = 900  # 15 minutes (match Lambda timeout)
+  message_retention_seconds  = 86400  # 24 hours
+  receive_wait_time_seconds  = 20  # Long polling
+  
+  redrive_policy = jsonencode({
+    deadLetterTargetArn = aws_sqs_queue.item_analysis_dlq.arn
+    maxReceiveCount     = 3
+  })
+}
+
 # Dead Letter Queue for failed items
 resource "aws_sqs_queue" "item_analysis_dlq" {
   name                      = "arbitrage-item-analysis-dlq"
@@ -733,11 +796,12 @@ resource "aws_lambda_function" "item_processor" {
 
   environment {
     variables = {
-      DB_HOST             = aws_db_instance.arbitrage_db.endpoint
-      DB_NAME             = "arbitrage"
-      DB_USER             = "arbitrage_user"
-      DB_PASSWORD         = var.db_password
-      API_KEYS_SECRET_ARN = data.aws_secretsmanager_secret.api_keys.arn
+      DB_HOST                 = aws_db_instance.arbitrage_db.endpoint
+      DB_NAME                 = "arbitrage"
+      DB_USER                 = "arbitrage_user"
+      DB_PASSWORD             = var.db_password
+      API_KEYS_SECRET_ARN     = data.aws_secretsmanager_secret.api_keys.arn
+      SIMILARITY_INDEX_BUCKET = aws_s3_bucket.csv_uploads.bucket
     }
   }
 
@@ -759,6 +823,18 @@ resource "aws_lambda_event_source_mapping" "sqs_trigger" {
   }
 }
 
+# SQS trigger for high priority items (runs alongside the main queue's workers)
+resource "aws_lambda_event_source_mapping" "sqs_priority_trigger" {
+  event_source_arn = aws_sqs_queue.item_analysis_priority_queue.arn
+  function_name    = aws_lambda_function.item_processor.arn
+  batch_size       = 1  # Process one item at a time
+  enabled          = true
+  
+  scaling_config {
+    maximum_concurrency = 5
+  }
+}
+
 # Add SQS permissions to Lambda role
 resource "aws_iam_role_policy" "lambda_sqs_policy" {
   name = "lambda-sqs-policy"
@@ -777,6 +853,7 @@ resource "aws_iam_role_policy" "lambda_sqs_policy" {
         ]
         Resource = [
           aws_sqs_queue.item_analysis_queue.arn,
+          aws_sqs_queue.item_analysis_priority_queue.arn,
           aws_sqs_queue.item_analysis_dlq.arn
         ]
       }
@@ -0,0 +1,90 @@
+# API Gateway /export/{upload_id} endpoint configuration (?format=csv|parquet)
+
+resource "aws_api_gateway_resource" "export" {
+  rest_api_id = aws_api_gateway_rest_api.arbitrage_api.id
+  parent_id   = aws_api_gateway_rest_api.arbitrage_api.root_resource_id
+  path_part   = "export"
+}
+
+resource "aws_api_gateway_resource" "export_id" {
+  rest_api_id = aws_api_gateway_rest_api.arbitrage_api.id
+  parent_id   = aws_api_gateway_resource.export.id
+  path_part   = "{upload_id}"
+}
+
+# GET method for export endpoint
+resource "aws_api_gateway_method" "export_get" {
+  rest_api_id   = aws_api_gateway_rest_api.arbitrage_api.id
+  resource_id   = aws_api_gateway_resource.export_id.id
+  http_method   = "GET"
+  authorization = "NONE"
+}
+
+# Integration with Lambda
+resource "aws_api_gateway_integration" "export_lambda" {
+  rest_api_id             = aws_api_gateway_rest_api.arbitrage_api.id
+  resource_id             = aws_api_gateway_resource.export_id.id
+  http_method             = aws_api_gateway_method.export_get.http_method
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.csv_processor.invoke_arn
+}
+
+# OPTIONS method for CORS preflight
+resource "aws_api_gateway_method" "export_options" {
+  rest_api_id   = aws_api_gateway_rest_api.arbitrage_api.id
+  resource_id   = aws_api_gateway_resource.export_id.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_integration" "export_options" {
+  rest_api_id = aws_api_gateway_rest_api.arbitrage_api.id
+  resource_id = aws_api_gateway_resource.export_id.id
+  http_method = aws_api_gateway_method.export_options.http_method
+  type        = "MOCK"
+  
+  request_templates = {
+    "application/json" = "{\"statusCode\": 200}"
+  }
+}
+
+resource "aws_api_gateway_method_response" "export_options_200" {
+  rest_api_id = aws_api_gateway_rest_api.arbitrage_api.id
+  resource_id = aws_api_gateway_resource.export_id.id
+  http_method = aws_api_gateway_method.export_options.http_method
+  status_code = "200"
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+
+  response_models = {
+    "application/json" = "Empty"
+  }
+}
+
+resource "aws_api_gateway_integration_response" "export_options_200" {
+  rest_api_id = aws_api_gateway_rest_api.arbitrage_api.id
+  resource_id = aws_api_gateway_resource.export_id.id
+  http_method = aws_api_gateway_method.export_options.http_method
+  status_code = aws_api_gateway_method_response.export_options_200.status_code
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token,X-Amz-User-Agent,X-Amz-Source-Arn,X-Amz-Trace-Id'"
+    "method.response.header.Access-Control-Allow-Methods" = "'GET,OPTIONS'"
+    "method.response.header.Access-Control-Allow-Origin"  = "'*'"
+  }
+}
+
+# Lambda permission for export endpoint
+resource "aws_lambda_permission" "api_gateway_export" {
+  statement_id  = "AllowAPIGatewayInvokeExport"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.csv_processor.function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_api_gateway_rest_api.arbitrage_api.execution_arn}/*/*"
+}
+
@@ -4,13 +4,13 @@ A simple Python wrapper for the last version of the Amazon Product Advertising A
 """
 
 import time
-from typing import List, Union
+from typing import Dict, Generator, List, Union
 
 from . import models
-from .errors import InvalidArgument
+from .errors import InvalidArgument, ItemsNotFound
 from .helpers import arguments, requests
 from .helpers.generators import get_list_chunks
-from .helpers.items import sort_items
+from .helpers.items import map_items_by_external_id, sort_items
 from .sdk.api.default_api import DefaultApi
 
 
@@ -62,6 +62,7 @@ class AmazonApi:
         currency_of_preference: str = None,
         languages_of_preference: List[str] = None,
         include_unavailable: bool = False,
+        resource_profile: models.ResourceProfile = None,
         **kwargs
     ) -> List[models.Item]:
         """Get items information from Amazon.
@@ -81,6 +82,9 @@ class AmazonApi:
             include_unavailable (``bool``, optional): The returned list includes not
                 available items. Not available items have the ASIN and item_info equals
                 None. Defaults to False.
+            resource_profile (``models.ResourceProfile``, optional): Subset of
+                resources requested to Amazon, use it to reduce response size when
+                only some fields are needed. Defaults to all resources.
             kwargs (``dict``, optional): Other arguments to be passed to the Amazon API.
 
         Returns:
@@ -105,14 +109,152 @@ class AmazonApi:
         items_ids = arguments.get_items_ids(items)
         results = []
 
-        for asin_chunk in get_list_chunks(list(set(items_ids)), chunk_size=10):
-            request = requests.get_items_request(self, asin_chunk, **kwargs)
-            self._throttle()
-            items_response = requests.get_items_response(self, request)
+        for _, items_response in self._get_items_chunks(
+            items_ids, resource_profile, **kwargs
+        ):
             results.extend(items_response)
 
         return sort_items(results, items_ids, include_unavailable)
 
+    def iter_items(
+        self,
+        items: Union[str, List[str]],
+        condition: models.Condition = None,
+        merchant: models.Merchant = None,
+        currency_of_preference: str = None,
+        languages_of_preference: List[str] = None,
+        include_unavailable: bool = False,
+        resource_profile: models.ResourceProfile = None,
+        **kwargs
+    ) -> Generator[models.Item, None, None]:
+        """Streaming version of ``get_items``. Items are yielded as soon as the
+        request for their chunk of 10 ASINs returns, instead of waiting for the whole
+        list to be fetched. Repeated ASINs are only requested and yielded once.
+
+        Args:
+            items (``str`` | ``list[str]``): One or more items, using ASIN or product
+                URL. Items in string format should be separated by commas.
+            condition (``models.Condition``, optional): Filters offers by condition
+                type. Defaults to Any.
+            merchant (``models.Merchant``, optional): Filters search results to return
+                items having at least an offer sold by target merchant. Defaults to All.
+            currency_of_preference (``str``, optional): Currency of preference in which
+                the prices information should be returned. Expected currency code format
+                is ISO 4217.
+            languages_of_preference (``list[str]``, optional): Languages in order of
+                preference in which the item information should be returned.
+            include_unavailable (``bool``, optional): Also yield not available items.
+                Not available items have the ASIN and item_info equals None. Defaults
+                to False.
+            resource_profile (``models.ResourceProfile``, optional): Subset of
+                resources requested to Amazon, use it to reduce response size when
+                only some fields are needed. Defaults to all resources.
+            kwargs (``dict``, optional): Other arguments to be passed to the Amazon API.
+
+        Yields:
+            ``models.Item``: Items with Amazon information, in request order.
+
+        Raises:
+            ``InvalidArgumentException``
+            ``MalformedRequestException``
+            ``ApiRequestException``
+            ``ItemsNotFoundException``
+        """
+
+        kwargs.update(
+            {
+                "condition": condition,
+                "merchant": merchant,
+                "currency_of_preference": currency_of_preference,
+                "languages_of_preference": languages_of_preference,
+            }
+        )
+
+        items_ids = arguments.get_items_ids(items)
+
+        for asin_chunk, items_response in self._get_items_chunks(
+            items_ids, resource_profile, **kwargs
+        ):
+            yield from sort_items(items_response, asin_chunk, include_unavailable)
+
+    def get_items_by_external_ids(
+        self,
+        items: Union[str, List[str]],
+        item_id_type: models.ItemIdType,
+        condition: models.Condition = None,
+        merchant: models.Merchant = None,
+        currency_of_preference: str = None,
+        languages_of_preference: List[str] = None,
+        resource_profile: models.ResourceProfile = None,
+        **kwargs
+    ) -> Dict[str, models.Item]:
+        """Resolves product identifiers like UPC, EAN or ISBN to Amazon items. Up to
+        10 identifiers are sent in each request.
+
+        Args:
+            items (``str`` | ``list[str]``): One or more identifiers. Identifiers in
+                string format should be separated by commas.
+            item_id_type (``models.ItemIdType``): Type of the identifiers, one of EAN,
+                ISBN or UPC.
+            condition (``models.Condition``, optional): Filters offers by condition
+                type. Defaults to Any.
+            merchant (``models.Merchant``, optional): Filters search results to return
+                items having at least an offer sold by target merchant. Defaults to All.
+            currency_of_preference (``str``, optional): Currency of preference in which
+                the prices information should be returned. Expected currency code format
+                is ISO 4217.
+            languages_of_preference (``list[str]``, optional): Languages in order of
+                preference in which the item information should be returned.
+            resource_profile (``models.ResourceProfile``, optional): Subset of
+                resources requested to Amazon. External ids are always requested, as
+                they are needed to match items with identifiers. Defaults to all
+                resources.
+            kwargs (``dict``, optional): Other arguments to be passed to the Amazon API.
+
+        Returns:
+            ``dict[str, models.Item]``: Items found, keyed by requested identifier.
+            Identifiers without a match are not included.
+
+        Raises:
+            ``InvalidArgumentException``
+            ``MalformedRequestException``
+            ``ApiRequestException``
+        """
+
+        kwargs.update(
+            {
+                "item_id_type": item_id_type,
+                "condition": condition,
+                "merchant": merchant,
+                "currency_of_preference": currency_of_preference,
+                "languages_of_preference": languages_of_preference,
+            }
+        )
+
+        items_ids = arguments.get_external_ids(items, item_id_type)
+
+        if resource_profile is not None:
+            if isinstance(resource_profile, str):
+                resource_profile = (resource_profile,)
+            resource_profile = tuple(resource_profile) + ("ItemInfo.ExternalIds",)
+
+        results = {}
+
+        for id_chunk in get_list_chunks(list(dict.fromkeys(items_ids)), chunk_size=10):
+            request = requests.get_items_request(
+                self, id_chunk, resource_profile=resource_profile, **kwargs
+            )
+            self._throttle()
+            try:
+                items_response = requests.get_items_response(self, request)
+            except ItemsNotFound:
+                continue
+            results.update(
+                map_items_by_external_id(items_response, id_chunk, item_id_type)
+            )
+
+        return results
+
     def search_items(
         self,  # NOSONAR
         item_count: int = None,
@@ -136,6 +278,7 @@ class AmazonApi:
         min_reviews_rating: int = None,
         search_index: str = None,
         sort_by: models.SortBy = None,
+        resource_profile: models.ResourceProfile = None,
         **kwargs
     ) -> models.SearchResult:
         """Searches for items on Amazon based on a search query. At least one of the
@@ -185,6 +328,9 @@ class AmazonApi:
             search_index (``str``, optional): Indicates the product category to search.
                 Defaults to All.
             sort_by (``models.SortBy``, optional): The way in which items are sorted.
+            resource_profile (``models.ResourceProfile``, optional): Subset of
+                resources requested to Amazon, use it to reduce response size when
+                only some fields are needed. Defaults to all resources.
             kwargs (``dict``, optional): Other arguments to be passed to the Amazon API.
 
         Returns:
@@ -224,7 +370,9 @@ class AmazonApi:
         )
 
         arguments.check_search_args(**kwargs)
-        request = requests.get_search_items_request(self, **kwargs)
+        request = requests.get_search_items_request(
+            self, resource_profile=resource_profile, **kwargs
+        )
         self._throttle()
         return requests.get_search_items_response(self, request)
 
@@ -328,6 +476,16 @@ class AmazonApi:
         self._throttle()
         return requests.get_browse_nodes_response(self, request)
 
+    def _get_items_chunks(self, items_ids: List[str], resource_profile, **kwargs):
+        unique_ids = list(dict.fromkeys(items_ids))
+
+        for asin_chunk in get_list_chunks(unique_ids, chunk_size=10):
+            request = requests.get_items_request(
+                self, asin_chunk, resource_profile=resource_profile, **kwargs
+            )
+            self._throttle()
+            yield asin_chunk, requests.get_items_response(self, request)
+
     def _throttle(self):
         wait_time = self.throttling - (time.time() - self._last_query_time)
         if wait_time > 0:
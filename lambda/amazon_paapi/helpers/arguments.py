@@ -1,9 +1,11 @@
 """Module with helper functions for managing arguments."""
 
 
+import re
 from typing import List, Union
 
 from ..errors import InvalidArgument
+from ..sdk.models import ItemIdType
 from ..tools import get_asin
 
 
@@ -23,6 +25,27 @@ def get_items_ids(items: Union[str, List[str]]) -> List[str]:
     return items_ids
 
 
+def get_external_ids(items: Union[str, List[str]], item_id_type: str) -> List[str]:
+    if item_id_type not in (ItemIdType.EAN, ItemIdType.ISBN, ItemIdType.UPC):
+        raise InvalidArgument("Invalid item_id_type, it should be EAN, ISBN or UPC")
+
+    if not isinstance(items, str) and not isinstance(items, List):
+        raise InvalidArgument(
+            "Invalid items argument, it should be a string or List of strings"
+        )
+
+    if isinstance(items, str):
+        items = items.split(",")
+
+    items_ids = [re.sub(r"[\s-]", "", x).upper() for x in items]
+
+    for item_id in items_ids:
+        if not re.search(r"^\d{7,13}[\dX]$", item_id):
+            raise InvalidArgument(f"Invalid {item_id_type}: {item_id}")
+
+    return items_ids
+
+
 def check_search_args(**kwargs):
     check_search_mandatory_args(**kwargs)
     check_search_pagination_args(**kwargs)
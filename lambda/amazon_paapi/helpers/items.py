@@ -1,6 +1,6 @@
 """Module to manage items"""
 
-from typing import List
+from typing import Dict, List
 
 from .. import models
 
@@ -8,13 +8,48 @@ from .. import models
 def sort_items(
     items: List[models.Item], items_ids: List[str], include_unavailable: bool
 ) -> List[models.Item]:
+    items_by_asin: Dict[str, models.Item] = {}
+    for item in items:
+        items_by_asin.setdefault(item.asin, item)
+
     sorted_items = []
 
     for asin in items_ids:
-        matches = list(filter(lambda item, asin=asin: item.asin == asin, items))
-        if matches:
-            sorted_items.append(matches[0])
+        match = items_by_asin.get(asin)
+        if match is not None:
+            sorted_items.append(match)
         elif include_unavailable:
             sorted_items.append(models.Item(asin=asin))
 
     return sorted_items
+
+
+EXTERNAL_ID_ATTRIBUTES = {"EAN": "ea_ns", "ISBN": "isb_ns", "UPC": "up_cs"}
+
+
+def map_items_by_external_id(
+    items: List[models.Item], items_ids: List[str], item_id_type: str
+) -> Dict[str, models.Item]:
+    """Returns the first item matching each requested identifier. Identifiers are
+    compared without leading zeros, as Amazon may return a UPC as a 13 digit EAN.
+    """
+    requested = {item_id.lstrip("0"): item_id for item_id in items_ids}
+    mapped_items: Dict[str, models.Item] = {}
+
+    for item in items:
+        for value in _get_external_ids(item, item_id_type):
+            item_id = requested.get(value.strip().upper().lstrip("0"))
+            if item_id is not None:
+                mapped_items.setdefault(item_id, item)
+
+    if not mapped_items and len(items_ids) == 1 and len(items) == 1:
+        mapped_items[items_ids[0]] = items[0]
+
+    return mapped_items
+
+
+def _get_external_ids(item: models.Item, item_id_type: str) -> List[str]:
+    item_info = getattr(item, "item_info", None)
+    external_ids = getattr(item_info, "external_ids", None)
+    attribute = getattr(external_ids, EXTERNAL_ID_ATTRIBUTES[item_id_type], None)
+    return getattr(attribute, "display_values", None) or []
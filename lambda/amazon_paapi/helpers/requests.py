@@ -1,8 +1,9 @@
 """Module with helper functions for creating requests."""
 
 
+import functools
 import inspect
-from typing import List
+from typing import List, Optional, Tuple
 
 from ..errors import (
     AssociateValidationError,
@@ -28,10 +29,13 @@ from ..sdk.models.search_items_resource import SearchItemsResource
 from ..sdk.rest import ApiException
 
 
-def get_items_request(amazon_api, asin_chunk: List[str], **kwargs) -> GetItemsRequest:
+def get_items_request(
+    amazon_api, asin_chunk: List[str], resource_profile=None, **kwargs
+) -> GetItemsRequest:
+    resources = _get_request_resources(GetItemsResource, resource_profile)
     try:
         return GetItemsRequest(
-            resources=_get_request_resources(GetItemsResource),
+            resources=resources,
             partner_type=PartnerType.ASSOCIATES,
             marketplace=amazon_api.marketplace,
             partner_tag=amazon_api.tag,
@@ -56,10 +60,13 @@ def get_items_response(amazon_api, request: GetItemsRequest) -> List[Item]:
     return response.items_result.items
 
 
-def get_search_items_request(amazon_api, **kwargs) -> SearchItemsRequest:
+def get_search_items_request(
+    amazon_api, resource_profile=None, **kwargs
+) -> SearchItemsRequest:
+    resources = _get_request_resources(SearchItemsResource, resource_profile)
     try:
         return SearchItemsRequest(
-            resources=_get_request_resources(SearchItemsResource),
+            resources=resources,
             partner_type=PartnerType.ASSOCIATES,
             marketplace=amazon_api.marketplace,
             partner_tag=amazon_api.tag,
@@ -141,12 +148,51 @@ def get_browse_nodes_response(
     return response.browse_nodes_result.browse_nodes
 
 
-def _get_request_resources(resources) -> List[str]:
+def _get_request_resources(resources, profile=None) -> List[str]:
+    profile = _get_profile_key(profile)
+    request_resources = _get_cached_resources(resources, profile)
+
+    if not request_resources:
+        raise InvalidArgument(
+            f"Resource profile does not match any resource for {resources.__name__}"
+        )
+
+    return list(request_resources)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_cached_resources(resources, profile: Optional[Tuple[str, ...]]):
     resources = inspect.getmembers(resources, lambda a: not inspect.isroutine(a))
     resources = [
         x[-1] for x in resources if isinstance(x[-1], str) and x[0][0:2] != "__"
     ]
-    return resources
+
+    if profile is not None:
+        resources = [
+            x
+            for x in resources
+            if any(x == prefix or x.startswith(prefix + ".") for prefix in profile)
+        ]
+
+    return tuple(resources)
+
+
+def _get_profile_key(profile) -> Optional[Tuple[str, ...]]:
+    if profile is None:
+        return None
+
+    if isinstance(profile, str):
+        profile = (profile,)
+
+    if not isinstance(profile, (list, tuple)) or not all(
+        isinstance(x, str) for x in profile
+    ):
+        raise InvalidArgument(
+            "Resource profile should be a models.ResourceProfile or a list of"
+            " resource names."
+        )
+
+    return tuple(profile)
 
 
 def _manage_response_exceptions(error) -> None:
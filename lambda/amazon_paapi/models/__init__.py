@@ -1,18 +1,21 @@
-from ..sdk.models import Availability, Condition, Merchant, SortBy
+from ..sdk.models import Availability, Condition, ItemIdType, Merchant, SortBy
 from .browse_nodes_result import BrowseNode
 from .item_result import Item
 from .regions import Country
+from .resources import ResourceProfile
 from .search_result import SearchResult
 from .variations_result import VariationsResult
 
 __all__ = [
     "Availability",
     "Condition",
+    "ItemIdType",
     "Merchant",
     "SortBy",
     "BrowseNode",
     "Item",
     "Country",
+    "ResourceProfile",
     "SearchResult",
     "VariationsResult",
 ]
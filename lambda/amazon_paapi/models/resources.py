@@ -0,0 +1,19 @@
+class ResourceProfile:
+    """Named subsets of resources to request from Amazon. Each profile is a tuple of
+    resource prefixes, so ``"Offers.Listings.Price"`` also matches any nested
+    resource under it. ``FULL`` requests every resource available for the operation.
+    """
+
+    FULL = None
+    PRICE = (
+        "ItemInfo.Title",
+        "Offers.Listings.Price",
+        "Offers.Listings.SavingBasis",
+    )
+    PRICE_IMAGES = PRICE + ("Images.Primary",)
+    ENRICHMENT = PRICE_IMAGES + (
+        "ItemInfo.ByLineInfo",
+        "ItemInfo.Classifications",
+        "ItemInfo.ExternalIds",
+        "ItemInfo.Features",
+    )
@@ -32,6 +32,7 @@ from multiprocessing.pool import ThreadPool
 import os
 import re
 import tempfile
+import threading
 
 # python 2 and python 3 compatibility library
 import six
@@ -61,6 +62,10 @@ class ApiClient(object):
         the API.
     :param cookie: a cookie to include in the header when making calls
         to the API
+
+    The thread pool used by ``async_req=True`` calls is created on the first
+    async request and shared by every client. Close it with ``close_pool()``
+    or by using the client as a context manager.
     """
 
     PRIMITIVE_TYPES = (float, bool, bytes, six.text_type) + six.integer_types
@@ -75,6 +80,9 @@ class ApiClient(object):
         'object': object,
     }
 
+    _pool = None
+    _pool_lock = threading.Lock()
+
     def __init__(self,
                  access_key,
                  secret_key,
@@ -88,7 +96,6 @@ class ApiClient(object):
             configuration = Configuration()
         self.configuration = configuration
 
-        self.pool = ThreadPool()
         self.rest_client = rest.RESTClientObject(configuration)
         self.default_headers = {}
         if header_name is not None:
@@ -102,9 +109,32 @@ class ApiClient(object):
         self.host = host
         self.region = region
 
-    def __del__(self):
-        self.pool.close()
-        self.pool.join()
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close_pool()
+
+    @property
+    def pool(self):
+        """Thread pool shared by all clients, created on first use."""
+        with ApiClient._pool_lock:
+            if ApiClient._pool is None:
+                ApiClient._pool = ThreadPool()
+            return ApiClient._pool
+
+    @classmethod
+    def close_pool(cls):
+        """Closes the shared thread pool, waiting for pending async requests.
+
+        A new pool is created if an async request is made afterwards.
+        """
+        with cls._pool_lock:
+            pool, cls._pool = cls._pool, None
+
+        if pool is not None:
+            pool.close()
+            pool.join()
 
     @property
     def user_agent(self):
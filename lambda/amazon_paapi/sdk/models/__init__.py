@@ -25,93 +25,117 @@ from __future__ import absolute_import
     https://webservices.amazon.com/paapi5/documentation/index.html  # noqa: E501
 """
 
-# import models into model package
-from .availability import Availability
-from .browse_node import BrowseNode
-from .browse_node_ancestor import BrowseNodeAncestor
-from .browse_node_child import BrowseNodeChild
-from .browse_node_info import BrowseNodeInfo
-from .browse_nodes_result import BrowseNodesResult
-from .by_line_info import ByLineInfo
-from .classifications import Classifications
-from .condition import Condition
-from .content_info import ContentInfo
-from .content_rating import ContentRating
-from .contributor import Contributor
-from .customer_reviews import CustomerReviews
-from .delivery_flag import DeliveryFlag
-from .dimension_based_attribute import DimensionBasedAttribute
-from .duration_price import DurationPrice
-from .error_data import ErrorData
-from .external_ids import ExternalIds
-from .get_browse_nodes_request import GetBrowseNodesRequest
-from .get_browse_nodes_resource import GetBrowseNodesResource
-from .get_browse_nodes_response import GetBrowseNodesResponse
-from .get_items_request import GetItemsRequest
-from .get_items_resource import GetItemsResource
-from .get_items_response import GetItemsResponse
-from .get_variations_request import GetVariationsRequest
-from .get_variations_resource import GetVariationsResource
-from .get_variations_response import GetVariationsResponse
-from .image_size import ImageSize
-from .image_type import ImageType
-from .images import Images
-from .item import Item
-from .item_id_type import ItemIdType
-from .item_info import ItemInfo
-from .items_result import ItemsResult
-from .language_type import LanguageType
-from .languages import Languages
-from .manufacture_info import ManufactureInfo
-from .max_price import MaxPrice
-from .merchant import Merchant
-from .min_price import MinPrice
-from .min_reviews_rating import MinReviewsRating
-from .min_saving_percent import MinSavingPercent
-from .multi_valued_attribute import MultiValuedAttribute
-from .offer_availability import OfferAvailability
-from .offer_condition import OfferCondition
-from .offer_condition_note import OfferConditionNote
-from .offer_count import OfferCount
-from .offer_delivery_info import OfferDeliveryInfo
-from .offer_listing import OfferListing
-from .offer_loyalty_points import OfferLoyaltyPoints
-from .offer_merchant_info import OfferMerchantInfo
-from .offer_price import OfferPrice
-from .offer_program_eligibility import OfferProgramEligibility
-from .offer_promotion import OfferPromotion
-from .offer_savings import OfferSavings
-from .offer_shipping_charge import OfferShippingCharge
-from .offer_sub_condition import OfferSubCondition
-from .offer_summary import OfferSummary
-from .offers import Offers
-from .partner_type import PartnerType
-from .price import Price
-from .price_type import PriceType
-from .product_advertising_api_client_exception import ProductAdvertisingAPIClientException
-from .product_advertising_api_service_exception import ProductAdvertisingAPIServiceException
-from .product_info import ProductInfo
-from .properties import Properties
-from .rating import Rating
-from .refinement import Refinement
-from .refinement_bin import RefinementBin
-from .rental_offer_listing import RentalOfferListing
-from .rental_offers import RentalOffers
-from .search_items_request import SearchItemsRequest
-from .search_items_resource import SearchItemsResource
-from .search_items_response import SearchItemsResponse
-from .search_refinements import SearchRefinements
-from .search_result import SearchResult
-from .single_boolean_valued_attribute import SingleBooleanValuedAttribute
-from .single_integer_valued_attribute import SingleIntegerValuedAttribute
-from .single_string_valued_attribute import SingleStringValuedAttribute
-from .sort_by import SortBy
-from .technical_info import TechnicalInfo
-from .trade_in_info import TradeInInfo
-from .trade_in_price import TradeInPrice
-from .unit_based_attribute import UnitBasedAttribute
-from .variation_attribute import VariationAttribute
-from .variation_dimension import VariationDimension
-from .variation_summary import VariationSummary
-from .variations_result import VariationsResult
-from .website_sales_rank import WebsiteSalesRank
+# Models are imported on first attribute access, importing every model module
+# eagerly adds noticeable time to Lambda cold starts.
+import importlib
+
+_MODEL_MODULES = {
+    "Availability": "availability",
+    "BrowseNode": "browse_node",
+    "BrowseNodeAncestor": "browse_node_ancestor",
+    "BrowseNodeChild": "browse_node_child",
+    "BrowseNodeInfo": "browse_node_info",
+    "BrowseNodesResult": "browse_nodes_result",
+    "ByLineInfo": "by_line_info",
+    "Classifications": "classifications",
+    "Condition": "condition",
+    "ContentInfo": "content_info",
+    "ContentRating": "content_rating",
+    "Contributor": "contributor",
+    "CustomerReviews": "customer_reviews",
+    "DeliveryFlag": "delivery_flag",
+    "DimensionBasedAttribute": "dimension_based_attribute",
+    "DurationPrice": "duration_price",
+    "ErrorData": "error_data",
+    "ExternalIds": "external_ids",
+    "GetBrowseNodesRequest": "get_browse_nodes_request",
+    "GetBrowseNodesResource": "get_browse_nodes_resource",
+    "GetBrowseNodesResponse": "get_browse_nodes_response",
+    "GetItemsRequest": "get_items_request",
+    "GetItemsResource": "get_items_resource",
+    "GetItemsResponse": "get_items_response",
+    "GetVariationsRequest": "get_variations_request",
+    "GetVariationsResource": "get_variations_resource",
+    "GetVariationsResponse": "get_variations_response",
+    "ImageSize": "image_size",
+    "ImageType": "image_type",
+    "Images": "images",
+    "Item": "item",
+    "ItemIdType": "item_id_type",
+    "ItemInfo": "item_info",
+    "ItemsResult": "items_result",
+    "LanguageType": "language_type",
+    "Languages": "languages",
+    "ManufactureInfo": "manufacture_info",
+    "MaxPrice": "max_price",
+    "Merchant": "merchant",
+    "MinPrice": "min_price",
+    "MinReviewsRating": "min_reviews_rating",
+    "MinSavingPercent": "min_saving_percent",
+    "MultiValuedAttribute": "multi_valued_attribute",
+    "OfferAvailability": "offer_availability",
+    "OfferCondition": "offer_condition",
+    "OfferConditionNote": "offer_condition_note",
+    "OfferCount": "offer_count",
+    "OfferDeliveryInfo": "offer_delivery_info",
+    "OfferListing": "offer_listing",
+    "OfferLoyaltyPoints": "offer_loyalty_points",
+    "OfferMerchantInfo": "offer_merchant_info",
+    "OfferPrice": "offer_price",
+    "OfferProgramEligibility": "offer_program_eligibility",
+    "OfferPromotion": "offer_promotion",
+    "OfferSavings": "offer_savings",
+    "OfferShippingCharge": "offer_shipping_charge",
+    "OfferSubCondition": "offer_sub_condition",
+    "OfferSummary": "offer_summary",
+    "Offers": "offers",
+    "PartnerType": "partner_type",
+    "Price": "price",
+    "PriceType": "price_type",
+    "ProductAdvertisingAPIClientException": "product_advertising_api_client_exception",
+    "ProductAdvertisingAPIServiceException": "product_advertising_api_service_exception",
+    "ProductInfo": "product_info",
+    "Properties": "properties",
+    "Rating": "rating",
+    "Refinement": "refinement",
+    "RefinementBin": "refinement_bin",
+    "RentalOfferListing": "rental_offer_listing",
+    "RentalOffers": "rental_offers",
+    "SearchItemsRequest": "search_items_request",
+    "SearchItemsResource": "search_items_resource",
+    "SearchItemsResponse": "search_items_response",
+    "SearchRefinements": "search_refinements",
+    "SearchResult": "search_result",
+    "SingleBooleanValuedAttribute": "single_boolean_valued_attribute",
+    "SingleIntegerValuedAttribute": "single_integer_valued_attribute",
+    "SingleStringValuedAttribute": "single_string_valued_attribute",
+    "SortBy": "sort_by",
+    "TechnicalInfo": "technical_info",
+    "TradeInInfo": "trade_in_info",
+    "TradeInPrice": "trade_in_price",
+    "UnitBasedAttribute": "unit_based_attribute",
+    "VariationAttribute": "variation_attribute",
+    "VariationDimension": "variation_dimension",
+    "VariationSummary": "variation_summary",
+    "VariationsResult": "variations_result",
+    "WebsiteSalesRank": "website_sales_rank",
+}
+
+__all__ = list(_MODEL_MODULES)
+
+
+def __getattr__(name):
+    try:
+        module_name = _MODEL_MODULES[name]
+    except KeyError:
+        raise AttributeError(
+            "module {!r} has no attribute {!r}".format(__name__, name)
+        ) from None
+
+    value = getattr(importlib.import_module("." + module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -39,6 +39,9 @@ class ItemIdType(object):
     allowed enum values
     """
     ASIN = "ASIN"
+    EAN = "EAN"
+    ISBN = "ISBN"
+    UPC = "UPC"
 
     """
     Attributes:
@@ -0,0 +1,106 @@
+"""
+Universal parser benchmark: row-by-row vs columnar
+
+Parses a synthetic manifest with headers the format detection doesn't know
+(so it goes through parse_universal_csv), once per parse mode:
+
+- row:      csv.DictReader + extract_item_from_row per row
+- columnar: mapped columns only, typed price/quantity arrays, validity mask
+
+Both modes must return the same items, the benchmark fails otherwise. Peak memory
+is measured in a separate, traced run.
+
+Usage:
+    python benchmarks/bench_columnar_parse.py [--rows 100000] [--runs 5]
+"""
+
+import argparse
+import csv
+import io
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+LAMBDA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, LAMBDA_DIR)
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import csv_processor
+
+HEADERS = ['Lot Ref', 'Item Code', 'Title', 'Retail', 'Units', 'Category', 'Brand', 'Grade', 'Pallet ID', 'Warehouse Memo']
+BRANDS = ['Dayton', 'Milwaukee', 'DeWalt', 'Sony', 'Apple', 'HP', '3M', 'N/A', '']
+CATEGORIES = ['Tools', 'Electronics', 'Home', 'Office', '']
+GRADES = ['New', 'Like New', 'Used', 'Damaged', 'none']
+
+def make_manifest(rows, seed=7):
+    """Generate a CSV manifest with some missing, invalid and blank rows"""
+    rng = random.Random(seed)
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(HEADERS)
+
+    for i in range(rows):
+        if rng.random() < 0.01:
+            out.write('\n')
+            continue
+        price = rng.choices([f"{rng.uniform(1, 2000):.2f}", f"${rng.uniform(1, 2000):,.2f}", '', 'N/A', '0'],
+                            weights=[60, 30, 4, 3, 3])[0]
+        writer.writerow([
+            f"L{i // 50}",
+            rng.choice([f"G{rng.randint(10000, 99999)}", '', 'null']),
+            rng.choices([f"{rng.choice(BRANDS)} Widget {i} {rng.randint(100, 999)}X", '', '  Drill Driver  '],
+                        weights=[85, 5, 10])[0],
+            price,
+            rng.choice([str(rng.randint(1, 40)), '2.0', '', 'ten']),
+            rng.choice(CATEGORIES),
+            rng.choice(BRANDS),
+            rng.choice(GRADES),
+            f"P{rng.randint(1, 300)}",
+            'memo',
+        ][:rng.choices([10, 4], weights=[95, 5])[0]])
+
+    return out.getvalue()
+
+def parse(content, mode):
+    os.environ['CSV_PARSE_MODE'] = mode
+    return csv_processor.parse_universal_csv(io.StringIO(content), content)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    # The row parser logs a warning per invalid row
+    logging.disable(logging.WARNING)
+
+    content = make_manifest(args.rows)
+    expected = parse(content, 'row')
+    if parse(content, 'columnar') != expected:
+        raise SystemExit("columnar: items differ from the row parser")
+
+    print(f"{len(expected)} items from {args.rows} rows")
+    print(f"{'mode':<9} {'median ms':>10} {'rows/s':>12} {'speedup':>8} {'peak MB':>8}")
+    baseline = None
+    for mode in ('row', 'columnar'):
+        timings = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            parse(content, mode)
+            timings.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        parse(content, mode)
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+
+        median = statistics.median(timings)
+        baseline = baseline or median
+        print(f"{mode:<9} {median * 1000:>10.1f} {args.rows / median:>12,.0f} {baseline / median:>7.2f}x {peak:>8.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Import-time benchmark for the Lambda entry points
+
+Every handler module is imported in a fresh interpreter, which is what a Lambda
+cold start pays before the first request is served. Each entry point is timed
+twice:
+
+- lazy:  the module as shipped (PAAPI SDK loaded on first lookup)
+- eager: the module plus the whole PAAPI SDK, as it was imported before
+
+Usage:
+    python benchmarks/bench_import_time.py [--runs 10]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+LAMBDA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Handlers that used to import the PAAPI SDK at module level, plus the SDK itself
+ENTRY_POINTS = [
+    'csv_processor',
+    'item_processor',
+    'item_checker',
+    'amazon_paapi',
+]
+
+EAGER_PAAPI = (
+    "import amazon_paapi, amazon_paapi.sdk.models as m; "
+    "[getattr(m, name) for name in m.__all__]; "
+)
+
+TIMER = """
+import sys, time
+start = time.perf_counter()
+{setup}import {module}
+elapsed = time.perf_counter() - start
+loaded = any(name.startswith('amazon_paapi') for name in sys.modules)
+print(elapsed, int(loaded))
+"""
+
+def time_import(module, eager):
+    """Import module in a fresh interpreter, returns (seconds, paapi_loaded)"""
+    code = TIMER.format(setup=EAGER_PAAPI if eager else '', module=module)
+    env = dict(os.environ)
+    env.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=LAMBDA_DIR, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    
+    elapsed, loaded = result.stdout.split()
+    return float(elapsed), loaded == '1'
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+    
+    print(f"{'entry point':<16} {'lazy ms':>9} {'eager ms':>9} {'saved ms':>9}  paapi loaded")
+    
+    for module in ENTRY_POINTS:
+        try:
+            lazy = [time_import(module, eager=False) for _ in range(args.runs)]
+            eager = [time_import(module, eager=True) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(f"{module:<16} skipped: {e}")
+            continue
+        
+        lazy_ms = statistics.median(t for t, _ in lazy) * 1000
+        eager_ms = statistics.median(t for t, _ in eager) * 1000
+        print(f"{module:<16} {lazy_ms:>9.1f} {eager_ms:>9.1f} {eager_ms - lazy_ms:>9.1f}  "
+              f"{'yes' if lazy[0][1] else 'no'}")
+
+if __name__ == '__main__':
+    main()
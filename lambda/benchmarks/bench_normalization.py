@@ -0,0 +1,129 @@
+"""
+Normalization throughput benchmark
+
+Cleans a synthetic 100k-item manifest (Grainger/liquidation style titles with HTML,
+odd characters and model numbers, plus "$1,234.56" style prices and quantities):
+
+- legacy: per-cell functions with inline pattern strings, as the parsers used to do
+- cell:   normalization.normalize_text / parse_price / parse_quantity per cell
+
+Every variant must produce identical output, the benchmark fails otherwise.
+
+Usage:
+    python benchmarks/bench_normalization.py [--items 100000] [--runs 5]
+"""
+
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import normalization
+
+BRANDS = ['DAYTON', 'Milwaukee', 'dewalt', 'Sony', 'APPLE', 'Hp', 'SPEEDAIRE', '3M', 'Fluke', 'Westward']
+NOUNS = ['Motor', 'Drill Driver', 'Headphones', 'Laptop', 'Air Compressor', 'Safety Glasses',
+         'Multimeter', 'Socket Set', 'Exhaust Fan', 'Pressure Washer', 'Ink Cartridge']
+SPECS = ['1/2 HP', '115V', '3450 RPM', '20V MAX', '14 in.', 'Wireless', '8GB RAM', '(Pack of 12)',
+         'Heavy-Duty', 'Black/Yellow', '60 Hz', 'IP67', '3-Phase']
+MODELS = ['WH-1000XM4', 'T480s', '3070Ti', 'HP-2550', 'DCD771C2', '5600X', '2804-20', 'X1']
+NOISE = ['<b>', '</b>', '<br/>', '  ', '\t', '®', '™', '#', '*', '!!', '"', '–']
+
+def make_corpus(count, seed=42):
+    """Generate (titles, prices, quantities) columns"""
+    rng = random.Random(seed)
+    titles, prices, quantities = [], [], []
+
+    for _ in range(count):
+        words = [rng.choice(BRANDS), rng.choice(NOUNS)]
+        words += rng.sample(SPECS, rng.randint(1, 4))
+        if rng.random() < 0.6:
+            words.append(rng.choice(MODELS))
+        for _ in range(rng.randint(0, 3)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(NOISE))
+        title = ' '.join(words)
+        titles.append(title.upper() if rng.random() < 0.3 else title)
+
+        price = rng.uniform(1, 5000)
+        prices.append(rng.choice([f"{price:.2f}", f"${price:,.2f}", f" {price:.2f} ", f"USD {price:.0f}", ""]))
+        quantities.append(rng.choice([str(rng.randint(1, 50)), f"{rng.randint(1, 50)} ea", "", "N/A"]))
+
+    return titles, prices, quantities
+
+def legacy_normalize_text(text):
+    if not text:
+        return ""
+    text = re.sub(r'<[^>]+>', '', str(text))
+    text = re.sub(r'\s+', ' ', text).strip()
+    text = re.sub(r'[^\w\s\-.,()\/]', '', text)
+    return text
+
+def legacy_extract_model_number(title):
+    if not title:
+        return None
+    patterns = [
+        r'\b[A-Z]{2,}\-?\d{3,}\b',
+        r'\b[A-Z]\d{3,}[A-Z]?\b',
+        r'\b\d{3,}[A-Z]{1,3}\b',
+    ]
+    for pattern in patterns:
+        match = re.search(pattern, title)
+        if match:
+            return match.group(0)
+    return None
+
+def legacy_parse_price(value):
+    try:
+        return float(re.sub(r'[^\d.]', '', str(value)))
+    except (ValueError, TypeError):
+        return None
+
+def legacy_parse_quantity(value):
+    cleaned = re.sub(r'[^\d]', '', str(value).strip())
+    return int(cleaned) if cleaned else None
+
+def run_legacy(titles, prices, quantities):
+    clean = [legacy_normalize_text(title) for title in titles]
+    return (clean, [legacy_extract_model_number(title) for title in clean],
+            [legacy_parse_price(price) for price in prices],
+            [legacy_parse_quantity(quantity) for quantity in quantities])
+
+def run_cell(titles, prices, quantities):
+    clean = [normalization.normalize_text(title) for title in titles]
+    return (clean, [normalization.extract_model_number(title) for title in clean],
+            [normalization.parse_price(price) for price in prices],
+            [normalization.parse_quantity(quantity) for quantity in quantities])
+
+VARIANTS = [('legacy', run_legacy), ('cell', run_cell)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--items', type=int, default=100000)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    columns = make_corpus(args.items)
+    expected = run_legacy(*columns)
+
+    print(f"{'variant':<8} {'median ms':>10} {'items/s':>12} {'speedup':>8}")
+    baseline = None
+    for name, run in VARIANTS:
+        if run(*columns) != expected:
+            raise SystemExit(f"{name}: output differs from legacy")
+
+        timings = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            run(*columns)
+            timings.append(time.perf_counter() - start)
+
+        median = statistics.median(timings)
+        baseline = baseline or median
+        print(f"{name:<8} {median * 1000:>10.1f} {args.items / median:>12,.0f} {baseline / median:>7.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Parallel manifest parsing benchmark
+
+Parses a synthetic Staples-format manifest (some descriptions contain quoted
+newlines) through parse_manifest_csv with 1, 2, 4, ... processes and reports
+rows/second per process count. Every run must return the same items as the
+single-process parse.
+
+On a machine with one vCPU the extra processes can only add overhead; run it
+with the memory size the Lambda uses (3 GB = 2 vCPUs, 10 GB = 6 vCPUs).
+
+Usage:
+    python benchmarks/bench_parallel_parse.py [--rows 500000] [--workers 1 2 4] [--runs 3]
+"""
+
+import argparse
+import csv
+import io
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+
+LAMBDA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, LAMBDA_DIR)
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import csv_processor
+
+HEADERS = ['Description', 'Model', 'Quantity', 'Retail Price', 'Ext. Retail Price', 'Sku Restriction']
+NOUNS = ['Desk Chair', 'Toner Cartridge', 'Shredder', 'Monitor Arm', 'Label Maker', 'Paper Case']
+
+def make_manifest(rows, seed=11):
+    """Generate a Staples-format manifest"""
+    rng = random.Random(seed)
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(HEADERS)
+
+    for i in range(rows):
+        price = rng.uniform(5, 900)
+        quantity = rng.randint(1, 12)
+        description = f"{rng.choice(NOUNS)} {i}"
+        if rng.random() < 0.02:
+            description += '\nSee attached note'
+        writer.writerow([
+            description,
+            rng.choice([f"STP{rng.randint(10000, 99999)}", '']),
+            quantity,
+            f"${price:,.2f}",
+            f"${price * quantity:,.2f}",
+            rng.choice(['', 'No Resale']),
+        ])
+
+    return out.getvalue()
+
+def parse(content, workers):
+    os.environ['PARSE_WORKERS'] = str(workers)
+    return csv_processor.parse_manifest_csv(content)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=500000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    os.environ['PARALLEL_PARSE_MIN_ROWS'] = '1'
+
+    content = make_manifest(args.rows)
+    expected = parse(content, 1)
+
+    print(f"{len(expected)} items from {args.rows} rows, {os.cpu_count()} CPUs")
+    print(f"{'processes':<10} {'median ms':>10} {'rows/s':>12} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        if parse(content, workers) != expected:
+            raise SystemExit(f"{workers} processes: items differ from the single-process parse")
+
+        timings = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            parse(content, workers)
+            timings.append(time.perf_counter() - start)
+
+        median = statistics.median(timings)
+        baseline = baseline or median
+        print(f"{workers:<10} {median * 1000:>10.1f} {args.rows / median:>12,.0f} {baseline / median:>7.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Similar item lookup benchmark
+
+Finds the 5 most similar historical titles of new titles, over a synthetic history of
+100k analyzed items. Titles carry a model number from a pool of --models (as manifest
+titles usually do); --models 0 leaves only common words, the worst case of the index:
+
+- scan:     TF-IDF cosine against every historical title
+- indexed:  similarity_index.SimilarityIndex (inverted index, rare tokens select candidates)
+
+Both variants must return the same top match similarity, the benchmark fails otherwise.
+
+Usage:
+    python benchmarks/bench_similarity_index.py [--items 100000] [--queries 200] [--models 20000]
+"""
+
+import argparse
+import heapq
+import math
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_title_classifier import make_titles
+from similarity_index import SimilarityIndex, tokenize
+
+def add_model_numbers(titles, models, seed):
+    """Append a model number from a pool of models to each title"""
+    if not models:
+        return titles
+    rng = random.Random(seed)
+    return [f"{title} {rng.randrange(models):05d}X" for title in titles]
+
+def run_scan(index, title, k=5):
+    weights = {token: index.idf(token) for token in tokenize(title) if token in index.postings}
+    query_norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+    similarities = []
+    for position, tokens in enumerate(index.tokens):
+        score = sum(weights[token] ** 2 for token in tokens if token in weights)
+        if score:
+            norm = math.sqrt(sum(index.idf(token) ** 2 for token in tokens))
+            similarities.append((score / (query_norm * norm), position))
+    return heapq.nlargest(k, similarities)
+
+def run_indexed(index, title, k=5):
+    return index.search(title, k)
+
+VARIANTS = [('scan', run_scan), ('indexed', run_indexed)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--items', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--models', type=int, default=20000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = SimilarityIndex(
+        [i, title, 100.0, 40.0, 'Medium', '2-4 weeks', 'New'] for i, title in enumerate(
+            add_model_numbers(make_titles(args.items), args.models, 1))
+    )
+    print(f"built index of {len(index)} titles in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    queries = add_model_numbers(make_titles(args.queries, seed=7), args.models, 7)
+    print(f"{'variant':<9} {'median ms':>10} {'p95 ms':>8} {'speedup':>8}")
+    baseline = None
+    for name, run in VARIANTS:
+        timings = []
+        for title in queries:
+            start = time.perf_counter()
+            result = run(index, title)
+            timings.append(time.perf_counter() - start)
+
+            best = result[0][0] if result else None
+            expected = run_scan(index, title, 1)
+            if best is None or abs(best - expected[0][0]) > 1e-9:
+                raise SystemExit(f"{name}: top similarity differs from scan for {title!r}")
+
+        median = statistics.median(timings)
+        p95 = sorted(timings)[int(len(timings) * 0.95) - 1]
+        baseline = baseline or median
+        print(f"{name:<9} {median * 1000:>10.2f} {p95 * 1000:>8.2f} {baseline / median:>7.2f}x")
+
+if __name__ == '__main__':
+    main()
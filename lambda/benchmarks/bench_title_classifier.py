@@ -0,0 +1,95 @@
+"""
+Title classification benchmark
+
+Classifies the titles of a synthetic 100k-item manifest into the chart categories
+and the mock pricing groups:
+
+- legacy:   per-title any(keyword in title) chains, as generate_charts and
+            analyze_item_mock used to do
+- indexed:  title_classifier.TitleIndex over the whole manifest (one search per keyword)
+
+Both variants must produce identical categories, the benchmark fails otherwise.
+
+Usage:
+    python benchmarks/bench_title_classifier.py [--items 100000] [--runs 5]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import title_classifier
+
+BRANDS = ['DAYTON', 'Milwaukee', 'dewalt', 'SPEEDAIRE', '3M', 'Fluke', 'Westward', 'Hoffman']
+NOUNS = ['Motor', 'Drill Driver', 'Air Compressor', 'Safety Glasses', 'Wall Cabinet', 'Exhaust Fan',
+         'Pressure Washer', 'Bottle Jack', 'Shop Vacuum', 'Drum Pump', 'Unit Heater', 'Junction Box',
+         'Multimeter', 'Chair Mat', 'Storage Tank', 'Band Saw', 'Nitrile Gloves', 'LED Fixture']
+SPECS = ['1/2 HP', '115V', '3450 RPM', '20V MAX', '14 in.', '(Pack of 12)', 'Heavy-Duty',
+         'Black/Yellow', '60 Hz', 'IP67', '3-Phase', 'Steel', 'Portable']
+
+def make_titles(count, seed=42):
+    """Generate manifest titles"""
+    rng = random.Random(seed)
+    titles = []
+
+    for _ in range(count):
+        words = [rng.choice(BRANDS), rng.choice(NOUNS)] + rng.sample(SPECS, rng.randint(1, 4))
+        title = ' '.join(words)
+        titles.append(title.upper() if rng.random() < 0.3 else title)
+
+    return titles
+
+def legacy_classify(title, categories, default):
+    title = title.lower()
+    for category, keywords in categories:
+        if any(keyword in title for keyword in keywords):
+            return category
+    return default
+
+def run_legacy(titles):
+    return (
+        [legacy_classify(title, title_classifier.CHART_CATEGORIES, title_classifier.CHART_DEFAULT) for title in titles],
+        [legacy_classify(title, title_classifier.PRICE_CATEGORIES, title_classifier.PRICE_DEFAULT) for title in titles],
+    )
+
+def run_indexed(titles):
+    index = title_classifier.TitleIndex(titles)
+    return (
+        index.classify(title_classifier.CHART_CATEGORIES, title_classifier.CHART_DEFAULT),
+        index.classify(title_classifier.PRICE_CATEGORIES, title_classifier.PRICE_DEFAULT),
+    )
+
+VARIANTS = [('legacy', run_legacy), ('indexed', run_indexed)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--items', type=int, default=100000)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    titles = make_titles(args.items)
+    expected = run_legacy(titles)
+
+    print(f"{'variant':<9} {'median ms':>10} {'items/s':>12} {'speedup':>8}")
+    baseline = None
+    for name, run in VARIANTS:
+        if run(titles) != expected:
+            raise SystemExit(f"{name}: categories differ from legacy")
+
+        timings = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            run(titles)
+            timings.append(time.perf_counter() - start)
+
+        median = statistics.median(timings)
+        baseline = baseline or median
+        print(f"{name:<9} {median * 1000:>10.1f} {args.items / median:>12,.0f} {baseline / median:>7.2f}x")
+
+if __name__ == '__main__':
+    main()
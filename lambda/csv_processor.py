@@ -8,10 +8,24 @@ import os
 import uuid
 import xmltodict
 import hashlib
+import functools
+import math
 from decimal import Decimal
 from datetime import datetime, timedelta
 import logging
-from amazon_paapi import AmazonApi
+from array import array
+from itertools import compress
+from operator import itemgetter
+from normalization import parse_price, parse_quantity, parse_sales_days
+import header_registry
+from manifest_files import is_binary_manifest, read_manifest_base64
+from title_classifier import classify_items, get_title_categories, get_price_category
+from manifest_summary import query_manifest_aggregates
+from results_export import ExportTooLarge, export_upload_results
+from item_reuse import item_fingerprint, copy_fresh_analyses
+from early_estimate import order_for_estimate, get_sample_size, query_revenue_estimate
+from local_pricing import is_local_pricing_enabled, price_pending_items
+from similarity_index import find_similar_items, price_near_duplicate, format_comparables
 # from PIL import Image
 # import base64
 
@@ -97,6 +111,71 @@ def get_db_connection():
         logger.error(f"Database connection failed: {str(e)}")
         return None
 
+# Rows fetched per round trip by server-side cursors
+SERVER_CURSOR_ROWS = 2000
+
+def iter_rows(conn, query, params, itersize=SERVER_CURSOR_ROWS):
+    """
+    Run a query on a server-side (named) cursor and yield its rows
+    
+    Only itersize rows are held in memory at a time, however large the result.
+    """
+    cursor = conn.cursor(name=f"read_{uuid.uuid4().hex}")
+    cursor.itersize = itersize
+    try:
+        cursor.execute(query, params)
+        yield from cursor
+    finally:
+        cursor.close()
+
+def cached_item_from_row(row):
+    """Build an item of a previous analysis from an items row (check_existing_analysis)"""
+    (item_number, title, msrp, notes, pallet, est_price, demand, sales_time, reasoning, profit, title_category,
+     sales_days_min, sales_days_max) = row
+    return {
+        'item_number': item_number,
+        'title': title,
+        'msrp': float(msrp) if msrp else 0,
+        'quantity': 1,  # Default quantity for mock data
+        'notes': notes,
+        'pallet': pallet,
+        'analysis': {
+            'estimatedSalePrice': float(est_price) if est_price else 0,
+            'demand': demand,
+            'salesTime': sales_time,
+            'salesDaysMin': sales_days_min,
+            'salesDaysMax': sales_days_max,
+            'reasoning': reasoning
+        },
+        'profit': float(profit) if profit else 0,
+        'title_category': title_category
+    }
+
+def status_item_from_row(row):
+    """Build an item of a completed upload from an items row (get_upload_status)"""
+    (item_number, title, msrp, quantity, est_price, profit, demand, sales_time, reasoning, title_category,
+     sales_days_min, sales_days_max) = row
+    return {
+        'item_number': item_number,
+        'title': title,
+        'msrp': float(msrp) if msrp else 0,
+        'quantity': quantity,
+        'title_category': title_category,
+        'analysis': {
+            'estimatedSalePrice': float(est_price) if est_price else 0,
+            'demand': demand,
+            'salesTime': sales_time,
+            'salesDaysMin': sales_days_min,
+            'salesDaysMax': sales_days_max,
+            'reasoning': reasoning,
+            'marketplace': {
+                'amazon': {'available': False, 'price': None},
+                'ebay': {'available': False, 'price': None}
+            }
+        },
+        'profit': float(profit) if profit else 0
+    }
+
 def check_existing_analysis(file_hash):
     """Check if analysis already exists for this file hash"""
     try:
@@ -131,33 +210,16 @@ def check_existing_analysis(file_hash):
             if manifest_result:
                 total_items, total_msrp, projected_revenue, profit_margin = manifest_result
                 
-                # Get items data
-                cursor.execute("""
+                # Get items data (rows read itersize at a time and converted as they arrive,
+                # the list of item dicts is the only full copy)
+                items = list(map(cached_item_from_row, iter_rows(conn, """
                     SELECT item_number, title, msrp, notes, pallet, 
-                           estimated_sale_price, demand, sales_time, reasoning, profit
+                           estimated_sale_price, demand, sales_time, reasoning, profit, title_category,
+                           sales_days_min, sales_days_max
                     FROM items
                     WHERE manifest_id = %s
                     ORDER BY item_number
-                """, (manifest_id,))
-                
-                items_data = cursor.fetchall()
-                items = []
-                for item in items_data:
-                    items.append({
-                        'item_number': item[0],
-                        'title': item[1],
-                        'msrp': float(item[2]) if item[2] else 0,
-                        'quantity': 1,  # Default quantity for mock data
-                        'notes': item[3],
-                        'pallet': item[4],
-                        'analysis': {
-                            'estimatedSalePrice': float(item[5]) if item[5] else 0,
-                            'demand': item[6],
-                            'salesTime': item[7],
-                            'reasoning': item[8]
-                        },
-                        'profit': float(item[9]) if item[9] else 0
-                    })
+                """, (manifest_id,))))
                 
                 cursor.close()
                 conn.close()
@@ -187,6 +249,91 @@ def check_existing_analysis(file_hash):
         logger.error(f"Error checking existing analysis: {str(e)}")
         return None
 
+def detect_manifest_format(header_line):
+    """
+    Detect the manifest format from its header line
+    
+    Args:
+        header_line: first line of the CSV, lowercased
+    
+    Returns:
+        format name (see MANIFEST_PARSERS)
+    """
+    # Detect common manifest formats with more flexible matching
+    # Check more specific formats first to avoid false matches
+    if all(keyword in header_line for keyword in ['description', 'model', 'ext. retail price']):
+        logger.info("Detected Staples format")
+        return 'staples'
+    elif any(keyword in header_line for keyword in ['grainger', 'item #']):
+        logger.info("Detected Grainger format")
+        return 'grainger'
+    elif all(keyword in header_line for keyword in ['upc', 'total retail price']) and 'category' in header_line:
+        logger.info("Detected liquidation format")
+        return 'liquidation'
+    elif any(keyword in header_line for keyword in ['item title', 'quantity', 'retail price', 'brand']):
+        logger.info("Detected DirectLiquidation format")
+        return 'direct_liquidation'
+    elif any(keyword in header_line for keyword in ['sku', 'product name', 'brand', 'condition', 'msrp']):
+        logger.info("Detected department store format")
+        return 'department_store'
+    elif any(keyword in header_line for keyword in ['model number', 'condition', 'total retail']):
+        logger.info("Detected electronics format")
+        return 'electronics'
+    elif any(keyword in header_line for keyword in ['item number', 'sell price', 'extended sell', 'salvage']):
+        logger.info("Detected Costco format")
+        return 'costco'
+    elif any(keyword in header_line for keyword in ['product', 'description', 'price', 'cost']):
+        logger.info("Detected generic product format")
+        return 'generic_product'
+    elif any(keyword in header_line for keyword in ['part', 'model', 'manufacturer']):
+        logger.info("Detected parts format")
+        return 'parts'
+    else:
+        # Use intelligent universal parser for unknown formats
+        logger.info("Using universal parser for unknown format")
+        return 'universal'
+
+def is_confident_detection(headers, format_name, column_map):
+    """
+    Check if a detected format maps the fields its parser needs (MSRP and the required
+    fields of a vendor format, title and MSRP for the universal parser), so the header
+    row can be registered
+    """
+    if format_name == 'universal':
+        return bool(column_map and column_map.get('title') and column_map.get('msrp'))
+    
+    spec = VENDOR_FORMATS[format_name]
+    fields = {field for _, field, _ in map_vendor_columns(headers, spec['columns'])}
+    return 'msrp' in fields and all(field in fields for field in spec['required'])
+
+def resolve_manifest_format(first_line):
+    """
+    Get the format and column mapping of a manifest from its header row, looked up
+    in the header registry first and detected for new header rows (registered when
+    the detection is confident)
+    
+    Args:
+        first_line: first line of the CSV
+    
+    Returns:
+        (format name, column map or None) tuple
+    """
+    headers = next(csv.reader([first_line.rstrip('\r')]), [])
+    
+    known = header_registry.lookup_header_format(headers)
+    if known and known[0] in MANIFEST_PARSERS:
+        logger.info(f"Known header row, {known[0]} format")
+        return known
+    
+    header_line = first_line.lower()
+    logger.info(f"Detecting CSV format from header: {header_line[:100]}...")
+    
+    format_name = detect_manifest_format(header_line)
+    column_map = analyze_headers(headers) if format_name == 'universal' else None
+    if is_confident_detection(headers, format_name, column_map):
+        header_registry.record_header_format(headers, format_name, column_map)
+    return format_name, column_map
+
 def parse_manifest_csv(csv_content):
     """Parse any manifest CSV format - intelligent detection and flexible parsing with robust error handling"""
     items = []
@@ -202,43 +349,19 @@ def parse_manifest_csv(csv_content):
         
         # Read the first few lines to detect format
         lines = csv_content.split('\n')[:10]  # Read more lines for better detection
-        header_line = lines[0].lower() if lines else ""
-        
-        logger.info(f"Detecting CSV format from header: {header_line[:100]}...")
-        
-        # Detect common manifest formats with more flexible matching
-        # Check more specific formats first to avoid false matches
-        if all(keyword in header_line for keyword in ['description', 'model', 'ext. retail price']):
-            logger.info("Detected Staples format")
-            return parse_staples_format(csv_file, csv_content)
-        elif any(keyword in header_line for keyword in ['grainger', 'item #']):
-            logger.info("Detected Grainger format")
-            return parse_grainger_format(csv_file, csv_content)
-        elif all(keyword in header_line for keyword in ['upc', 'total retail price']) and 'category' in header_line:
-            logger.info("Detected liquidation format")
-            return parse_liquidation_format(csv_file, csv_content)
-        elif any(keyword in header_line for keyword in ['item title', 'quantity', 'retail price', 'brand']):
-            logger.info("Detected DirectLiquidation format")
-            return parse_direct_liquidation_format(csv_file, csv_content)
-        elif any(keyword in header_line for keyword in ['sku', 'product name', 'brand', 'condition', 'msrp']):
-            logger.info("Detected department store format")
-            return parse_department_store_format(csv_file, csv_content)
-        elif any(keyword in header_line for keyword in ['model number', 'condition', 'total retail']):
-            logger.info("Detected electronics format")
-            return parse_electronics_format(csv_file, csv_content)
-        elif any(keyword in header_line for keyword in ['item number', 'sell price', 'extended sell', 'salvage']):
-            logger.info("Detected Costco format")
-            return parse_costco_format(csv_file, csv_content)
-        elif any(keyword in header_line for keyword in ['product', 'description', 'price', 'cost']):
-            logger.info("Detected generic product format")
-            return parse_generic_product_format(csv_file, csv_content)
-        elif any(keyword in header_line for keyword in ['part', 'model', 'manufacturer']):
-            logger.info("Detected parts format")
-            return parse_parts_format(csv_file, csv_content)
-        else:
-            # Use intelligent universal parser for unknown formats
-            logger.info("Using universal parser for unknown format")
-            return parse_universal_csv(csv_file, csv_content)
+        
+        format_name, column_map = resolve_manifest_format(lines[0] if lines else "")
+        parser = MANIFEST_PARSERS[format_name]
+        if column_map is not None:
+            parser = functools.partial(parser, column_map=column_map)
+        
+        workers = get_parse_workers(csv_content)
+        if workers > 1:
+            items = parse_csv_parallel(csv_content, format_name, parser, workers)
+            if items is not None:
+                return items
+        
+        return parser(csv_file, csv_content)
             
     except Exception as e:
         logger.error(f"CSV parsing error: {str(e)}")
@@ -251,465 +374,409 @@ def parse_manifest_csv(csv_content):
             logger.error(f"Universal parser fallback failed: {str(fallback_error)}")
             return []
 
-def parse_grainger_format(csv_file, csv_content):
-    """Parse Grainger-specific manifest format"""
-    items = []
-    reader = csv.DictReader(csv_file)
-    
-    for row in reader:
-        if not row or not any(row.values()):  # Skip empty rows
-            continue
-            
-        # Extract item data based on Grainger format
-        item_number = None
-        title = None
-        msrp = None
-        notes = None
-        pallet = None
-        
-        # Try different column name variations
-        for key, value in row.items():
-            key_lower = key.lower().strip()
-            if value and value.strip():
-                if 'grainger' in key_lower and ('#' in key_lower or 'item' in key_lower):
-                    item_number = value.strip()
-                elif 'title' in key_lower or 'description' in key_lower or 'name' in key_lower or 'desc' in key_lower:
-                    title = value.strip()
-                elif 'msrp' in key_lower or 'grainger' in key_lower or key_lower == 'g $':
-                    try:
-                        # Remove commas and dollar signs
-                        msrp = float(re.sub(r'[^\d.]', '', str(value)))
-                    except (ValueError, TypeError):
-                        msrp = None
-                elif 'notes' in key_lower or 'comment' in key_lower:
-                    notes = value.strip()
-                elif 'pallet' in key_lower or 'lot' in key_lower:
-                    pallet = value.strip()
-        
-        # Only add items with essential data
-        if item_number and title and msrp:
-            items.append({
-                'item_number': item_number,
-                'title': title,
-                'msrp': msrp,
-                'quantity': 1,  # Default quantity for Grainger format
-                'notes': notes,
-                'pallet': pallet
-            })
-    
-    return items
+# Parsers that number items without an identifier by CSV row (item_<row>),
+# the others number them by item count (item_<n>)
+ROW_NUMBERED_FORMATS = {'universal'}
 
-def parse_liquidation_format(csv_file, csv_content):
-    """Parse liquidation inventory format: UPC,Description,Category,Qty,Retail Price,Total Retail Price"""
-    items = []
-    reader = csv.DictReader(csv_file)
-    
-    for row in reader:
-        if not row or not any(row.values()):  # Skip empty rows
-            continue
-            
-        # Extract item data based on liquidation format
-        upc = None
-        title = None
-        msrp = None
-        category = None
-        quantity = None
-        
-        # Try different column name variations
-        for key, value in row.items():
-            key_lower = key.lower().strip()
-            if value and value.strip():
-                if 'upc' in key_lower:
-                    upc = value.strip()
-                elif 'description' in key_lower or 'product' in key_lower:
-                    title = value.strip()
-                elif ('retail price' in key_lower and 'total' not in key_lower) or key_lower == '"retail price"':
-                    try:
-                        # Remove commas and dollar signs
-                        msrp = float(re.sub(r'[^\d.]', '', str(value)))
-                    except (ValueError, TypeError):
-                        msrp = None
-                elif 'category' in key_lower:
-                    category = value.strip()
-                elif 'qty' in key_lower or 'quantity' in key_lower:
-                    try:
-                        quantity = int(value.strip())
-                    except (ValueError, TypeError):
-                        quantity = None
-        
-        # Only add items with essential data
-        if title and msrp:
-            items.append({
-                'item_number': upc or f"item_{len(items)+1}",
-                'title': title,
-                'msrp': msrp,
-                'quantity': quantity or 1,
-                'notes': f"Category: {category}" if category else None,
-                'pallet': f"Qty: {quantity}" if quantity else None
-            })
-    
-    return items
+# Item numbers generated for items without an identifier (a real identifier of
+# the same shape would be renumbered too)
+GENERATED_ITEM_NUMBER_RE = re.compile(r'item_(\d+)')
 
-def parse_staples_format(csv_file, csv_content):
-    """Parse Staples liquidation format: Description,Model,Quantity,Retail Price,Ext. Retail Price,Sku Restriction"""
-    items = []
-    reader = csv.DictReader(csv_file)
-    
-    for row in reader:
-        if not row or not any(row.values()):  # Skip empty rows
-            continue
-            
-        # Extract item data based on Staples format
-        description = None
-        model = None
-        msrp = None
-        quantity = None
-        sku_restriction = None
+def get_available_cpus():
+    """Get the number of vCPUs this process may run on (Lambda has 1 below 1769 MB of memory)"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def get_parse_workers(csv_content):
+    """
+    Get the number of processes to parse a manifest with (1 = no parallel parsing)
+    
+    Parallel parsing is only used with at least 2 vCPUs: on a single vCPU the processes
+    share it and parsing gets slower than in one process.
+    """
+    cpus = get_available_cpus()
+    if cpus < 2:
+        return 1
+    
+    min_rows = int(os.environ.get('PARALLEL_PARSE_MIN_ROWS', '200000'))
+    if csv_content.count('\n') < min_rows:
+        return 1
+    
+    return max(1, min(int(os.environ.get('PARSE_WORKERS', str(cpus))), cpus))
+
+def iter_csv_lines(csv_content, position):
+    """Yield the lines of CSV content one at a time, position[0] is the offset after the last one"""
+    length = len(csv_content)
+    while position[0] < length:
+        start = position[0]
+        position[0] = csv_content.find('\n', start) + 1 or length
+        yield csv_content[start:position[0]]
+
+def split_csv_rows(csv_content, chunk_count):
+    """
+    Split CSV content into chunks of whole rows, quoted fields spanning lines stay in one chunk
+    
+    Rows are located by character offset, the content is only sliced for the chunks.
+    
+    Args:
+        csv_content: CSV string, first row is the header
+        chunk_count: number of chunks wanted
+    
+    Returns:
+        (header, chunks) where chunks is a list of (rows text, non-blank row count) tuples
+    """
+    # Offset after each row, and whether the row is blank (DictReader skips those)
+    position = [0]
+    row_ends = array('q')
+    blank = bytearray()
+    lines = iter_csv_lines(csv_content, position)
+    if '"' in csv_content:
+        # Quoted fields may contain newlines, let the csv tokenizer find where rows end
+        for row in csv.reader(lines):
+            row_ends.append(position[0])
+            blank.append(not row)
+    else:
+        for line in lines:
+            row_ends.append(position[0])
+            blank.append(line in ('\n', '\r\n'))
+    
+    if not row_ends:
+        return '', []
+    
+    header = csv_content[:row_ends[0]]
+    row_count = len(row_ends) - 1
+    if not row_count:
+        return header, []
+    chunk_rows = -(-row_count // chunk_count)
+    
+    chunks = []
+    for first in range(1, row_count + 1, chunk_rows):
+        last = min(first + chunk_rows, row_count + 1)
+        text = csv_content[row_ends[first - 1]:row_ends[last - 1]]
+        chunks.append((text, (last - first) - sum(blank[first:last])))
+    
+    return header, chunks
+
+def parse_chunk_process(connection, parser, chunk):
+    """Parse a CSV chunk in a child process and send the items back"""
+    try:
+        connection.send(parser(io.StringIO(chunk), chunk))
+    except Exception as e:
+        connection.send(e)
+    finally:
+        connection.close()
+
+def parse_csv_parallel(csv_content, format_name, parser, workers):
+    """
+    Parse a large manifest with several processes, one chunk of rows each
+    
+    Uses Process + Pipe, Lambda has no /dev/shm for multiprocessing.Pool. The current
+    process parses the first chunk itself. Items are merged in file order and item
+    numbers generated for rows without an identifier are renumbered as if the file
+    was parsed in one go.
+    
+    Args:
+        csv_content: CSV string
+        format_name: detected format (see detect_manifest_format)
+        parser: parser function for the format
+        workers: number of processes, including the current one
+    
+    Returns:
+        list of items, or None if parallel parsing failed
+    """
+    import multiprocessing
+    
+    processes = []
+    try:
+        header, chunks = split_csv_rows(csv_content, workers)
+        if len(chunks) < 2:
+            return None
         
-        # Try different column name variations
-        for key, value in row.items():
-            if not key:  # Skip if key is None or empty
-                continue
-            key_lower = key.lower().strip()
-            if value and str(value).strip():
-                value_str = str(value).strip()
-                if 'description' in key_lower:
-                    description = value_str
-                elif 'model' in key_lower:
-                    model = value_str
-                elif 'retail price' in key_lower and 'ext' not in key_lower:
-                    try:
-                        # Remove commas and dollar signs, handle empty strings
-                        cleaned = re.sub(r'[^\d.]', '', value_str)
-                        if cleaned:
-                            msrp = float(cleaned)
-                    except (ValueError, TypeError):
-                        msrp = None
-                elif 'quantity' in key_lower or 'qty' in key_lower:
-                    try:
-                        cleaned = re.sub(r'[^\d]', '', value_str)
-                        if cleaned:
-                            quantity = int(cleaned)
-                    except (ValueError, TypeError):
-                        quantity = None
-                elif 'sku restriction' in key_lower or 'restriction' in key_lower:
-                    sku_restriction = value_str
+        for text, _ in chunks[1:]:
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(target=parse_chunk_process, args=(sender, parser, header + text))
+            process.start()
+            sender.close()
+            processes.append((process, receiver))
+        
+        results = [parser(io.StringIO(header + chunks[0][0]), header + chunks[0][0])]
+        for process, receiver in processes:
+            result = receiver.recv()
+            process.join()
+            if isinstance(result, Exception):
+                raise result
+            results.append(result)
+        
+        items = []
+        rows_before = 0
+        for chunk_items, (_, row_count) in zip(results, chunks):
+            offset = rows_before if format_name in ROW_NUMBERED_FORMATS else len(items)
+            if offset:
+                for item in chunk_items:
+                    match = GENERATED_ITEM_NUMBER_RE.fullmatch(str(item['item_number']))
+                    if match:
+                        item['item_number'] = f"item_{int(match.group(1)) + offset}"
+            items.extend(chunk_items)
+            rows_before += row_count
+        
+        logger.info(f"Parsed {len(items)} items from {len(chunks)} chunks with {workers} processes")
+        return items
         
-        # Only add items with essential data
-        if description and msrp and msrp > 0:
-            notes_parts = []
-            if model: notes_parts.append(f"Model: {model}")
-            if sku_restriction: notes_parts.append(f"Restriction: {sku_restriction}")
-            
-            items.append({
-                'item_number': model or f"item_{len(items)+1}",
-                'title': description,
-                'msrp': msrp,
-                'quantity': quantity or 1,
-                'notes': ", ".join(notes_parts) if notes_parts else None,
-                'pallet': f"Qty: {quantity}" if quantity else None
-            })
+    except Exception as e:
+        logger.warning(f"Parallel CSV parsing failed, parsing sequentially: {str(e)}")
+        return None
     
-    return items
+    finally:
+        for process, receiver in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+            receiver.close()
 
-def parse_direct_liquidation_format(csv_file, csv_content):
-    """Parse DirectLiquidation/B-Stock format: Item Title, Quantity, Retail Price, UPC, Brand"""
-    items = []
-    reader = csv.DictReader(csv_file)
-    
-    for row in reader:
-        if not row or not any(row.values()):  # Skip empty rows
-            continue
-            
-        # Extract item data
-        item_title = None
-        msrp = None
-        upc = None
-        brand = None
-        quantity = None
-        
-        for key, value in row.items():
-            key_lower = key.lower().strip()
-            if value and value.strip():
-                if 'item title' in key_lower or 'title' in key_lower or 'product' in key_lower or 'description' in key_lower:
-                    item_title = value.strip()
-                elif 'retail price' in key_lower or 'msrp' in key_lower:
-                    try:
-                        msrp = float(re.sub(r'[^\d.]', '', str(value)))
-                    except (ValueError, TypeError):
-                        msrp = None
-                elif 'upc' in key_lower or 'sku' in key_lower:
-                    upc = value.strip()
-                elif 'brand' in key_lower or 'manufacturer' in key_lower:
-                    brand = value.strip()
-                elif 'quantity' in key_lower or 'qty' in key_lower:
-                    try:
-                        quantity = int(value.strip())
-                    except (ValueError, TypeError):
-                        quantity = None
-        
-        if item_title and msrp:
-            items.append({
-                'item_number': upc or f"item_{len(items)+1}",
-                'title': item_title,
-                'msrp': msrp,
-                'quantity': quantity or 1,
-                'notes': f"Brand: {brand}" if brand else None,
-                'pallet': f"Qty: {quantity}" if quantity else None
-            })
-    
-    return items
+# Vendor manifest formats, consumed by parse_vendor_format:
+# - columns: rules classifying each header (lowercased, stripped), the first matching rule wins.
+#   A rule matches if the header contains one of 'any', all of 'all' and none of 'none',
+#   or equals one of 'exact'. 'type' converts the value: text (default), price, int or digits.
+#   When several columns map to the same field, the last non-empty one wins
+# - required: fields an item must have, besides a positive MSRP
+# - item_number: field used as item number, items without one are numbered item_<n>
+# - notes / pallet: (field, template) parts, included when the field has a value
+VENDOR_FORMATS = {
+    'grainger': {
+        'columns': [
+            {'field': 'item_number', 'all': ['grainger'], 'any': ['#', 'item']},
+            {'field': 'title', 'any': ['title', 'description', 'name', 'desc']},
+            {'field': 'msrp', 'any': ['msrp', 'grainger'], 'exact': ['g $'], 'type': 'price'},
+            {'field': 'notes', 'any': ['notes', 'comment']},
+            {'field': 'pallet', 'any': ['pallet', 'lot']},
+        ],
+        'required': ['item_number', 'title'],
+        'notes': [('notes', '{}')],
+        'pallet': [('pallet', '{}')],
+    },
+    'liquidation': {
+        'columns': [
+            {'field': 'item_number', 'any': ['upc']},
+            {'field': 'title', 'any': ['description', 'product']},
+            {'field': 'msrp', 'any': ['retail price'], 'none': ['total'], 'type': 'price'},
+            {'field': 'category', 'any': ['category']},
+            {'field': 'quantity', 'any': ['qty', 'quantity'], 'type': 'int'},
+        ],
+        'required': ['title'],
+        'notes': [('category', 'Category: {}')],
+        'pallet': [('quantity', 'Qty: {}')],
+    },
+    'staples': {
+        'columns': [
+            {'field': 'title', 'any': ['description']},
+            {'field': 'model', 'any': ['model']},
+            {'field': 'msrp', 'any': ['retail price'], 'none': ['ext'], 'type': 'price'},
+            {'field': 'quantity', 'any': ['quantity', 'qty'], 'type': 'digits'},
+            {'field': 'restriction', 'any': ['restriction']},
+        ],
+        'required': ['title'],
+        'item_number': 'model',
+        'notes': [('model', 'Model: {}'), ('restriction', 'Restriction: {}')],
+        'pallet': [('quantity', 'Qty: {}')],
+    },
+    'direct_liquidation': {
+        'columns': [
+            {'field': 'title', 'any': ['item title', 'title', 'product', 'description']},
+            {'field': 'msrp', 'any': ['retail price', 'msrp'], 'type': 'price'},
+            {'field': 'item_number', 'any': ['upc', 'sku']},
+            {'field': 'brand', 'any': ['brand', 'manufacturer']},
+            {'field': 'quantity', 'any': ['quantity', 'qty'], 'type': 'int'},
+        ],
+        'required': ['title'],
+        'notes': [('brand', 'Brand: {}')],
+        'pallet': [('quantity', 'Qty: {}')],
+    },
+    'department_store': {
+        'columns': [
+            {'field': 'item_number', 'any': ['sku']},
+            {'field': 'title', 'any': ['product name', 'name']},
+            {'field': 'msrp', 'any': ['msrp'], 'none': ['extended'], 'type': 'price'},
+            {'field': 'brand', 'any': ['brand']},
+            {'field': 'condition', 'any': ['condition']},
+            {'field': 'quantity', 'any': ['quantity', 'qty'], 'type': 'int'},
+        ],
+        'required': ['title'],
+        'notes': [('brand', 'Brand: {}'), ('condition', 'Condition: {}')],
+        'pallet': [('quantity', 'Qty: {}')],
+    },
+    'electronics': {
+        'columns': [
+            {'field': 'model', 'any': ['model']},
+            {'field': 'title', 'any': ['description']},
+            {'field': 'msrp', 'any': ['retail price'], 'none': ['total'], 'type': 'price'},
+            {'field': 'condition', 'any': ['condition']},
+            {'field': 'quantity', 'any': ['qty', 'quantity'], 'type': 'int'},
+        ],
+        'required': ['title'],
+        'item_number': 'model',
+        'notes': [('model', 'Model: {}'), ('condition', 'Condition: {}')],
+        'pallet': [('quantity', 'Qty: {}')],
+    },
+    'costco': {
+        'columns': [
+            {'field': 'item_number', 'any': ['item number']},
+            {'field': 'title', 'any': ['description']},
+            {'field': 'msrp', 'any': ['sell price'], 'none': ['extended'], 'type': 'price'},
+            {'field': 'quantity', 'any': ['quantity', 'qty'], 'type': 'int'},
+            {'field': 'salvage_percent', 'all': ['salvage', 'percent'], 'type': 'price'},
+        ],
+        'required': ['title'],
+        'notes': [('salvage_percent', 'Salvage: {}%')],
+        'pallet': [('quantity', 'Qty: {}')],
+    },
+    'generic_product': {
+        'columns': [
+            {'field': 'item_number', 'any': ['sku', 'id', 'code', 'number']},
+            {'field': 'title', 'any': ['name', 'title', 'description', 'product']},
+            {'field': 'msrp', 'any': ['price', 'msrp', 'cost', 'retail'], 'type': 'price'},
+            {'field': 'notes', 'any': ['notes', 'comment', 'remark']},
+            {'field': 'pallet', 'any': ['lot', 'batch', 'pallet']},
+        ],
+        'required': ['item_number', 'title'],
+        'notes': [('notes', '{}')],
+        'pallet': [('pallet', '{}')],
+    },
+    'parts': {
+        'columns': [
+            {'field': 'item_number', 'any': ['part', 'model', 'sku', 'pn']},
+            {'field': 'title', 'any': ['description', 'name', 'title']},
+            {'field': 'msrp', 'any': ['price', 'cost', 'value'], 'type': 'price'},
+            {'field': 'notes', 'any': ['notes', 'condition']},
+            {'field': 'pallet', 'any': ['location', 'bin', 'lot']},
+        ],
+        'required': ['item_number', 'title'],
+        'notes': [('notes', '{}')],
+        'pallet': [('pallet', '{}')],
+    },
+}
 
-def parse_department_store_format(csv_file, csv_content):
-    """Parse Department Store format: SKU, Product Name, Brand, Condition, Quantity, MSRP, Extended MSRP"""
-    items = []
-    reader = csv.DictReader(csv_file)
-    
-    for row in reader:
-        if not row or not any(row.values()):
-            continue
-            
-        sku = None
-        product_name = None
-        msrp = None
-        brand = None
-        condition = None
-        quantity = None
-        
-        for key, value in row.items():
-            key_lower = key.lower().strip()
-            if value and value.strip():
-                if 'sku' in key_lower:
-                    sku = value.strip()
-                elif 'product name' in key_lower or 'name' in key_lower:
-                    product_name = value.strip()
-                elif 'msrp' in key_lower and 'extended' not in key_lower:
-                    try:
-                        msrp = float(re.sub(r'[^\d.]', '', str(value)))
-                    except (ValueError, TypeError):
-                        msrp = None
-                elif 'brand' in key_lower:
-                    brand = value.strip()
-                elif 'condition' in key_lower:
-                    condition = value.strip()
-                elif 'quantity' in key_lower or 'qty' in key_lower:
-                    try:
-                        quantity = int(value.strip())
-                    except (ValueError, TypeError):
-                        quantity = None
-        
-        if product_name and msrp:
-            notes_parts = []
-            if brand: notes_parts.append(f"Brand: {brand}")
-            if condition: notes_parts.append(f"Condition: {condition}")
-            
-            items.append({
-                'item_number': sku or f"item_{len(items)+1}",
-                'title': product_name,
-                'msrp': msrp,
-                'quantity': quantity or 1,
-                'notes': ", ".join(notes_parts) if notes_parts else None,
-                'pallet': f"Qty: {quantity}" if quantity else None
-            })
-    
-    return items
+def parse_int_cell(value):
+    """Parse a whole number cell, None if invalid"""
+    try:
+        return int(value)
+    except ValueError:
+        return None
 
-def parse_electronics_format(csv_file, csv_content):
-    """Parse Electronics format: Model Number, Description, Condition, Qty, Retail Price, Total Retail"""
-    items = []
-    reader = csv.DictReader(csv_file)
-    
-    for row in reader:
-        if not row or not any(row.values()):
-            continue
-            
-        model_number = None
-        description = None
-        msrp = None
-        condition = None
-        quantity = None
-        
-        for key, value in row.items():
-            key_lower = key.lower().strip()
-            if value and value.strip():
-                if 'model number' in key_lower or 'model' in key_lower:
-                    model_number = value.strip()
-                elif 'description' in key_lower:
-                    description = value.strip()
-                elif 'retail price' in key_lower and 'total' not in key_lower:
-                    try:
-                        msrp = float(re.sub(r'[^\d.]', '', str(value)))
-                    except (ValueError, TypeError):
-                        msrp = None
-                elif 'condition' in key_lower:
-                    condition = value.strip()
-                elif 'qty' in key_lower or 'quantity' in key_lower:
-                    try:
-                        quantity = int(value.strip())
-                    except (ValueError, TypeError):
-                        quantity = None
-        
-        if description and msrp:
-            notes_parts = []
-            if model_number: notes_parts.append(f"Model: {model_number}")
-            if condition: notes_parts.append(f"Condition: {condition}")
-            
-            items.append({
-                'item_number': model_number or f"item_{len(items)+1}",
-                'title': description,
-                'msrp': msrp,
-                'quantity': quantity or 1,
-                'notes': ", ".join(notes_parts) if notes_parts else None,
-                'pallet': f"Qty: {quantity}" if quantity else None
-            })
-    
-    return items
+# Value converters for the 'type' of a vendor column rule
+VALUE_CONVERTERS = {
+    'price': parse_price,
+    'int': parse_int_cell,
+    'digits': parse_quantity,
+}
 
-def parse_costco_format(csv_file, csv_content):
-    """Parse Costco format: Item Number, Description, Quantity, Sell Price, Extended Sell, Salvage Percent"""
-    items = []
-    reader = csv.DictReader(csv_file)
-    
-    for row in reader:
-        if not row or not any(row.values()):
-            continue
-            
-        item_number = None
-        description = None
-        msrp = None
-        quantity = None
-        salvage_percent = None
-        
-        for key, value in row.items():
-            key_lower = key.lower().strip()
-            if value and value.strip():
-                if 'item number' in key_lower:
-                    item_number = value.strip()
-                elif 'description' in key_lower:
-                    description = value.strip()
-                elif 'sell price' in key_lower and 'extended' not in key_lower:
-                    try:
-                        msrp = float(re.sub(r'[^\d.]', '', str(value)))
-                    except (ValueError, TypeError):
-                        msrp = None
-                elif 'quantity' in key_lower or 'qty' in key_lower:
-                    try:
-                        quantity = int(value.strip())
-                    except (ValueError, TypeError):
-                        quantity = None
-                elif 'salvage' in key_lower and 'percent' in key_lower:
-                    try:
-                        salvage_percent = float(re.sub(r'[^\d.]', '', str(value)))
-                    except (ValueError, TypeError):
-                        salvage_percent = None
-        
-        if description and msrp:
-            notes_parts = []
-            if salvage_percent: notes_parts.append(f"Salvage: {salvage_percent}%")
-            
-            items.append({
-                'item_number': item_number or f"item_{len(items)+1}",
-                'title': description,
-                'msrp': msrp,
-                'quantity': quantity or 1,
-                'notes': ", ".join(notes_parts) if notes_parts else None,
-                'pallet': f"Qty: {quantity}" if quantity else None
-            })
-    
-    return items
+def header_matches(header, rule):
+    """Check if a lowercased header matches a vendor column rule"""
+    if header in rule.get('exact', ()):
+        return True
+    
+    return (
+        (not rule.get('any') or any(term in header for term in rule['any']))
+        and all(term in header for term in rule.get('all', ()))
+        and not any(term in header for term in rule.get('none', ()))
+    )
 
-def parse_generic_product_format(csv_file, csv_content):
-    """Parse generic product manifest format"""
-    items = []
-    reader = csv.DictReader(csv_file)
-    
-    for row in reader:
-        if not row or not any(row.values()):
-            continue
-            
-        item_number = None
-        title = None
-        msrp = None
-        notes = None
-        pallet = None
-        
-        for key, value in row.items():
-            key_lower = key.lower().strip()
-            if value and value.strip():
-                if any(term in key_lower for term in ['sku', 'id', 'code', 'number']):
-                    item_number = value.strip()
-                elif any(term in key_lower for term in ['name', 'title', 'description', 'product']):
-                    title = value.strip()
-                elif any(term in key_lower for term in ['price', 'msrp', 'cost', 'retail']):
-                    try:
-                        msrp = float(re.sub(r'[^\d.]', '', str(value)))
-                    except (ValueError, TypeError):
-                        msrp = None
-                elif any(term in key_lower for term in ['notes', 'comment', 'remark']):
-                    notes = value.strip()
-                elif any(term in key_lower for term in ['lot', 'batch', 'pallet']):
-                    pallet = value.strip()
-        
-        if item_number and title and msrp:
-            items.append({
-                'item_number': item_number,
-                'title': title,
-                'msrp': msrp,
-                'quantity': 1,  # Default quantity for generic product format
-                'notes': notes,
-                'pallet': pallet
-            })
+def map_vendor_columns(headers, rules):
+    """
+    Classify the header row once per file
+    
+    Returns:
+        list of (column index, field, converter or None) in column order
+    """
+    # Like csv.DictReader: a repeated header keeps its first position and its last column
+    positions = {}
+    for index, header in enumerate(headers):
+        if header:
+            positions.setdefault(header, []).append(index)
+    
+    columns = []
+    for header, indexes in positions.items():
+        key = header.lower().strip()
+        for rule in rules:
+            if header_matches(key, rule):
+                columns.append((indexes[-1], rule['field'], VALUE_CONVERTERS.get(rule.get('type'))))
+                break
     
-    return items
+    return columns
 
-def parse_parts_format(csv_file, csv_content):
-    """Parse parts/inventory manifest format"""
-    items = []
-    reader = csv.DictReader(csv_file)
+def parse_vendor_format(csv_file, csv_content, format_name):
+    """
+    Parse a manifest of a known vendor format, described in VENDOR_FORMATS
+    
+    Args:
+        csv_file: file-like object with the CSV
+        csv_content: CSV string
+        format_name: key of VENDOR_FORMATS
+    
+    Returns:
+        list of item dicts
+    """
+    spec = VENDOR_FORMATS[format_name]
+    reader = csv.reader(csv_file)
+    headers = next(reader, None) or []
+    
+    columns = map_vendor_columns(headers, spec['columns'])
+    converters = {field: converter for _, field, converter in columns if converter}
+    required = spec['required']
+    item_number_field = spec.get('item_number', 'item_number')
+    notes_parts = spec.get('notes', [])
+    pallet_parts = spec.get('pallet', [])
     
+    items = []
     for row in reader:
-        if not row or not any(row.values()):
+        # Last non-empty value of each field
+        values = {}
+        width = len(row)
+        for index, field, _ in columns:
+            if index < width:
+                value = row[index].strip()
+                if value:
+                    values[field] = value
+        
+        for field, converter in converters.items():
+            if field in values:
+                values[field] = converter(values[field])
+        
+        # Only add items with essential data
+        msrp = values.get('msrp')
+        if not msrp or msrp <= 0 or not all(values.get(field) for field in required):
             continue
-            
-        item_number = None
-        title = None
-        msrp = None
-        notes = None
-        pallet = None
         
-        for key, value in row.items():
-            key_lower = key.lower().strip()
-            if value and value.strip():
-                if any(term in key_lower for term in ['part', 'model', 'sku', 'pn']):
-                    item_number = value.strip()
-                elif any(term in key_lower for term in ['description', 'name', 'title']):
-                    title = value.strip()
-                elif any(term in key_lower for term in ['price', 'cost', 'value']):
-                    try:
-                        msrp = float(re.sub(r'[^\d.]', '', str(value)))
-                    except (ValueError, TypeError):
-                        msrp = None
-                elif any(term in key_lower for term in ['notes', 'condition']):
-                    notes = value.strip()
-                elif any(term in key_lower for term in ['location', 'bin', 'lot']):
-                    pallet = value.strip()
+        notes = [template.format(values[field]) for field, template in notes_parts if values.get(field)]
+        pallet = [template.format(values[field]) for field, template in pallet_parts if values.get(field)]
         
-        if item_number and title and msrp:
-            items.append({
-                'item_number': item_number,
-                'title': title,
-                'msrp': msrp,
-                'quantity': 1,  # Default quantity for parts format
-                'notes': notes,
-                'pallet': pallet
-            })
+        items.append({
+            'item_number': values.get(item_number_field) or f"item_{len(items)+1}",
+            'title': values['title'],
+            'msrp': msrp,
+            'quantity': values.get('quantity') or 1,
+            'notes': ", ".join(notes) if notes else None,
+            'pallet': ", ".join(pallet) if pallet else None
+        })
     
     return items
 
-def parse_universal_csv(csv_file, csv_content):
+def use_columnar_parse(csv_content):
+    """Check if a manifest should be parsed column by column (CSV_PARSE_MODE: auto, row or columnar)"""
+    mode = os.environ.get('CSV_PARSE_MODE', 'auto').lower()
+    if mode in ('row', 'columnar'):
+        return mode == 'columnar'
+    
+    min_rows = int(os.environ.get('COLUMNAR_PARSE_MIN_ROWS', '10000'))
+    return csv_content.count('\n') >= min_rows
+
+def parse_universal_csv(csv_file, csv_content, column_map=None):
     """Universal CSV parser that can handle any manifest format with robust error handling"""
     items = []
     
+    if use_columnar_parse(csv_content):
+        return parse_universal_csv_columnar(csv_file, csv_content, column_map)
+    
     try:
         reader = csv.DictReader(csv_file)
         headers = reader.fieldnames or []
@@ -720,8 +787,9 @@ def parse_universal_csv(csv_file, csv_content):
         
         logger.info(f"Universal parser detected headers: {headers}")
         
-        # Create column mapping based on header analysis
-        column_map = analyze_headers(headers)
+        # Create column mapping based on header analysis, unless the header row is known
+        if column_map is None:
+            column_map = analyze_headers(headers)
         
         row_count = 0
         error_count = 0
@@ -880,11 +948,8 @@ def extract_item_from_row(row, column_map, row_num):
     if column_map['msrp'] and column_map['msrp'] in row:
         value = str(row[column_map['msrp']]).strip()
         if value and value.lower() not in ['', 'n/a', 'null', 'none']:
-            try:
-                # Remove currency symbols, commas, and other non-numeric characters
-                msrp = float(re.sub(r'[^\d.]', '', value))
-            except (ValueError, TypeError):
-                msrp = None
+            # Remove currency symbols, commas, and other non-numeric characters
+            msrp = parse_price(value)
     
     # Extract quantity
     if column_map['quantity'] and column_map['quantity'] in row:
@@ -926,6 +991,118 @@ def extract_item_from_row(row, column_map, row_num):
         'pallet': pallet
     }
 
+# Cell values treated as missing
+NULL_VALUES = {'', 'n/a', 'null', 'none'}
+
+def clean_column(values):
+    """Strip a column of cells, missing values become None"""
+    values = [value.strip() for value in values]
+    # Only short values can be null markers, skip lower() for the rest
+    return [value if len(value) > 4 or value.lower() not in NULL_VALUES else None for value in values]
+
+def parse_quantity_cell(value):
+    """Parse a quantity cell like extract_item_from_row does, 0 if invalid"""
+    try:
+        quantity = int(float(value))  # Handle decimal quantities
+    except (ValueError, OverflowError):
+        return 0
+    return quantity if -2**63 <= quantity < 2**63 else 0
+
+def parse_universal_csv_columnar(csv_file, csv_content, column_map=None):
+    """
+    Columnar variant of parse_universal_csv for large manifests
+    
+    Reads only the mapped columns, converts prices into a typed array and builds a
+    validity mask from titles and prices. The remaining columns are only cleaned,
+    and item dicts only created, for the rows that pass. Produces the same items
+    as the row-by-row parser.
+    """
+    try:
+        reader = csv.reader(csv_file)
+        headers = next(reader, None) or []
+        
+        if not headers:
+            logger.error("No headers found in CSV")
+            return []
+        
+        if column_map is None:
+            column_map = analyze_headers(headers)
+        
+        # Read the mapped columns only. DictReader skips blank lines, pads short rows
+        # and keeps the last of duplicate headers
+        header_index = {header: index for index, header in enumerate(headers)}
+        indexes = sorted({header_index[header] for header in column_map.values() if header in header_index})
+        if not indexes:
+            return []
+        
+        width = indexes[-1] + 1
+        padding = [''] * width
+        getter = itemgetter(*indexes)
+        if len(indexes) == 1:
+            getter = lambda row, get=getter: (get(row),)
+        cells = [getter(row if len(row) >= width else row + padding) for row in reader if row]
+        columns = dict(zip(indexes, zip(*cells))) if cells else {index: () for index in indexes}
+        row_count = len(cells)
+        del cells
+        
+        def column(field, row_indexes=None):
+            """Cleaned cells of a mapped column, for all rows or the given ones"""
+            header = column_map[field]
+            if header not in header_index:
+                return [None] * (row_count if row_indexes is None else len(row_indexes))
+            values = columns[header_index[header]]
+            if row_indexes is not None:
+                values = [values[index] for index in row_indexes]
+            return clean_column(values)
+        
+        # Validity mask from the required columns: a title and a positive MSRP (missing prices are NaN)
+        # Plain numbers are converted directly, anything else goes through parse_price
+        nan = float('nan')
+        titles = column('title')
+        msrp = array('d', [
+            (float(value) if value.replace('.', '', 1).isdigit() else parse_price(value) or 0.0) if value else nan
+            for value in column('msrp')
+        ])
+        valid = bytearray(title is not None and price > 0 for title, price in zip(titles, msrp))
+        valid_indexes = list(compress(range(row_count), valid))
+        
+        # Remaining columns, for valid rows only
+        quantity = array('q', [
+            (int(value) if value.isdigit() and len(value) < 19 else parse_quantity_cell(value)) if value else 0
+            for value in column('quantity', valid_indexes)
+        ])
+        # First present identifier, in the same order as extract_item_from_row
+        item_numbers = [
+            item_number or sku or upc or model
+            for item_number, sku, upc, model in zip(*(column(field, valid_indexes)
+                                                      for field in ('item_number', 'sku', 'upc', 'model')))
+        ]
+        notes = [
+            ", ".join(filter(None, parts)) or None
+            for parts in zip(*(
+                [f"{field.title()}: {value}" if value else None for value in column(field, valid_indexes)]
+                for field in ('category', 'brand', 'condition')
+            ))
+        ]
+        pallets = column('pallet', valid_indexes)
+        
+        items = [{
+            'item_number': item_numbers[position] or f"item_{index + 2}",
+            'title': titles[index],
+            'msrp': msrp[index],
+            'quantity': quantity[position] or 1,
+            'notes': notes[position],
+            'pallet': pallets[position]
+        } for position, index in enumerate(valid_indexes)]
+        
+        logger.info(f"Columnar parser processed {row_count} rows, extracted {len(items)} items, "
+                    f"{row_count - len(items)} invalid rows skipped")
+        return items
+        
+    except Exception as e:
+        logger.error(f"Columnar CSV parsing failed: {str(e)}")
+        return []
+
 def parse_generic_csv(csv_file, csv_content):
     """Parse any CSV format by trying common column patterns"""
     items = []
@@ -958,11 +1135,9 @@ def parse_generic_csv(csv_file, csv_content):
             # Try to find a numeric price in remaining columns
             for i, value in enumerate(values[2:], 2):
                 if value and value.strip():
-                    try:
-                        msrp = float(re.sub(r'[^\d.]', '', str(value)))
+                    msrp = parse_price(value)
+                    if msrp is not None:
                         break
-                    except (ValueError, TypeError):
-                        continue
         
         # If we still don't have a title, try to construct one
         if not title and item_number:
@@ -981,6 +1156,15 @@ def parse_generic_csv(csv_file, csv_content):
     
     return items
 
+# Parser of each manifest format (see detect_manifest_format)
+MANIFEST_PARSERS = {
+    **{
+        format_name: functools.partial(parse_vendor_format, format_name=format_name)
+        for format_name in VENDOR_FORMATS
+    },
+    'universal': parse_universal_csv,
+}
+
 def search_ebay_sales_data(item):
     """Search eBay for similar items to get real-world pricing data"""
     try:
@@ -1097,6 +1281,15 @@ def analyze_item_with_ebay_data(item):
 def analyze_item_with_ai(item):
     """Analyze a single item using AI API"""
     try:
+        # Near-duplicates of items analyzed before are priced from them, without lookups or an AI call
+        similar_items = find_similar_items(item['title'])
+        duplicate_analysis = price_near_duplicate(item, similar_items)
+        if duplicate_analysis:
+            logger.info(f"Item {item['item_number']} priced from similar item {similar_items[0]['item_id']}")
+            duplicate_analysis['marketplace'] = {'amazon': {'available': False, 'price': None}, 'ebay': {'available': False, 'price': None}}
+            duplicate_analysis['image'] = None
+            return duplicate_analysis
+
         # Get marketplace data first
         marketplace_data = check_marketplace_availability(item['title'], item.get('item_number'))
         
@@ -1117,6 +1310,14 @@ def analyze_item_with_ai(item):
         Product Features: {', '.join(item.get('features', [])) if item.get('features') else 'N/A'}
         """
         
+        # Prices we estimated for similar items, to keep estimates consistent
+        comparables_info = ""
+        if similar_items:
+            comparables_info = f"""
+        Similar Items We Priced Before:
+{format_comparables(similar_items)}
+        """
+        
         # Prepare the prompt for AI analysis with enriched data
         prompt = f"""
         Analyze this product for liquidation pricing arbitrage:
@@ -1124,7 +1325,7 @@ def analyze_item_with_ai(item):
         Item: {item['title']}
         MSRP: ${item['msrp']:.2f}
         {enrichment_info}
-        
+        {comparables_info}
         Marketplace Data:
         - Amazon: {'Available' if marketplace_data['amazon']['available'] else 'Not found'} 
           {'$' + str(marketplace_data['amazon']['price']) if marketplace_data['amazon']['price'] else 'N/A'}
@@ -1136,6 +1337,7 @@ def analyze_item_with_ai(item):
         - Product condition: {item.get('condition', 'Unknown')}
         - Consider: market demand, competition, storage/shipping costs, target buyers
         - Use verified Amazon price as market baseline if available
+        - Use prices of similar items priced before for consistency, adjusted for differences
         
         ANALYSIS REQUIRED:
         1. Estimated realistic resale price (considering condition and market)
@@ -1272,9 +1474,19 @@ def call_ai_api(prompt, item):
         logger.error(f"Request error: {str(e)}")
         raise Exception(f"AI API request failed: {str(e)}")
 
+# Liquidation pricing of each title_classifier.PRICE_CATEGORIES group: (share of MSRP, demand, sales time)
+MOCK_PRICE_PROFILES = {
+    'Power Equipment': (0.35, 'High', '2-4 weeks'),
+    'Motors & Blowers': (0.32, 'Medium', '1-3 months'),
+    'Storage': (0.25, 'Low', '3-6 months'),
+    'Tools': (0.40, 'High', '1-2 weeks'),
+    'Climate Control': (0.28, 'Medium', '2-4 months'),
+    'Tanks & Containers': (0.20, 'Low', '4-8 months'),
+    'General': (0.30, 'Medium', '2-3 months'),
+}
+
 def analyze_item_mock(item, marketplace_data=None):
     """Analysis based on marketplace data and item characteristics"""
-    title = item['title'].lower()
     msrp = item['msrp']
     
     # Ensure MSRP is valid
@@ -1313,34 +1525,8 @@ def analyze_item_mock(item, marketplace_data=None):
     else:
         # Fallback to characteristic-based estimation
         # Adjust based on item characteristics (liquidation market factors)
-        if any(keyword in title for keyword in ['compressor', 'vacuum', 'pressure washer', 'generator']):
-            estimated_sale_price = msrp * 0.35
-            demand = 'High'
-            sales_time = '2-4 weeks'
-        elif any(keyword in title for keyword in ['motor', 'pump', 'fan', 'blower']):
-            estimated_sale_price = msrp * 0.32
-            demand = 'Medium'
-            sales_time = '1-3 months'
-        elif any(keyword in title for keyword in ['cabinet', 'storage', 'enclosure', 'box']):
-            estimated_sale_price = msrp * 0.25
-            demand = 'Low'
-            sales_time = '3-6 months'
-        elif any(keyword in title for keyword in ['tool', 'drill', 'saw', 'grinder']):
-            estimated_sale_price = msrp * 0.40
-            demand = 'High'
-            sales_time = '1-2 weeks'
-        elif any(keyword in title for keyword in ['heater', 'cooler', 'air', 'ventilation']):
-            estimated_sale_price = msrp * 0.28
-            demand = 'Medium'
-            sales_time = '2-4 months'
-        elif any(keyword in title for keyword in ['tank', 'drum', 'container', 'barrel']):
-            estimated_sale_price = msrp * 0.20
-            demand = 'Low'
-            sales_time = '4-8 months'
-        else:
-            estimated_sale_price = msrp * 0.30
-            demand = 'Medium'
-            sales_time = '2-3 months'
+        ratio, demand, sales_time = MOCK_PRICE_PROFILES[get_price_category(item)]
+        estimated_sale_price = msrp * ratio
         
         # Add some randomness to make it more realistic (±10%)
         import random
@@ -1365,6 +1551,30 @@ def analyze_item_mock(item, marketplace_data=None):
         'reasoning': reasoning
     }
 
+def get_sales_days(analysis):
+    """
+    Get the sales time range of an analysis in days, from the stored sales_days_min/max
+    columns (salesDaysMin/salesDaysMax) or parsed from the salesTime text
+    
+    Returns:
+        (min days, max days) tuple, or None if unknown
+    """
+    if analysis.get('salesDaysMax'):
+        return analysis.get('salesDaysMin') or analysis['salesDaysMax'], analysis['salesDaysMax']
+    return parse_sales_days(analysis.get('salesTime'))
+
+def build_recommendations(profit_margin, projected_revenue, total_msrp, high_demand_count, total_items):
+    """Generate recommendations from the summary numbers of a manifest"""
+    recommendations = []
+    if profit_margin > 0.3:
+        recommendations.append("High profit margin detected. Consider prioritizing these items for quick sales.")
+    if projected_revenue > total_msrp * 0.8:
+        recommendations.append("Strong resale potential. Focus on marketing and competitive pricing.")
+    if high_demand_count > total_items * 0.3:
+        recommendations.append("Many high-demand items identified. List these first to build momentum.")
+    
+    return recommendations
+
 def calculate_summary(items_with_analysis):
     """Calculate summary statistics"""
     total_msrp = sum(item['msrp'] for item in items_with_analysis)
@@ -1375,29 +1585,16 @@ def calculate_summary(items_with_analysis):
     
     profit_margin = total_profit / total_liquidation_cost if total_liquidation_cost > 0 else 0
     
-    # Calculate average sales time
-    sales_times = []
-    for item in items_with_analysis:
-        sales_time = item['analysis']['salesTime']
-        if 'week' in sales_time.lower():
-            weeks = int(re.findall(r'\d+', sales_time)[0])
-            sales_times.append(weeks)
-        elif 'month' in sales_time.lower():
-            months = int(re.findall(r'\d+', sales_time)[0])
-            sales_times.append(months * 4)
+    # Calculate average sales time (middle of each estimate's range)
+    sales_days = [get_sales_days(item['analysis']) for item in items_with_analysis]
+    sales_days = [(days_min + days_max) / 2 for days_min, days_max in filter(None, sales_days)]
     
-    avg_sales_time = f"{sum(sales_times) / len(sales_times):.0f} weeks" if sales_times else "N/A"
+    avg_sales_time = f"{sum(sales_days) / len(sales_days) / 7:.0f} weeks" if sales_days else "N/A"
     
-    # Generate recommendations
-    recommendations = []
-    if profit_margin > 0.3:
-        recommendations.append("High profit margin detected. Consider prioritizing these items for quick sales.")
-    if total_projected_revenue > total_msrp * 0.8:
-        recommendations.append("Strong resale potential. Focus on marketing and competitive pricing.")
-    
-    high_demand_items = [item for item in items_with_analysis if item['analysis']['demand'] == 'High']
-    if len(high_demand_items) > len(items_with_analysis) * 0.3:
-        recommendations.append("Many high-demand items identified. List these first to build momentum.")
+    high_demand_count = sum(1 for item in items_with_analysis if item['analysis']['demand'] == 'High')
+    recommendations = build_recommendations(
+        profit_margin, total_projected_revenue, total_msrp, high_demand_count, len(items_with_analysis)
+    )
     
     return {
         'totalMsrp': total_msrp,
@@ -1411,43 +1608,41 @@ def calculate_summary(items_with_analysis):
 
 def generate_charts(items_with_analysis):
     """Generate chart data based on actual sales time estimates"""
-    months = ['Month 1', 'Month 2', 'Month 3', 'Month 4', 'Month 5', 'Month 6',
-              'Month 7', 'Month 8', 'Month 9', 'Month 10', 'Month 11', 'Month 12']
-    
     # Calculate revenue timeline based on actual sales time estimates
+    # (manifest_summary.MANIFEST_AGGREGATES_SQL buckets stored items the same way)
     revenue_timeline = [0] * 12
     
     for item in items_with_analysis:
-        sales_time = item['analysis']['salesTime']
+        sales_days = get_sales_days(item['analysis'])
         estimated_price = item['analysis']['estimatedSalePrice']
         
-        # Parse sales time to determine when items will sell
-        if 'week' in sales_time.lower():
-            weeks_match = re.findall(r'\d+', sales_time)
-            if weeks_match:
-                weeks = int(weeks_match[0])
-                # Convert weeks to months (round up)
-                month_index = min((weeks + 3) // 4, 11)  # Cap at month 12
-                revenue_timeline[month_index] += estimated_price
-        elif 'month' in sales_time.lower():
-            months_match = re.findall(r'\d+', sales_time)
-            if months_match:
-                months_str = months_match[0]
-                if '-' in sales_time:
-                    # Handle ranges like "1-3 months" - use average
-                    months_parts = re.findall(r'\d+', sales_time)
-                    if len(months_parts) >= 2:
-                        avg_months = (int(months_parts[0]) + int(months_parts[1])) // 2
-                        month_index = min(avg_months - 1, 11)
-                    else:
-                        month_index = min(int(months_str) - 1, 11)
-                else:
-                    month_index = min(int(months_str) - 1, 11)
-                revenue_timeline[month_index] += estimated_price
+        if sales_days:
+            # Month in which the middle of the estimate falls (capped at month 12)
+            middle_days = (sales_days[0] + sales_days[1]) / 2
+            month_index = min(max(math.ceil(middle_days / 30) - 1, 0), 11)
+            revenue_timeline[month_index] += estimated_price
         else:
             # Default to month 6 if we can't parse
             revenue_timeline[5] += estimated_price
     
+    # Category breakdown (stored on the item rows, classified in one pass for the others)
+    categories = {}
+    for category in get_title_categories(items_with_analysis):
+        categories[category] = categories.get(category, 0) + 1
+    
+    return build_charts(revenue_timeline, categories)
+
+def build_charts(revenue_timeline, categories):
+    """
+    Build the chart data
+    
+    Args:
+        revenue_timeline: estimated revenue of each of the 12 months
+        categories: {category: item count}, in display order
+    """
+    months = ['Month 1', 'Month 2', 'Month 3', 'Month 4', 'Month 5', 'Month 6',
+              'Month 7', 'Month 8', 'Month 9', 'Month 10', 'Month 11', 'Month 12']
+    
     # Convert to cumulative revenue
     cumulative_revenue = []
     cumulative = 0
@@ -1455,23 +1650,6 @@ def generate_charts(items_with_analysis):
         cumulative += monthly_revenue
         cumulative_revenue.append(cumulative)
     
-    # Category breakdown
-    categories = {}
-    for item in items_with_analysis:
-        title = item['title'].lower()
-        if any(keyword in title for keyword in ['compressor', 'vacuum', 'pressure']):
-            category = 'Air Tools'
-        elif any(keyword in title for keyword in ['motor', 'pump', 'fan']):
-            category = 'Motors & Pumps'
-        elif any(keyword in title for keyword in ['cabinet', 'storage', 'enclosure']):
-            category = 'Storage & Enclosures'
-        elif any(keyword in title for keyword in ['jack', 'lift', 'crane']):
-            category = 'Lifting Equipment'
-        else:
-            category = 'Other'
-        
-        categories[category] = categories.get(category, 0) + 1
-    
     return {
         'revenueTimeline': {
             'labels': months,
@@ -1523,10 +1701,11 @@ def save_analysis_to_db(manifest_id, items_with_analysis, summary, charts, file_
         
         # Insert items
         for item in items_with_analysis:
+            sales_days = get_sales_days(item['analysis']) or (None, None)
             cursor.execute("""
                 INSERT INTO items (manifest_id, item_number, title, msrp, estimated_sale_price, 
-                                 profit, demand, sales_time, reasoning)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                                 profit, demand, sales_time, sales_days_min, sales_days_max, reasoning)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
             """, (
                 manifest_id,
                 item['item_number'],
@@ -1536,6 +1715,8 @@ def save_analysis_to_db(manifest_id, items_with_analysis, summary, charts, file_
                 item['analysis']['estimatedSalePrice'] - item['msrp'],
                 item['analysis']['demand'],
                 item['analysis']['salesTime'],
+                sales_days[0],
+                sales_days[1],
                 item['analysis']['reasoning']
             ))
         
@@ -1569,6 +1750,10 @@ def check_amazon_availability(item_title, item_number=None):
         import tempfile
         os.environ['AMAZON_PAAPI_CACHE_DIR'] = '/tmp'
         
+        # Imported here so /history and /status requests don't pay for the PAAPI SDK
+        from amazon_paapi import AmazonApi
+        from amazon_paapi.models import ResourceProfile
+        
         # Initialize Amazon API client
         amazon = AmazonApi(
             credentials['access_key'],
@@ -1578,20 +1763,30 @@ def check_amazon_availability(item_title, item_number=None):
         )
         
         # Search for items (limit to 20 for performance)
+        # Only request title and offer resources - this is a price check
         response = amazon.search_items(
             keywords=item_title[:100],  # Limit keywords length
             search_index='All',
-            item_count=20  # Limit to 20 items for performance
+            item_count=20,  # Limit to 20 items for performance
+            resource_profile=ResourceProfile.PRICE
         )
         
-        if response and len(response) > 0:
-            item = response[0]
+        if response and response.items:
+            item = response.items[0]
+            
+            price = None
+            if item.offers and item.offers.listings and item.offers.listings[0].price:
+                price = item.offers.listings[0].price.amount
+            
+            title = None
+            if item.item_info and item.item_info.title:
+                title = item.item_info.title.display_value
             
             return {
                 'available': True,
-                'price': item.get('price', {}).get('amount', 0) if item.get('price') else None,
-                'url': item.get('detail_page_url'),
-                'title': item.get('title')
+                'price': price,
+                'url': item.detail_page_url,
+                'title': title
             }
         
         return {'available': False, 'price': None, 'url': None}
@@ -1696,6 +1891,9 @@ def insert_items_to_database(upload_id, manifest_id, items):
         conn.autocommit = False  # Ensure we're in transaction mode
         logger.info(f"Inserting {len(items)} items into database")
         
+        # Classify the whole manifest once, the categories are stored on the item rows
+        classify_items(items)
+        
         for item in items:
             try:
                 cursor = conn.cursor()
@@ -1709,8 +1907,9 @@ def insert_items_to_database(upload_id, manifest_id, items):
                 # Insert item with status='pending' or get existing id if duplicate
                 cursor.execute("""
                     INSERT INTO items (
-                        manifest_id, item_number, title, msrp, quantity, status
-                    ) VALUES (%s, %s, %s, %s, %s, 'pending')
+                        manifest_id, item_number, title, msrp, quantity,
+                        title_category, price_category, fingerprint, brand, condition, status
+                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 'pending')
                     ON CONFLICT (manifest_id, item_number) 
                     DO UPDATE SET 
                         status = 'pending',
@@ -1721,7 +1920,12 @@ def insert_items_to_database(upload_id, manifest_id, items):
                     item_number,
                     item.get('title'),
                     item.get('msrp'),
-                    item.get('quantity', 1)
+                    item.get('quantity', 1),
+                    item.get('title_category'),
+                    item.get('price_category'),
+                    item_fingerprint(item),
+                    item.get('brand'),
+                    item.get('condition')
                 ))
                 
                 item_id = cursor.fetchone()[0]
@@ -1749,54 +1953,189 @@ def insert_items_to_database(upload_id, manifest_id, items):
         logger.error(f"Error inserting items: {str(e)}")
         return []
 
-def queue_items_for_processing(upload_id, item_ids):
-    """Queue item IDs to SQS for async processing"""
+def reuse_item_analyses(manifest_id):
+    """
+    Copy recent analyses of unchanged items (same fingerprint) onto the pending items of a manifest
+    
+    Returns:
+        set of reused item ids (empty if nothing could be reused)
+    """
+    try:
+        conn = get_db_connection()
+        if not conn:
+            logger.error("Database connection failed")
+            return set()
+        
+        cursor = conn.cursor()
+        reused_ids = copy_fresh_analyses(cursor, manifest_id)
+        conn.commit()
+        cursor.close()
+        conn.close()
+        
+        return reused_ids
+        
+    except Exception as e:
+        logger.error(f"Error reusing item analyses: {str(e)}")
+        return set()
+
+def split_priority_tiers(item_values, value_share):
+    """
+    Order items by expected value and split off the high priority tier
+    
+    Args:
+        item_values: list of (item_id, expected value)
+        value_share: share of the total value the high priority tier must cover
+    
+    Returns:
+        (ordered item ids, highest value first, number of high priority items): the
+        smallest set of top items covering value_share of the total value
+    """
+    ordered = sorted(item_values, key=lambda item: -item[1])
+    total_value = sum(value for _, value in ordered)
+    
+    priority_count = 0
+    covered_value = 0
+    while priority_count < len(ordered) and covered_value < total_value * value_share:
+        covered_value += ordered[priority_count][1]
+        priority_count += 1
+    
+    return [item_id for item_id, _ in ordered], priority_count
+
+def prioritize_items(manifest_id, item_ids, early_estimate=False):
+    """
+    Order pending items by expected value (msrp * quantity), so the first minutes of
+    processing cover most of the manifest's dollar value
+    
+    In early estimate mode items are ordered as a stratified random sample instead
+    (see early_estimate), the initial sample being the high priority tier.
+    
+    Returns:
+        (ordered item ids, number of high priority items), the ids in their original
+        order and no priority tier if the values cannot be read; ids that are not pending
+        items of the manifest are queued last, so every item still gets processed
+    """
+    item_ids = list(dict.fromkeys(item_ids))
+    try:
+        conn = get_db_connection()
+        if not conn:
+            return item_ids, 0
+        
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT id, COALESCE(msrp, 0), COALESCE(quantity, 1), title_category
+            FROM items
+            WHERE manifest_id = %s AND status = 'pending'
+        """, (manifest_id,))
+        rows = {row[0]: row for row in cursor.fetchall()}
+        cursor.close()
+        conn.close()
+        
+        unknown_ids = [item_id for item_id in item_ids if item_id not in rows]
+        if unknown_ids:
+            logger.warning(f"{len(unknown_ids)} items are not pending in manifest {manifest_id}, queueing them last")
+        
+        if early_estimate:
+            ordered_ids = order_for_estimate([rows[item_id] for item_id in item_ids if item_id in rows])
+            priority_count = min(get_sample_size(), len(ordered_ids))
+            logger.info(f"Queueing a stratified sample of {priority_count}/{len(ordered_ids)} items first")
+            return ordered_ids + unknown_ids, priority_count
+        
+        value_share = float(os.environ.get('PRIORITY_VALUE_SHARE', '0.8'))
+        ordered_ids, priority_count = split_priority_tiers(
+            [(item_id, float(rows[item_id][1]) * rows[item_id][2]) for item_id in item_ids if item_id in rows],
+            value_share
+        )
+        logger.info(f"{priority_count}/{len(ordered_ids)} items cover {value_share:.0%} of the manifest value")
+        return ordered_ids + unknown_ids, priority_count
+        
+    except Exception as e:
+        logger.error(f"Error prioritizing items: {str(e)}")
+        return item_ids, 0
+
+def price_items_locally(manifest_id):
+    """
+    Price the pending items of a manifest that do not need the AI path (see local_pricing)
+    
+    Returns:
+        set of locally priced item ids (empty if none could be priced)
+    """
+    try:
+        conn = get_db_connection()
+        if not conn:
+            logger.error("Database connection failed")
+            return set()
+        
+        cursor = conn.cursor()
+        priced_ids = price_pending_items(cursor, manifest_id)
+        conn.commit()
+        cursor.close()
+        conn.close()
+        
+        return priced_ids
+        
+    except Exception as e:
+        logger.error(f"Error pricing items locally: {str(e)}")
+        return set()
+
+def queue_items_for_processing(upload_id, item_ids, priority_count=0):
+    """
+    Queue item IDs to SQS for async processing
+    
+    Item IDs are sent in the given order. The first priority_count go to the priority
+    queue (SQS_PRIORITY_QUEUE_URL, its own consumers) when one is configured.
+    """
     try:
         queue_url = os.environ.get('SQS_QUEUE_URL')
         if not queue_url:
             logger.error("SQS_QUEUE_URL not set in environment")
             return False
         
-        logger.info(f"Queueing {len(item_ids)} item IDs to SQS for upload {upload_id}")
+        priority_queue_url = os.environ.get('SQS_PRIORITY_QUEUE_URL')
+        if not priority_queue_url:
+            priority_count = 0
+        
+        logger.info(f"Queueing {len(item_ids)} item IDs to SQS for upload {upload_id} ({priority_count} high priority)")
         
         # Send item IDs in batches of 10 (SQS limit)
         batch_size = 10
         total_queued = 0
         
-        for i in range(0, len(item_ids), batch_size):
-            batch = item_ids[i:i + batch_size]
-            entries = []
-            
-            for j, item_id in enumerate(batch):
-                index = i + j
-                message = {
-                    'upload_id': upload_id,
-                    'item_id': item_id,
-                    'item_index': index,
-                    'total_items': len(item_ids)
-                }
+        tiers = [(priority_queue_url, 0, priority_count), (queue_url, priority_count, len(item_ids))]
+        for tier_queue_url, tier_start, tier_end in tiers:
+            for i in range(tier_start, tier_end, batch_size):
+                batch = item_ids[i:min(i + batch_size, tier_end)]
+                entries = []
                 
-                entries.append({
-                    'Id': str(index),
-                    'MessageBody': json.dumps(message, default=str)
-                })
-            
-            try:
-                response = sqs_client.send_message_batch(
-                    QueueUrl=queue_url,
-                    Entries=entries
-                )
-                
-                # Check for failed messages
-                if 'Failed' in response and response['Failed']:
-                    for failed in response['Failed']:
-                        logger.error(f"Failed to queue item {failed['Id']}: {failed['Message']}")
-                
-                total_queued += len(response.get('Successful', []))
+                for j, item_id in enumerate(batch):
+                    index = i + j
+                    message = {
+                        'upload_id': upload_id,
+                        'item_id': item_id,
+                        'item_index': index,
+                        'total_items': len(item_ids)
+                    }
+                    
+                    entries.append({
+                        'Id': str(index),
+                        'MessageBody': json.dumps(message, default=str)
+                    })
                 
-            except Exception as e:
-                logger.error(f"Failed to queue batch starting at {i}: {str(e)}")
-                # Continue with other batches
+                try:
+                    response = sqs_client.send_message_batch(
+                        QueueUrl=tier_queue_url,
+                        Entries=entries
+                    )
+                    
+                    # Check for failed messages
+                    if 'Failed' in response and response['Failed']:
+                        for failed in response['Failed']:
+                            logger.error(f"Failed to queue item {failed['Id']}: {failed['Message']}")
+                    
+                    total_queued += len(response.get('Successful', []))
+                    
+                except Exception as e:
+                    logger.error(f"Failed to queue batch starting at {i}: {str(e)}")
+                    # Continue with other batches
                 
         logger.info(f"Successfully queued {total_queued}/{len(item_ids)} item IDs for processing")
         return total_queued > 0
@@ -1805,7 +2144,7 @@ def queue_items_for_processing(upload_id, item_ids):
         logger.error(f"Error queueing items: {str(e)}")
         return False
 
-def create_upload_record(filename, file_hash, total_items, upload_name=None):
+def create_upload_record(filename, file_hash, total_items, upload_name=None, early_estimate=False):
     """Create upload record in database and return upload_id"""
     try:
         conn = get_db_connection()
@@ -1832,10 +2171,11 @@ def create_upload_record(filename, file_hash, total_items, upload_name=None):
         
         # Create upload record first (since manifest has FK to upload)
         cursor.execute("""
-            INSERT INTO uploads (id, filename, file_hash, manifest_id, status, processed_items, upload_name, s3_key)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            INSERT INTO uploads (id, filename, file_hash, manifest_id, status, processed_items, upload_name, s3_key,
+                                 early_estimate)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
             RETURNING id
-        """, (upload_id, filename, file_hash, manifest_id, 'processing', 0, upload_name, file_hash))
+        """, (upload_id, filename, file_hash, manifest_id, 'processing', 0, upload_name, file_hash, early_estimate))
         
         # Create manifest record
         cursor.execute("""
@@ -1856,55 +2196,41 @@ def create_upload_record(filename, file_hash, total_items, upload_name=None):
         return None
 
 def calculate_80_percent_sellout_time(items_with_sales_time):
-    """Calculate estimated time for 80% of items to sell"""
+    """
+    Calculate estimated time for 80% of items to sell
+    
+    Weighted percentile over (days, quantity) using the upper bound of each estimate
+    (conservative): units are counted per distinct number of days, so memory and time
+    scale with distinct estimates rather than total units.
+    
+    Args:
+        items_with_sales_time: list of {'sales_days_max', 'quantity'} dicts (rows can be
+            pre-aggregated, one per distinct sales_days_max with the summed quantity)
+    """
     if not items_with_sales_time:
         return None
     
-    # Parse sales time to days and sort by time
-    item_days = []
+    # Units per number of days
+    units_by_days = {}
     for item in items_with_sales_time:
-        sales_time = item['sales_time']
+        days = item['sales_days_max'] or 0
         quantity = item['quantity']
-        
-        # Parse common formats: "1-3 months", "2-4 weeks", "1-2 weeks", etc.
-        if not sales_time or sales_time == 'N/A':
-            continue
-        
-        # Ensure sales_time is a string
-        sales_time = str(sales_time)
-            
-        days = 0
-        if 'month' in sales_time.lower():
-            # Extract numbers and take the max (conservative estimate)
-            import re
-            numbers = re.findall(r'\d+', sales_time)
-            if numbers:
-                max_months = max([int(n) for n in numbers])
-                days = max_months * 30
-        elif 'week' in sales_time.lower():
-            import re
-            numbers = re.findall(r'\d+', sales_time)
-            if numbers:
-                max_weeks = max([int(n) for n in numbers])
-                days = max_weeks * 7
-        elif 'day' in sales_time.lower():
-            import re
-            numbers = re.findall(r'\d+', sales_time)
-            if numbers:
-                days = max([int(n) for n in numbers])
-        
-        if days > 0:
-            # Add multiple entries for quantity
-            for _ in range(quantity):
-                item_days.append(days)
-    
-    if not item_days:
+        if quantity is None:
+            quantity = 1
+        if days > 0 and quantity > 0:
+            units_by_days[days] = units_by_days.get(days, 0) + quantity
+    
+    total_units = sum(units_by_days.values())
+    if not total_units:
         return None
     
-    # Sort and get 80th percentile
-    item_days.sort()
-    percentile_80_index = int(len(item_days) * 0.8)
-    days_80 = item_days[percentile_80_index] if percentile_80_index < len(item_days) else item_days[-1]
+    # 80th percentile unit (0-based), found by walking the cumulative counts
+    percentile_80_index = int(total_units * 0.8)
+    cumulative = 0
+    for days_80 in sorted(units_by_days):
+        cumulative += units_by_days[days_80]
+        if cumulative > percentile_80_index:
+            break
     
     # Format as human-readable
     if days_80 < 14:
@@ -1916,6 +2242,31 @@ def calculate_80_percent_sellout_time(items_with_sales_time):
         months = days_80 // 30
         return f"{months} months"
 
+def get_category_breakdown(conn, manifest_id, category_counts):
+    """
+    Get the category breakdown of a manifest from its aggregated category counts
+    
+    Items stored before title categories existed (None category) are classified
+    from their titles.
+    
+    Returns:
+        {category: item count}
+    """
+    categories = {}
+    for category, count in category_counts:
+        if category is None:
+            titles = iter_rows(conn, """
+                SELECT title FROM items
+                WHERE manifest_id = %s AND title_category IS NULL
+                ORDER BY created_at
+            """, (manifest_id,))
+            for title_category in get_title_categories([{'title': title} for title, in titles]):
+                categories[title_category] = categories.get(title_category, 0) + 1
+        else:
+            categories[category] = categories.get(category, 0) + count
+    
+    return categories
+
 def get_upload_status(upload_id):
     """Get upload status and results"""
     try:
@@ -1927,7 +2278,7 @@ def get_upload_status(upload_id):
         
         # Get upload and manifest data
         cursor.execute("""
-            SELECT u.status, u.processed_items, u.error_message, u.filename, u.upload_name,
+            SELECT u.status, u.processed_items, u.error_message, u.filename, u.upload_name, u.early_estimate,
                    m.id as manifest_id, m.total_items, m.total_msrp, 
                    m.projected_revenue, m.profit_margin
             FROM uploads u
@@ -1941,7 +2292,7 @@ def get_upload_status(upload_id):
             conn.close()
             return None
         
-        status, processed_items, error_message, filename, upload_name, manifest_id, total_items, \
+        status, processed_items, error_message, filename, upload_name, early_estimate, manifest_id, total_items, \
             total_msrp, projected_revenue, profit_margin = result
         
         response = {
@@ -1976,62 +2327,48 @@ def get_upload_status(upload_id):
                     'profitMargin': float(avg_profit_margin) if avg_profit_margin else 0,
                     'partial': True  # Indicate this is partial data
                 }
+                
+                # Projected revenue of the whole manifest, from the stratified sample analyzed so far
+                if early_estimate:
+                    response['summary']['estimate'] = query_revenue_estimate(cursor, manifest_id)
         
         # If completed, include results
         if status == 'completed':
-            # Get items
-            cursor.execute("""
+            # Get items (rows read itersize at a time and converted as they arrive, the
+            # response needs every item, so the list of item dicts is the only full copy)
+            response['items'] = list(map(status_item_from_row, iter_rows(conn, """
                 SELECT item_number, title, msrp, quantity,
-                       estimated_sale_price, profit, demand, sales_time, reasoning
+                       estimated_sale_price, profit, demand, sales_time, reasoning, title_category,
+                       sales_days_min, sales_days_max
                 FROM items
                 WHERE manifest_id = %s
                 ORDER BY created_at
-            """, (manifest_id,))
-            
-            items = []
-            for row in cursor.fetchall():
-                item_number, title, msrp, quantity, est_price, profit, demand, sales_time, reasoning = row
-                items.append({
-                    'item_number': item_number,
-                    'title': title,
-                    'msrp': float(msrp) if msrp else 0,
-                    'quantity': quantity,
-                    'analysis': {
-                        'estimatedSalePrice': float(est_price) if est_price else 0,
-                        'demand': demand,
-                        'salesTime': sales_time,
-                        'reasoning': reasoning,
-                        'marketplace': {
-                            'amazon': {'available': False, 'price': None},
-                            'ebay': {'available': False, 'price': None}
-                        }
-                    },
-                    'profit': float(profit) if profit else 0
-                })
-            
-            response['items'] = items
-            
-            # Calculate 80% sellout time
-            cursor.execute("""
-                SELECT sales_time, quantity
-                FROM items
-                WHERE manifest_id = %s
-                AND sales_time IS NOT NULL
-            """, (manifest_id,))
+            """, (manifest_id,))))
             
-            items_for_sellout = [{'sales_time': row[0], 'quantity': row[1]} for row in cursor.fetchall()]
-            sellout_80_time = calculate_80_percent_sellout_time(items_for_sellout)
+            # Summary and charts, aggregated in the database
+            aggregates = query_manifest_aggregates(cursor, manifest_id)
+            sellout_80_time = calculate_80_percent_sellout_time(aggregates['units_by_days'])
             
             response['summary'] = {
                 'totalItems': total_items,
                 'totalMSRP': float(total_msrp) if total_msrp else 0,
                 'projectedRevenue': float(projected_revenue) if projected_revenue else 0,
                 'profitMargin': float(profit_margin) if profit_margin else 0,
-                'avgSalesTime': sellout_80_time
+                'avgSalesTime': sellout_80_time,
+                'recommendations': build_recommendations(
+                    float(profit_margin or 0),
+                    aggregates['total_revenue'],
+                    aggregates['total_msrp'],
+                    aggregates['demand'].get('High', 0),
+                    aggregates['total_items']
+                )
             }
             
             # Generate charts for completed uploads
-            response['charts'] = generate_charts(items)
+            response['charts'] = build_charts(
+                aggregates['revenue_timeline'],
+                get_category_breakdown(conn, manifest_id, aggregates['categories'])
+            )
         
         if error_message:
             response['error_message'] = error_message
@@ -2178,6 +2515,47 @@ def lambda_handler(event, context):
                     'headers': cors_headers,
                     'body': json.dumps(status_data, default=str)
                 }
+            
+            elif '/export/' in path:
+                # Export results to S3 (GET /export/{upload_id}?format=csv|parquet)
+                upload_id = (event.get('pathParameters') or {}).get('upload_id')
+                if not upload_id:
+                    return {
+                        'statusCode': 400,
+                        'headers': cors_headers,
+                        'body': json.dumps({'error': 'Missing upload_id'})
+                    }
+                
+                export_format = (event.get('queryStringParameters') or {}).get('format', 'csv')
+                logger.info(f"Exporting upload {upload_id} as {export_format}")
+                # Runs within the API Gateway request (29 s), larger uploads are refused
+                try:
+                    export_data = export_upload_results(upload_id, export_format)
+                except ExportTooLarge as e:
+                    return {
+                        'statusCode': 413,
+                        'headers': cors_headers,
+                        'body': json.dumps({'error': str(e)})
+                    }
+                except ValueError as e:
+                    return {
+                        'statusCode': 400,
+                        'headers': cors_headers,
+                        'body': json.dumps({'error': str(e)})
+                    }
+                
+                if not export_data:
+                    return {
+                        'statusCode': 404,
+                        'headers': cors_headers,
+                        'body': json.dumps({'error': 'Upload not found or could not be exported'})
+                    }
+                
+                return {
+                    'statusCode': 200,
+                    'headers': cors_headers,
+                    'body': json.dumps(export_data)
+                }
         
         # Handle DELETE requests
         elif http_method == 'DELETE':
@@ -2222,6 +2600,9 @@ def lambda_handler(event, context):
                 file_content = body_data.get('file', '')
                 filename = body_data.get('filename', 'unknown.csv')
                 upload_name = body_data.get('upload_name', '')
+                file_encoding = body_data.get('file_encoding')
+                reuse_analyses = bool(body_data.get('reuse_analyses', False))
+                early_estimate = bool(body_data.get('early_estimate', False))
             except json.JSONDecodeError:
                 return {
                     'statusCode': 400,
@@ -2232,6 +2613,9 @@ def lambda_handler(event, context):
             # Handle direct S3 event
             file_content = ""
             filename = "unknown.csv"
+            file_encoding = None
+            reuse_analyses = False
+            early_estimate = False
         
         if not file_content:
             return {
@@ -2240,6 +2624,18 @@ def lambda_handler(event, context):
                 'body': json.dumps({'error': 'No file content provided'})
             }
         
+        # Uploaded files are sent base64-encoded (raw bytes, the encoding is detected here)
+        if file_encoding == 'base64' or is_binary_manifest(filename):
+            try:
+                file_content = read_manifest_base64(file_content, filename)
+                logger.info(f"Read {len(file_content)} characters of CSV from {filename}")
+            except (ValueError, TypeError) as e:
+                return {
+                    'statusCode': 400,
+                    'headers': cors_headers,
+                    'body': json.dumps({'error': f'Could not read manifest file: {str(e)}'})
+                }
+        
         # Parse CSV
         items = parse_manifest_csv(file_content)
         logger.info(f"Parsed {len(items)} items from CSV")
@@ -2264,7 +2660,8 @@ def lambda_handler(event, context):
         file_hash = calculate_file_hash(file_content)
         logger.info(f"File hash: {file_hash}")
         
-        # Check if we already have analysis for this file (disabled to ensure fresh marketplace data)
+        # Check if we already have analysis for this file (disabled to ensure fresh marketplace data,
+        # see reuse_analyses for item-level reuse within a freshness window)
         existing_analysis = None  # Disabled to ensure fresh Amazon/eBay price lookups
         # existing_analysis = check_existing_analysis(file_hash)
         if existing_analysis:
@@ -2278,7 +2675,7 @@ def lambda_handler(event, context):
         logger.info(f"No existing analysis found, queueing {len(items)} items for async processing")
         
         # Create upload record in database
-        upload_id = create_upload_record(filename, file_hash, len(items), upload_name)
+        upload_id = create_upload_record(filename, file_hash, len(items), upload_name, early_estimate)
         
         if not upload_id:
             return {
@@ -2322,8 +2719,31 @@ def lambda_handler(event, context):
         
         logger.info(f"Inserted {len(item_ids)} items into database")
         
-        # STEP 2: Queue item IDs for async processing
-        queue_success = queue_items_for_processing(upload_id, item_ids)
+        # Optionally copy recent analyses of unchanged items, only the others are analyzed
+        reused_ids = reuse_item_analyses(manifest_id) if reuse_analyses else set()
+        if reused_ids:
+            item_ids = [item_id for item_id in item_ids if item_id not in reused_ids]
+            logger.info(f"Reused {len(reused_ids)} analyses, {len(item_ids)} items left to analyze")
+        
+        # Price low-value and well-known items with the local model, the rest goes to AI
+        # (not in early estimate mode: the early estimate needs a random sample of the items)
+        use_local_pricing = is_local_pricing_enabled() and not early_estimate
+        priced_ids = price_items_locally(manifest_id) if use_local_pricing else set()
+        if priced_ids:
+            item_ids = [item_id for item_id in item_ids if item_id not in priced_ids]
+            logger.info(f"Priced {len(priced_ids)} items locally, {len(item_ids)} items left to analyze")
+        
+        # STEP 2: Queue item IDs for async processing, highest expected value first
+        # (or a stratified sample first in early estimate mode)
+        if item_ids:
+            item_ids, priority_count = prioritize_items(manifest_id, item_ids, early_estimate)
+            queue_success = queue_items_for_processing(upload_id, item_ids, priority_count)
+        else:
+            # Every item was reused or priced locally, complete the upload without the queue
+            from item_processor import update_upload_progress
+            done_count = len(reused_ids | priced_ids)
+            update_upload_progress(upload_id, done_count, done_count)
+            queue_success = True
         
         if not queue_success:
             return {
@@ -2342,6 +2762,8 @@ def lambda_handler(event, context):
                 'upload_id': upload_id,
                 'status': 'processing',
                 'total_items': len(items),
+                'reused_items': len(reused_ids),
+                'locally_priced_items': len(priced_ids),
                 'message': 'Upload accepted. Items are being processed asynchronously.'
             })
         }
@@ -3,28 +3,46 @@ Data Enrichment and Normalization Module
 
 This module enriches product data from various CSV formats into a standardized schema.
 It performs:
-- Product lookup via UPC/ASIN (Amazon PAAPI, UPC databases)
+- Product lookup via UPC/ASIN (Amazon PAAPI, UPC databases), then by title (Amazon search)
 - Data normalization (text cleaning, brand standardization)
 - Price validation and verification
 - Category classification
 """
 
-import re
 import os
 import logging
 from decimal import Decimal
 import requests
 
-# Import Amazon PAAPI (optional - graceful degradation if not available)
-try:
-    from amazon_paapi import AmazonApi
-    AmazonAPI = AmazonApi  # Alias for consistency
-except ImportError:
-    AmazonAPI = None
+import product_catalog
+from normalization import normalize_text, extract_model_number, clean_upc
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Amazon PAAPI module, imported on first lookup to keep cold starts fast
+_amazon_paapi = None
+_amazon_client = None
+
+def get_amazon_paapi():
+    """
+    Import Amazon PAAPI on first use (optional - graceful degradation if not available)
+    
+    Returns:
+        (AmazonApi, ResourceProfile) tuple, or None if the module is not available
+    """
+    global _amazon_paapi
+    
+    if _amazon_paapi is None:
+        try:
+            from amazon_paapi import AmazonApi
+            from amazon_paapi.models import ResourceProfile
+            _amazon_paapi = (AmazonApi, ResourceProfile)
+        except ImportError:
+            _amazon_paapi = False
+    
+    return _amazon_paapi or None
+
 # Brand normalization mappings
 BRAND_ALIASES = {
     'hp': 'HP',
@@ -56,22 +74,6 @@ CONDITION_MAPPING = {
     'damaged': 'Damaged',
 }
 
-def normalize_text(text):
-    """Clean and normalize text"""
-    if not text:
-        return ""
-    
-    # Remove HTML tags
-    text = re.sub(r'<[^>]+>', '', str(text))
-    
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
-    
-    # Remove special characters but keep alphanumeric, spaces, and basic punctuation
-    text = re.sub(r'[^\w\s\-.,()\/]', '', text)
-    
-    return text
-
 def normalize_brand(brand):
     """Normalize brand names"""
     if not brand:
@@ -88,24 +90,80 @@ def normalize_condition(condition):
     condition_lower = condition.lower().strip()
     return CONDITION_MAPPING.get(condition_lower, 'Unknown')
 
-def extract_model_number(title, brand=None):
-    """Extract model number from title"""
-    if not title:
+def get_amazon_client():
+    """
+    Get Amazon PAAPI client (created once per Lambda container)
+    
+    Returns:
+        (AmazonApi instance, ResourceProfile) tuple, or None if not available
+    """
+    global _amazon_client
+    
+    if _amazon_client:
+        return _amazon_client
+    
+    # Check if Amazon API is available
+    amazon_paapi = get_amazon_paapi()
+    if amazon_paapi is None:
+        logger.warning("Amazon PAAPI module not available")
         return None
+    AmazonAPI, ResourceProfile = amazon_paapi
     
-    # Common model patterns
-    patterns = [
-        r'\b[A-Z]{2,}\-?\d{3,}\b',  # e.g., WH-1000XM4, HP-2550
-        r'\b[A-Z]\d{3,}[A-Z]?\b',   # e.g., T480s, X1
-        r'\b\d{3,}[A-Z]{1,3}\b',    # e.g., 3070Ti, 5600X
-    ]
+    # Get Amazon credentials from environment
+    access_key = os.environ.get('AMAZON_ACCESS_KEY')
+    secret_key = os.environ.get('AMAZON_SECRET_KEY')
+    partner_tag = os.environ.get('AMAZON_PARTNER_TAG', 'sndflo-20')
+    country = os.environ.get('AMAZON_REGION', 'US')
     
-    for pattern in patterns:
-        match = re.search(pattern, title)
-        if match:
-            return match.group(0)
+    if not access_key or not secret_key:
+        logger.warning("Amazon PAAPI credentials not configured")
+        return None
     
-    return None
+    _amazon_client = (AmazonAPI(access_key, secret_key, partner_tag, country), ResourceProfile)
+    return _amazon_client
+
+def extract_amazon_product_data(item):
+    """Extract product data dict from an Amazon PAAPI item"""
+    item_info = item.item_info
+    
+    product_data = {
+        'asin': item.asin,
+        'title': None,
+        'brand': None,
+        'list_price': None,
+        'current_price': None,
+        'image_url': None,
+        'category': None,
+        'features': [],
+    }
+    
+    if item_info and item_info.title:
+        product_data['title'] = item_info.title.display_value
+    
+    if item_info and item_info.by_line_info and item_info.by_line_info.brand:
+        product_data['brand'] = item_info.by_line_info.brand.display_value
+    
+    # Extract prices
+    if item.offers and item.offers.listings:
+        listing = item.offers.listings[0]
+        if listing.price:
+            product_data['current_price'] = float(listing.price.amount)
+        if listing.saving_basis:
+            product_data['list_price'] = float(listing.saving_basis.amount)
+    
+    # Extract images
+    if item.images and item.images.primary and item.images.primary.large:
+        product_data['image_url'] = item.images.primary.large.url
+    
+    # Extract category
+    if item_info and item_info.classifications and item_info.classifications.binding:
+        product_data['category'] = item_info.classifications.binding.display_value
+    
+    # Extract features
+    if item_info and item_info.features and item_info.features.display_values:
+        product_data['features'] = item_info.features.display_values[:5]  # Top 5 features
+    
+    return product_data
 
 def lookup_amazon_product(identifier, identifier_type='UPC'):
     """
@@ -119,82 +177,89 @@ def lookup_amazon_product(identifier, identifier_type='UPC'):
         dict with product data or None
     """
     try:
-        # Check if Amazon API is available
-        if AmazonAPI is None:
-            logger.warning("Amazon PAAPI module not available")
-            return None
-        
-        # Get Amazon credentials from Secrets Manager or environment
-        access_key = os.environ.get('AMAZON_ACCESS_KEY')
-        secret_key = os.environ.get('AMAZON_SECRET_KEY')
-        partner_tag = os.environ.get('AMAZON_PARTNER_TAG', 'sndflo-20')
-        region = os.environ.get('AMAZON_REGION', 'us-east-1')
-        
-        if not access_key or not secret_key:
-            logger.warning("Amazon PAAPI credentials not configured")
+        amazon_client = get_amazon_client()
+        if amazon_client is None:
             return None
+        amazon, ResourceProfile = amazon_client
         
-        # Initialize Amazon API
-        amazon = AmazonAPI(access_key, secret_key, partner_tag, region)
-        
-        # Search by identifier
+        # Lookup by identifier
         if identifier_type == 'ASIN':
-            items = amazon.get_items([identifier])
+            items = amazon.get_items([identifier], resource_profile=ResourceProfile.ENRICHMENT)
         else:
-            # Search by UPC/EAN
-            items = amazon.search_items(keywords=identifier, search_index='All')
+            matches = amazon.get_items_by_external_ids([identifier], identifier_type,
+                                                       resource_profile=ResourceProfile.ENRICHMENT)
+            items = list(matches.values())
         
-        if not items or len(items) == 0:
+        if not items:
             return None
         
-        item = items[0]
-        
-        # Extract product data
-        product_data = {
-            'asin': item.asin if hasattr(item, 'asin') else None,
-            'title': item.item_info.title.display_value if hasattr(item.item_info, 'title') else None,
-            'brand': item.item_info.by_line_info.brand.display_value if hasattr(item.item_info, 'by_line_info') else None,
-            'list_price': None,
-            'current_price': None,
-            'image_url': None,
-            'category': None,
-            'features': [],
-        }
+        product_data = extract_amazon_product_data(items[0])
         
-        # Extract prices
-        if hasattr(item, 'offers') and item.offers:
-            listings = item.offers.listings
-            if listings and len(listings) > 0:
-                listing = listings[0]
-                if hasattr(listing, 'price'):
-                    product_data['current_price'] = float(listing.price.amount) if listing.price else None
-                if hasattr(listing, 'saving_basis'):
-                    product_data['list_price'] = float(listing.saving_basis.amount) if listing.saving_basis else None
-        
-        # Extract images
-        if hasattr(item, 'images') and item.images:
-            primary_image = item.images.primary
-            if primary_image and hasattr(primary_image, 'large'):
-                product_data['image_url'] = primary_image.large.url
-        
-        # Extract category
-        if hasattr(item.item_info, 'classifications'):
-            binding = item.item_info.classifications.binding
-            product_data['category'] = binding.display_value if binding else None
-        
-        # Extract features
-        if hasattr(item.item_info, 'features'):
-            features = item.item_info.features
-            if features and hasattr(features, 'display_values'):
-                product_data['features'] = features.display_values[:5]  # Top 5 features
-        
-        logger.info(f"Amazon lookup successful for {identifier}: {product_data.get('title', 'Unknown')[:50]}")
+        logger.info(f"Amazon lookup successful for {identifier}: {(product_data.get('title') or 'Unknown')[:50]}")
         return product_data
         
     except Exception as e:
         logger.warning(f"Amazon lookup failed for {identifier}: {str(e)}")
         return None
 
+def get_item_upc(raw_item):
+    """Get the UPC/EAN of a raw item - from its upc field, or its item number if it looks like one"""
+    for value in (raw_item.get('upc'), raw_item.get('item_number')):
+        if not value:
+            continue
+        value = clean_upc(value)
+        if value.isdigit() and len(value) in (8, 12, 13):
+            return value
+    return None
+
+def resolve_upcs_bulk(raw_items):
+    """
+    Resolve every UPC/EAN in a manifest with batched Amazon GetItems requests (10 codes per call)
+    
+    Args:
+        raw_items: list of raw item dicts
+    
+    Returns:
+        dict mapping UPC/EAN to product data, for codes found on Amazon
+    """
+    codes = {'UPC': [], 'EAN': []}
+    for raw_item in raw_items:
+        upc = get_item_upc(raw_item)
+        if upc and not product_catalog.is_known_miss('amazon_upc', upc):
+            # 12 digit codes are UPC-A, 8 and 13 digit codes are EAN
+            codes['UPC' if len(upc) == 12 else 'EAN'].append(upc)
+    
+    if not codes['UPC'] and not codes['EAN']:
+        return {}
+    
+    amazon_client = get_amazon_client()
+    if amazon_client is None:
+        return {}
+    amazon, ResourceProfile = amazon_client
+    
+    resolved = {}
+    for id_type, ids in codes.items():
+        if not ids:
+            continue
+        try:
+            matches = amazon.get_items_by_external_ids(ids, id_type,
+                                                       resource_profile=ResourceProfile.ENRICHMENT)
+        except Exception as e:
+            logger.warning(f"Bulk Amazon {id_type} lookup failed: {str(e)}")
+            continue
+        
+        for code, item in matches.items():
+            product_data = extract_amazon_product_data(item)
+            product_data['enrichment_source'] = f'Amazon {id_type} Lookup'
+            resolved[code] = product_data
+        
+        for code in ids:
+            if code not in matches:
+                product_catalog.record_miss('amazon_upc', code)
+    
+    logger.info(f"Bulk Amazon lookup resolved {len(resolved)}/{len(codes['UPC']) + len(codes['EAN'])} UPC/EAN codes")
+    return resolved
+
 def search_amazon_by_title(title, brand=None):
     """
     Search Amazon by product title/description
@@ -206,24 +271,15 @@ def search_amazon_by_title(title, brand=None):
     Returns:
         dict with product data or None
     """
+    miss_key = product_catalog.normalize_title_key(title)
+    if product_catalog.is_known_miss('amazon_search', miss_key):
+        return None
+    
     try:
-        # Check if Amazon API is available
-        if AmazonAPI is None:
-            logger.warning("Amazon PAAPI module not available")
-            return None
-        
-        # Get Amazon credentials
-        access_key = os.environ.get('AMAZON_ACCESS_KEY')
-        secret_key = os.environ.get('AMAZON_SECRET_KEY')
-        partner_tag = os.environ.get('AMAZON_PARTNER_TAG', 'sndflo-20')
-        region = os.environ.get('AMAZON_REGION', 'us-east-1')
-        
-        if not access_key or not secret_key:
-            logger.warning("Amazon PAAPI credentials not configured")
+        amazon_client = get_amazon_client()
+        if amazon_client is None:
             return None
-        
-        # Initialize Amazon API
-        amazon = AmazonAPI(access_key, secret_key, partner_tag, region)
+        amazon, ResourceProfile = amazon_client
         
         # Clean and prepare search query
         # Extract key product identifiers from title
@@ -236,55 +292,19 @@ def search_amazon_by_title(title, brand=None):
         logger.info(f"Searching Amazon for: {search_query[:50]}...")
         
         # Search Amazon - use 'All' category for broad search
-        items = amazon.search_items(keywords=search_query, search_index='All', item_count=3)
+        search_result = amazon.search_items(keywords=search_query, search_index='All', item_count=3,
+                                            resource_profile=ResourceProfile.ENRICHMENT)
         
-        if not items or len(items) == 0:
+        if not search_result or not search_result.items:
             logger.info(f"No Amazon results for: {search_query[:50]}")
+            product_catalog.record_miss('amazon_search', miss_key)
             return None
         
         # Take the first (best match) result
-        item = items[0]
-        
-        # Extract product data (same as lookup_amazon_product)
-        product_data = {
-            'asin': item.asin if hasattr(item, 'asin') else None,
-            'title': item.item_info.title.display_value if hasattr(item.item_info, 'title') else None,
-            'brand': item.item_info.by_line_info.brand.display_value if hasattr(item.item_info, 'by_line_info') else None,
-            'list_price': None,
-            'current_price': None,
-            'image_url': None,
-            'category': None,
-            'features': [],
-        }
+        product_data = extract_amazon_product_data(search_result.items[0])
+        product_data['enrichment_source'] = 'Amazon Title Search'
         
-        # Extract prices
-        if hasattr(item, 'offers') and item.offers:
-            listings = item.offers.listings
-            if listings and len(listings) > 0:
-                listing = listings[0]
-                if hasattr(listing, 'price'):
-                    product_data['current_price'] = float(listing.price.amount) if listing.price else None
-                if hasattr(listing, 'saving_basis'):
-                    product_data['list_price'] = float(listing.saving_basis.amount) if listing.saving_basis else None
-        
-        # Extract images
-        if hasattr(item, 'images') and item.images:
-            primary_image = item.images.primary
-            if primary_image and hasattr(primary_image, 'large'):
-                product_data['image_url'] = primary_image.large.url
-        
-        # Extract category
-        if hasattr(item.item_info, 'classifications'):
-            binding = item.item_info.classifications.binding
-            product_data['category'] = binding.display_value if binding else None
-        
-        # Extract features
-        if hasattr(item.item_info, 'features'):
-            features = item.item_info.features
-            if features and hasattr(features, 'display_values'):
-                product_data['features'] = features.display_values[:5]
-        
-        logger.info(f"Amazon search successful: {product_data.get('title', 'Unknown')[:50]}")
+        logger.info(f"Amazon search successful: {(product_data.get('title') or 'Unknown')[:50]}")
         return product_data
         
     except Exception as e:
@@ -302,6 +322,10 @@ def ai_find_amazon_asin(title, brand=None):
     Returns:
         dict with ASIN and estimated current price, or None
     """
+    miss_key = product_catalog.normalize_title_key(title)
+    if product_catalog.is_known_miss('ai_asin', miss_key):
+        return None
+    
     try:
         # Get API keys from csv_processor module
         from csv_processor import get_api_keys
@@ -377,6 +401,8 @@ If you cannot determine the ASIN, respond with: {{"asin": null, "current_price":
                     'current_price': ai_result.get('current_price'),
                     'enrichment_source': 'AI ASIN Lookup'
                 }
+            
+            product_catalog.record_miss('ai_asin', miss_key)
         
         return None
         
@@ -389,6 +415,9 @@ def lookup_upc_database(upc):
     Lookup product in UPC database (fallback if Amazon fails)
     Using UPCitemdb.com API (free tier)
     """
+    if product_catalog.is_known_miss('upc_database', upc):
+        return None
+    
     try:
         # Note: This is a free API, consider upgrading for production
         url = f"https://api.upcitemdb.com/prod/trial/lookup?upc={upc}"
@@ -400,6 +429,7 @@ def lookup_upc_database(upc):
         data = response.json()
         
         if data.get('code') != 'OK' or not data.get('items'):
+            product_catalog.record_miss('upc_database', upc)
             return None
         
         item = data['items'][0]
@@ -410,18 +440,30 @@ def lookup_upc_database(upc):
             'category': item.get('category'),
             'image_url': item.get('images', [None])[0] if item.get('images') else None,
             'upc': upc,
+            'enrichment_source': 'UPC Database',
         }
         
     except Exception as e:
         logger.warning(f"UPC database lookup failed for {upc}: {str(e)}")
         return None
 
-def enrich_product(raw_item):
+def is_upc_database_enabled():
+    """Check if UPCs Amazon did not match are looked up in the UPC database (trial API, 100 lookups a day)"""
+    return os.environ.get('ENABLE_UPC_DATABASE_LOOKUP', 'false').lower() == 'true'
+
+def is_title_search_enabled():
+    """Check if items without a UPC/ASIN match are searched on Amazon by title"""
+    return os.environ.get('ENABLE_AMAZON_TITLE_SEARCH', 'true').lower() == 'true'
+
+def enrich_product(raw_item, amazon_data=None, lookup_keys=None):
     """
     Main enrichment function - takes raw parsed item and returns enriched standardized item
     
     Args:
         raw_item: dict with fields like {item_number, title, msrp, upc, brand, quantity}
+        amazon_data: optional product data already resolved for this item's UPC
+            (see resolve_upcs_bulk)
+        lookup_keys: optional product_catalog.get_lookup_keys(raw_item)
     
     Returns:
         dict with standardized enriched product data
@@ -449,15 +491,34 @@ def enrich_product(raw_item):
         'enrichment_source': None,
     }
     
-    # Try to enrich from external sources
-    external_data = None
+    # Try to enrich from external sources, starting with the bulk UPC lookup result,
+    # then the product catalog (skips external lookups for products seen before)
+    catalog_data = product_catalog.lookup_product(raw_item, lookup_keys)
+    external_data = amazon_data
+    if not external_data and catalog_data and not catalog_data['stale']:
+        external_data = catalog_data
+    if external_data:
+        enriched['enrichment_source'] = external_data.get('enrichment_source', 'Amazon UPC Lookup')
+    
+    # Then the UPC database and an Amazon title search (codes and titles that found
+    # nothing are skipped until their miss expires)
+    upc = get_item_upc(raw_item)
+    if is_upc_database_enabled() and not external_data and upc:
+        external_data = lookup_upc_database(upc)
+        if external_data:
+            enriched['enrichment_source'] = external_data['enrichment_source']
+    
+    if is_title_search_enabled() and not external_data and enriched['title'] and not enriched['asin']:
+        external_data = search_amazon_by_title(enriched['title'], enriched.get('brand'))
+        if external_data:
+            enriched['enrichment_source'] = external_data['enrichment_source']
     
     # Use AI to find Amazon ASIN based on product description (if enabled)
     # This is more reliable than Amazon PAAPI in Lambda (no filesystem issues)
     # NOTE: This is slow and uses AI API calls, so it's optional
     enable_ai_asin_lookup = os.environ.get('ENABLE_AI_ASIN_LOOKUP', 'false').lower() == 'true'
     
-    if enable_ai_asin_lookup and enriched['title'] and not enriched['asin']:
+    if enable_ai_asin_lookup and not external_data and enriched['title'] and not enriched['asin']:
         external_data = ai_find_amazon_asin(enriched['title'], enriched.get('brand'))
         if external_data and external_data.get('asin'):
             # Update enrichment metadata
@@ -468,6 +529,11 @@ def enrich_product(raw_item):
             enriched['enriched'] = True
             enriched['enrichment_source'] = external_data.get('enrichment_source', 'AI ASIN Lookup')
     
+    # Fall back to the fields of a stale catalog entry that are still fresh
+    if not external_data and catalog_data:
+        external_data = catalog_data
+        enriched['enrichment_source'] = catalog_data['enrichment_source']
+    
     # Merge external data (prefer external data when available)
     if external_data:
         enriched['enriched'] = True
@@ -516,6 +582,9 @@ def enrich_product(raw_item):
     if not enriched['model']:
         enriched['model'] = extract_model_number(enriched['title'], enriched['brand'])
     
+    # Remember externally enriched products for the next uploads
+    product_catalog.record_product(raw_item, enriched, external_data)
+    
     # Validate final data
     if not enriched['title'] or len(enriched['title']) < 3:
         logger.warning(f"Item {enriched['item_id']} has invalid title after enrichment")
@@ -542,9 +611,22 @@ def enrich_batch(raw_items, max_workers=10):
     
     enriched_items = []
     
+    # Load known products from the catalog, then resolve the remaining UPCs in bulk.
+    # Items without a match fall back to title-based lookups. The lookup keys (model
+    # numbers extracted from titles) are computed once per item
+    lookup_keys = [product_catalog.get_lookup_keys(item) for item in raw_items]
+    product_catalog.prefetch_products(raw_items, lookup_keys)
+    upc_matches = resolve_upcs_bulk([
+        item for item, keys in zip(raw_items, lookup_keys)
+        if (product_catalog.lookup_product(item, keys) or {}).get('stale', True)
+    ])
+    
     # Process in parallel
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(enrich_product, item): item for item in raw_items}
+        futures = {
+            executor.submit(enrich_product, item, upc_matches.get(get_item_upc(item)), keys): item
+            for item, keys in zip(raw_items, lookup_keys)
+        }
         
         for future in as_completed(futures):
             try:
@@ -564,6 +646,8 @@ def enrich_batch(raw_items, max_workers=10):
     item_order = {item['item_number']: i for i, item in enumerate(raw_items)}
     enriched_items.sort(key=lambda x: item_order.get(x['item_id'], 999999))
     
+    product_catalog.flush_products()
+    
     logger.info(f"Enriched {len(enriched_items)} items, {sum(1 for i in enriched_items if i.get('enriched'))} successfully enriched")
     
     return enriched_items
@@ -0,0 +1,180 @@
+"""
+Early Estimate Module
+
+Projected revenue of a manifest with a confidence interval while it is being analyzed,
+so a bid can be decided from the first few hundred items:
+- Items are stratified by unit MSRP band and title category
+- Queue order is a stratified random sample: every stratum gets its first items early,
+  then items are drawn in random order within each stratum, proportionally to the
+  stratum's MSRP value (big strata dominate the variance)
+- The estimate is a separate ratio estimator (revenue / MSRP of the analyzed items of
+  each stratum, times the stratum's MSRP), computed from per-stratum sums in one query;
+  the interval tightens as more items finish
+"""
+
+import os
+import math
+import random
+import logging
+from bisect import bisect_right
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Upper bounds of the unit MSRP bands ($0-25, 25-100, 100-500, 500-2000, 2000+)
+MSRP_BANDS = [25, 100, 500, 2000]
+
+# Items of each stratum queued before value-proportional allocation starts
+MIN_ITEMS_PER_STRATUM = 2
+
+# 95% two-sided normal interval
+CONFIDENCE = 0.95
+CONFIDENCE_Z = 1.96
+
+BAND_SQL = "CASE {} ELSE {} END".format(
+    ' '.join(f"WHEN COALESCE(msrp, 0) < {bound} THEN {band}" for band, bound in enumerate(MSRP_BANDS)),
+    len(MSRP_BANDS)
+)
+
+STRATA_SQL = f"""
+    WITH item_values AS (
+        SELECT
+            {BAND_SQL} AS band,
+            title_category,
+            COALESCE(msrp, 0)::FLOAT8 * COALESCE(quantity, 1) AS x,
+            COALESCE(estimated_sale_price, 0)::FLOAT8 * COALESCE(quantity, 1) AS y,
+            status = 'processed' AS done
+        FROM items
+        WHERE manifest_id = %s
+    )
+    SELECT
+        band, title_category,
+        COUNT(*),
+        COALESCE(SUM(x), 0),
+        COUNT(*) FILTER (WHERE done),
+        COALESCE(SUM(x) FILTER (WHERE done), 0),
+        COALESCE(SUM(y) FILTER (WHERE done), 0),
+        COALESCE(SUM(x * x) FILTER (WHERE done), 0),
+        COALESCE(SUM(y * y) FILTER (WHERE done), 0),
+        COALESCE(SUM(x * y) FILTER (WHERE done), 0)
+    FROM item_values
+    GROUP BY band, title_category
+"""
+
+def get_sample_size():
+    """Get the number of items of the initial sample (sent to the priority queue)"""
+    return int(os.environ.get('EARLY_ESTIMATE_SAMPLE_SIZE', '200'))
+
+def msrp_band(msrp):
+    """Get the MSRP band of a unit MSRP (same bands as BAND_SQL)"""
+    return bisect_right(MSRP_BANDS, float(msrp or 0))
+
+def order_for_estimate(items, seed=None):
+    """
+    Order items so every prefix is a stratified random sample of the manifest
+
+    Args:
+        items: list of (item_id, msrp, quantity, title_category)
+        seed: random seed (tests)
+
+    Returns:
+        list of item ids, in queue order
+    """
+    rng = random.Random(seed)
+    strata = {}
+    for item_id, msrp, quantity, title_category in items:
+        value = float(msrp or 0) * (quantity or 1)
+        strata.setdefault((msrp_band(msrp), title_category), []).append((item_id, value))
+
+    keyed = []
+    for stratum_items in strata.values():
+        rng.shuffle(stratum_items)
+        stratum_value = sum(value for _, value in stratum_items)
+        for rank, (item_id, _) in enumerate(stratum_items):
+            if rank < MIN_ITEMS_PER_STRATUM:
+                key = (0, rank)
+            else:
+                key = (1, (rank + 1) / stratum_value if stratum_value > 0 else math.inf)
+            keyed.append((key, item_id))
+
+    keyed.sort(key=lambda entry: entry[0])
+    return [item_id for _, item_id in keyed]
+
+def residual_variance(n, sxx, syy, sxy, ratio):
+    """Sample variance of y - ratio * x from the sums of n items"""
+    if n < 2:
+        return 0.0
+    return max(syy - 2 * ratio * sxy + ratio * ratio * sxx, 0.0) / (n - 1)
+
+def estimate_from_strata(strata):
+    """
+    Estimate the projected revenue of a manifest from its per-stratum sums
+
+    Args:
+        strata: list of (band, category, N, X, n, sx, sy, sxx, syy, sxy) rows: item count and
+            MSRP value of the stratum, then count and sums of the analyzed items
+            (x = msrp * quantity, y = estimated_sale_price * quantity)
+
+    Returns:
+        dict with projectedRevenue, low, high, confidence and sampledItems, or None
+        before two items are analyzed
+    """
+    totals = [sum(row[column] for row in strata) for column in range(4, 10)]
+    n_all, sx_all, sy_all, sxx_all, syy_all, sxy_all = totals
+    if n_all < 2:
+        return None
+
+    # Strata with fewer than two analyzed items borrow the manifest-wide ratio and spread
+    pooled_ratio = sy_all / sx_all if sx_all > 0 else 0.0
+    pooled_variance = residual_variance(n_all, sxx_all, syy_all, sxy_all, pooled_ratio)
+    pooled_mean = sy_all / n_all
+
+    estimate = 0.0
+    variance = 0.0
+    for _, _, count, value, n, sx, sy, sxx, syy, sxy in strata:
+        if n >= count:
+            estimate += sy
+            continue
+
+        if n >= 2:
+            if value > 0 and sx > 0:
+                ratio = sy / sx
+                estimate += ratio * value
+                stratum_variance = residual_variance(n, sxx, syy, sxy, ratio)
+            else:
+                # No MSRP to scale by: mean per item
+                estimate += count * sy / n
+                stratum_variance = max(syy - sy * sy / n, 0.0) / (n - 1)
+        else:
+            estimate += pooled_ratio * value if value > 0 else count * pooled_mean
+            stratum_variance = pooled_variance
+
+        variance += count * count * (1 - n / count) * stratum_variance / max(n, 1)
+
+    margin = CONFIDENCE_Z * math.sqrt(variance)
+    return {
+        'projectedRevenue': estimate,
+        'low': max(estimate - margin, 0.0),
+        'high': estimate + margin,
+        'confidence': CONFIDENCE,
+        'sampledItems': n_all,
+    }
+
+def query_revenue_estimate(cursor, manifest_id):
+    """
+    Estimate the projected revenue of a manifest being analyzed
+
+    Args:
+        cursor: database cursor
+        manifest_id: manifest to estimate
+
+    Returns:
+        see estimate_from_strata
+    """
+    cursor.execute(STRATA_SQL, (manifest_id,))
+    estimate = estimate_from_strata(cursor.fetchall())
+
+    if estimate:
+        logger.info(f"Revenue estimate of manifest {manifest_id} from {estimate['sampledItems']} items: "
+                    f"{estimate['projectedRevenue']:.2f} ({estimate['low']:.2f}-{estimate['high']:.2f})")
+    return estimate
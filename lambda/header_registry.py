@@ -0,0 +1,203 @@
+"""
+Header Registry Module
+
+Registry of known manifest header rows (table `header_formats`), keyed by a fingerprint
+of the normalized header row. Vendors send the same header row every week, so format
+detection is a dict lookup after the first upload, and the format and column mapping
+picked for a header row stay the same even if the detection heuristics change:
+- Seeded with the header rows of the vendor formats csv_processor knows
+- Learned for new header rows, when the heuristic detection is confident and the row
+  has no numeric cells (the first data row of a headerless file is not learned)
+- Learned rows not seen for HEADER_FORMAT_TTL_DAYS expire, at most
+  HEADER_REGISTRY_MAX_ROWS of the most recently seen are loaded
+- Loaded once per Lambda container
+"""
+
+import os
+import re
+import json
+import hashlib
+import logging
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Documented header rows of the vendor formats (see csv_processor.VENDOR_FORMATS)
+SEED_HEADERS = {
+    'liquidation': ['UPC', 'Description', 'Category', 'Qty', 'Retail Price', 'Total Retail Price'],
+    'staples': ['Description', 'Model', 'Quantity', 'Retail Price', 'Ext. Retail Price', 'Sku Restriction'],
+    'direct_liquidation': ['Item Title', 'Quantity', 'Retail Price', 'UPC', 'Brand'],
+    'department_store': ['SKU', 'Product Name', 'Brand', 'Condition', 'Quantity', 'MSRP', 'Extended MSRP'],
+    'electronics': ['Model Number', 'Description', 'Condition', 'Qty', 'Retail Price', 'Total Retail'],
+    'costco': ['Item Number', 'Description', 'Quantity', 'Sell Price', 'Extended Sell', 'Salvage Percent'],
+}
+
+# Numbers, prices and percentages: cells of a data row, never of a header row
+NUMERIC_CELL_RE = re.compile(r'^[-+]?[$€£]?\s*[-+]?(\d[\d,]*\.?\d*|\.\d+)\s*%?$')
+
+# Fingerprint -> {'format': name, 'column_map': {field: normalized header} or None, 'learned': bool}
+_registry = None
+# Learned fingerprints whose last_seen_at this container has updated
+_seen = set()
+
+def normalize_header(header):
+    """Normalize a header cell (case, surrounding whitespace, byte order mark)"""
+    return (header or '').replace('\ufeff', '').strip().lower()
+
+def get_ttl_days():
+    """Get how long a learned header row is kept after it was last seen"""
+    return int(os.environ.get('HEADER_FORMAT_TTL_DAYS', '180'))
+
+def get_max_rows():
+    """Get the most learned header rows loaded"""
+    return int(os.environ.get('HEADER_REGISTRY_MAX_ROWS', '5000'))
+
+def is_header_row(headers):
+    """Check if a row looks like a header row (some text, no numeric or price cells)"""
+    cells = [normalize_header(header) for header in headers]
+    return any(cells) and not any(NUMERIC_CELL_RE.match(cell) for cell in cells)
+
+def get_header_fingerprint(headers):
+    """Get the fingerprint of a header row"""
+    normalized = '\x1f'.join(normalize_header(header) for header in headers)
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+def load_registry():
+    """Load the registry (seeds plus learned header rows), once per container"""
+    global _registry
+
+    if _registry is not None:
+        return _registry
+
+    registry = {
+        get_header_fingerprint(headers): {'format': format_name, 'column_map': None, 'learned': False}
+        for format_name, headers in SEED_HEADERS.items()
+    }
+
+    try:
+        from csv_processor import get_db_connection
+        conn = get_db_connection()
+        if conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT fingerprint, format, column_map
+                FROM header_formats
+                WHERE last_seen_at >= CURRENT_TIMESTAMP - %s * INTERVAL '1 day'
+                ORDER BY last_seen_at DESC
+                LIMIT %s
+            """, (get_ttl_days(), get_max_rows()))
+            for fingerprint, format_name, column_map in cursor.fetchall():
+                if isinstance(column_map, str):
+                    column_map = json.loads(column_map)
+                registry[fingerprint] = {'format': format_name, 'column_map': column_map, 'learned': True}
+            cursor.close()
+            conn.close()
+
+    except Exception as e:
+        logger.warning(f"Header registry load failed, using seeds only: {str(e)}")
+
+    _registry = registry
+    logger.info(f"Header registry loaded with {len(_registry)} header rows")
+    return _registry
+
+def lookup_header_format(headers):
+    """
+    Look up a header row in the registry
+
+    Args:
+        headers: header row cells
+
+    Returns:
+        (format name, column map or None) tuple, the column map uses this file's header
+        names, or None if the header row is not known
+    """
+    fingerprint = get_header_fingerprint(headers)
+    entry = load_registry().get(fingerprint)
+    if not entry:
+        return None
+    if entry['learned'] and fingerprint not in _seen:
+        touch_header_format(fingerprint)
+
+    column_map = entry['column_map']
+    if column_map is not None:
+        # Same fingerprint means same normalized headers, map back to this file's spelling
+        actual = {normalize_header(header): header for header in headers}
+        column_map = {field: actual.get(header) if header else None for field, header in column_map.items()}
+
+    return entry['format'], column_map
+
+def touch_header_format(fingerprint):
+    """Keep a learned header row from expiring (once per container)"""
+    _seen.add(fingerprint)
+    try:
+        from csv_processor import get_db_connection
+        conn = get_db_connection()
+        if not conn:
+            return
+
+        cursor = conn.cursor()
+        cursor.execute("""
+            UPDATE header_formats SET last_seen_at = CURRENT_TIMESTAMP
+            WHERE fingerprint = %s AND last_seen_at < CURRENT_DATE
+        """, (fingerprint,))
+        conn.commit()
+        cursor.close()
+        conn.close()
+
+    except Exception as e:
+        logger.warning(f"Header registry update failed: {str(e)}")
+
+def record_header_format(headers, format_name, column_map=None):
+    """
+    Add a header row to the registry after a confident heuristic detection
+
+    Args:
+        headers: header row cells
+        format_name: detected format
+        column_map: column map used for the format, if any
+
+    Returns:
+        True if the row was learned, False if it does not look like a header row
+    """
+    if not is_header_row(headers):
+        logger.info("First row has numeric cells, not learned as a header row")
+        return False
+
+    fingerprint = get_header_fingerprint(headers)
+    if column_map is not None:
+        column_map = {field: normalize_header(header) if header else None for field, header in column_map.items()}
+
+    load_registry()[fingerprint] = {'format': format_name, 'column_map': column_map, 'learned': True}
+    _seen.add(fingerprint)
+
+    try:
+        from csv_processor import get_db_connection
+        conn = get_db_connection()
+        if not conn:
+            return True
+
+        cursor = conn.cursor()
+        cursor.execute(
+            "DELETE FROM header_formats WHERE last_seen_at < CURRENT_TIMESTAMP - %s * INTERVAL '1 day'",
+            (get_ttl_days(),)
+        )
+        cursor.execute("""
+            INSERT INTO header_formats (fingerprint, format, column_map, headers)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (fingerprint) DO UPDATE SET last_seen_at = CURRENT_TIMESTAMP
+        """, (
+            fingerprint,
+            format_name,
+            json.dumps(column_map) if column_map is not None else None,
+            json.dumps([normalize_header(header) for header in headers]),
+        ))
+        conn.commit()
+        cursor.close()
+        conn.close()
+
+        logger.info(f"Learned header row {fingerprint[:12]} as {format_name} format")
+
+    except Exception as e:
+        logger.warning(f"Header registry write failed: {str(e)}")
+
+    return True
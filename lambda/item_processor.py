@@ -6,6 +6,7 @@ from csv_processor import (
     analyze_item_with_ai,
     get_db_connection
 )
+from normalization import parse_sales_days
 
 # Configure logging
 logger = logging.getLogger()
@@ -37,7 +38,7 @@ def lambda_handler(event, context):
                 
                 cursor = conn.cursor()
                 cursor.execute("""
-                    SELECT id, item_number, title, msrp, quantity, status
+                    SELECT id, item_number, title, msrp, quantity, status, condition, brand
                     FROM items
                     WHERE id = %s
                 """, (item_id,))
@@ -57,7 +58,9 @@ def lambda_handler(event, context):
                     'title': row[2],
                     'msrp': row[3],
                     'quantity': row[4],
-                    'status': row[5]
+                    'status': row[5],
+                    'condition': row[6] or 'Unknown',
+                    'brand': row[7]
                 }
                 
                 # Skip if already processed
@@ -139,6 +142,9 @@ def save_item_analysis(upload_id, item, analysis, profit):
         
         logger.info(f"Saving item {item_number} to manifest {manifest_id}")
         
+        # Sales time range in days, parsed once here so aggregates are numeric queries
+        sales_days = parse_sales_days(analysis.get('salesTime')) or (None, None)
+        
         # Update item with analysis results (item already exists from insert_items_to_database)
         cursor.execute("""
             UPDATE items
@@ -146,6 +152,8 @@ def save_item_analysis(upload_id, item, analysis, profit):
                 profit = %s,
                 demand = %s,
                 sales_time = %s,
+                sales_days_min = %s,
+                sales_days_max = %s,
                 reasoning = %s,
                 asin = %s,
                 model = %s,
@@ -158,6 +166,8 @@ def save_item_analysis(upload_id, item, analysis, profit):
                 features = %s,
                 image_url = %s,
                 status = 'processed',
+                priced_by = %s,
+                analyzed_at = CURRENT_TIMESTAMP,
                 updated_at = CURRENT_TIMESTAMP
             WHERE id = %s
         """, (
@@ -165,6 +175,8 @@ def save_item_analysis(upload_id, item, analysis, profit):
             profit,
             analysis.get('demand'),
             analysis.get('salesTime'),
+            sales_days[0],
+            sales_days[1],
             analysis.get('reasoning'),
             item.get('asin'),
             item.get('model'),
@@ -176,6 +188,7 @@ def save_item_analysis(upload_id, item, analysis, profit):
             item.get('category'),
             json.dumps(item.get('features', [])) if item.get('features') else None,
             item.get('image_url'),
+            analysis.get('pricedBy', 'ai'),
             item['id']  # WHERE id = %s
         ))
         
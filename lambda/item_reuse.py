@@ -0,0 +1,106 @@
+"""
+Item Reuse Module
+
+Item-level reuse of analyses across uploads. Every item is stored with a fingerprint
+of what its analysis depends on:
+- Normalized identity (ASIN, UPC, model number or normalized title, first available)
+- MSRP (to the cent)
+- Condition
+
+When an upload asks for reuse, pending items whose fingerprint matches an item analyzed
+within the freshness window (ITEM_REUSE_MAX_AGE_HOURS, marketplace prices go stale)
+get a copy of that analysis; only new or changed items are queued for analysis.
+Copies point to the item the analysis was made for (reused_from), so they are not
+counted again as history.
+"""
+
+import os
+import hashlib
+import logging
+
+from product_catalog import get_lookup_keys
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Analysis columns copied from the most recent matching item (analyzed_at is kept,
+# so a copy does not extend the freshness of its prices, and priced_by, so a copy of a
+# local or similar-item price is not taken for an AI analysis)
+REUSED_COLUMNS = [
+    'estimated_sale_price', 'profit', 'demand', 'sales_time', 'sales_days_min', 'sales_days_max',
+    'reasoning', 'asin', 'model', 'enriched', 'enrichment_source', 'msrp_verified',
+    'current_market_price', 'condition', 'category', 'features', 'image_url', 'analyzed_at', 'priced_by',
+]
+
+COPY_ANALYSES_SQL = f"""
+    UPDATE items AS target
+    SET {', '.join(f'{column} = source.{column}' for column in REUSED_COLUMNS)},
+        reused_from = COALESCE(source.reused_from, source.id),
+        status = 'processed',
+        updated_at = CURRENT_TIMESTAMP
+    FROM (
+        SELECT DISTINCT ON (fingerprint) fingerprint, id, reused_from, {', '.join(REUSED_COLUMNS)}
+        FROM items
+        WHERE fingerprint IN (
+                SELECT fingerprint FROM items
+                WHERE manifest_id = %(manifest_id)s AND status = 'pending' AND fingerprint IS NOT NULL
+            )
+            AND manifest_id <> %(manifest_id)s
+            AND status = 'processed'
+            AND demand <> 'Error'
+            AND analyzed_at >= CURRENT_TIMESTAMP - %(max_age_hours)s * INTERVAL '1 hour'
+        ORDER BY fingerprint, analyzed_at DESC
+    ) AS source
+    WHERE target.manifest_id = %(manifest_id)s
+        AND target.status = 'pending'
+        AND target.fingerprint = source.fingerprint
+    RETURNING target.id
+"""
+
+def get_reuse_max_age_hours():
+    """Get how old a reused analysis may be (its marketplace prices are that old)"""
+    return float(os.environ.get('ITEM_REUSE_MAX_AGE_HOURS', '24'))
+
+def item_fingerprint(item):
+    """
+    Fingerprint the inputs of an item's analysis
+
+    Args:
+        item: enriched item dict
+
+    Returns:
+        hex digest, or None if the item has no identity
+    """
+    keys = get_lookup_keys(item)
+    if not keys:
+        return None
+
+    key, value = keys[0]
+    try:
+        msrp = f"{float(item.get('msrp') or 0):.2f}"
+    except (TypeError, ValueError):
+        msrp = ''
+    condition = (item.get('condition') or 'Unknown').strip().lower()
+
+    return hashlib.sha256(f"{key}={str(value).strip().lower()}|{msrp}|{condition}".encode('utf-8')).hexdigest()
+
+def copy_fresh_analyses(cursor, manifest_id, max_age_hours=None):
+    """
+    Copy recent analyses of matching items onto the pending items of a manifest
+
+    Args:
+        cursor: database cursor (the caller commits)
+        manifest_id: manifest whose pending items are filled
+        max_age_hours: freshness window, ITEM_REUSE_MAX_AGE_HOURS by default
+
+    Returns:
+        set of ids of the items that got an analysis (and are now processed)
+    """
+    if max_age_hours is None:
+        max_age_hours = get_reuse_max_age_hours()
+
+    cursor.execute(COPY_ANALYSES_SQL, {'manifest_id': manifest_id, 'max_age_hours': max_age_hours})
+    reused_ids = {row[0] for row in cursor.fetchall()}
+
+    logger.info(f"Reused {len(reused_ids)} analyses (at most {max_age_hours:g} hours old) for manifest {manifest_id}")
+    return reused_ids
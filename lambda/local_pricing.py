@@ -0,0 +1,248 @@
+"""
+Local Pricing Module
+
+Prices items from our own analysis history instead of marketplace lookups and a paid AI
+call. The model is trained in one GROUP BY GROUPING SETS query over the AI-analyzed
+items (not over its own predictions, prices copied from similar items or analyses
+reused from other uploads) and predicts the sale price / MSRP ratio from:
+- Pricing category (items.price_category)
+- Unit MSRP band (same bands as early_estimate)
+- Condition
+- Brand
+
+Segments go from the whole history down to category + band + condition + brand; each
+level's mean log ratio is shrunk towards its parent by the number of items behind it,
+so thin segments fall back on broader ones. Demand and sales time come from the most
+specific segment with enough items.
+
+An item is priced locally when its value (msrp * quantity) is below
+LOCAL_PRICING_MAX_VALUE, or when the predicted error of its price is below
+LOCAL_PRICING_MAX_ERROR; all others take the full AI + marketplace path.
+"""
+
+import os
+import math
+import logging
+from datetime import datetime, timedelta
+
+from early_estimate import BAND_SQL, msrp_band
+from normalization import format_sales_days, parse_sales_days
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Items a segment needs to weigh as much as its parent
+PRIOR_ITEMS = 20
+
+# GROUPING() bitmask of each grouping set -> segment level (key length)
+SEGMENT_LEVELS = {0b1111: 0, 0b0111: 1, 0b0011: 2, 0b0001: 3, 0b0000: 4}
+
+TRAINING_SQL = f"""
+    WITH history AS (
+        SELECT
+            COALESCE(price_category, 'General') AS price_category,
+            {BAND_SQL} AS band,
+            COALESCE(condition, 'Unknown') AS condition,
+            COALESCE(LOWER(brand), '') AS brand,
+            LN(estimated_sale_price / msrp)::FLOAT8 AS log_ratio,
+            demand, sales_days_min, sales_days_max
+        FROM items
+        WHERE status = 'processed'
+            AND COALESCE(priced_by, 'ai') = 'ai'
+            AND reused_from IS NULL
+            AND msrp > 0 AND estimated_sale_price > 0
+            AND demand IN ('High', 'Medium', 'Low')
+            AND analyzed_at >= CURRENT_TIMESTAMP - %s * INTERVAL '1 day'
+    )
+    SELECT
+        GROUPING(price_category, band, condition, brand),
+        price_category, band, condition, brand,
+        COUNT(*),
+        AVG(log_ratio),
+        COALESCE(VAR_SAMP(log_ratio), 0),
+        MODE() WITHIN GROUP (ORDER BY demand),
+        PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY sales_days_min),
+        PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY sales_days_max)
+    FROM history
+    GROUP BY GROUPING SETS (
+        (), (price_category), (price_category, band), (price_category, band, condition),
+        (price_category, band, condition, brand)
+    )
+"""
+
+PENDING_ITEMS_SQL = """
+    SELECT id, msrp, quantity, price_category, condition, brand
+    FROM items
+    WHERE manifest_id = %s AND status = 'pending'
+"""
+
+SAVE_PRICE_SQL = """
+    UPDATE items
+    SET estimated_sale_price = %s,
+        profit = %s,
+        demand = %s,
+        sales_time = %s,
+        sales_days_min = %s,
+        sales_days_max = %s,
+        reasoning = %s,
+        priced_by = 'local',
+        status = 'processed',
+        analyzed_at = CURRENT_TIMESTAMP,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE id = %s AND status = 'pending'
+"""
+
+# Model of this Lambda container and when it was trained
+_model = None
+_model_trained_at = None
+
+def is_local_pricing_enabled():
+    """Check if the local pricing model is enabled"""
+    return os.environ.get('ENABLE_LOCAL_PRICING', 'true').lower() == 'true'
+
+def get_thresholds():
+    """Get the pricing thresholds (max item value, max predicted error, min history size)"""
+    return (
+        float(os.environ.get('LOCAL_PRICING_MAX_VALUE', '20')),
+        float(os.environ.get('LOCAL_PRICING_MAX_ERROR', '0.1')),
+        int(os.environ.get('LOCAL_PRICING_MIN_HISTORY', '200')),
+    )
+
+class PricingModel:
+    """Segment statistics of the analysis history"""
+
+    def __init__(self, rows):
+        self.segments = {}
+        for (grouping, price_category, band, condition, brand, count, mean, variance,
+             demand, days_min, days_max) in rows:
+            level = SEGMENT_LEVELS.get(grouping)
+            if level is None:
+                continue
+            key = (price_category, band, condition, brand)[:level]
+            self.segments[key] = {
+                'count': count,
+                'mean': float(mean),
+                'variance': float(variance),
+                'demand': demand,
+                'days': (days_min, days_max) if days_max else None,
+            }
+
+        self.size = self.segments.get((), {}).get('count', 0)
+
+    def predict(self, msrp, price_category, condition, brand):
+        """
+        Predict the sale price / MSRP ratio of an item
+
+        Returns:
+            dict with ratio, error (standard deviation of the log ratio, about the
+            relative error of the price), support (items of the most specific segment),
+            demand and days, or None without history
+        """
+        segment = self.segments.get(())
+        if not segment:
+            return None
+
+        prediction = dict(segment, support=segment['count'])
+        key = (price_category or 'General', msrp_band(msrp), condition or 'Unknown', (brand or '').lower())
+        for level in range(1, len(key) + 1):
+            segment = self.segments.get(key[:level])
+            if not segment:
+                break
+
+            weight = segment['count'] / (segment['count'] + PRIOR_ITEMS)
+            prediction['mean'] += weight * (segment['mean'] - prediction['mean'])
+            if segment['count'] > 1:
+                prediction['variance'] += weight * (segment['variance'] - prediction['variance'])
+            if segment['count'] >= PRIOR_ITEMS:
+                prediction['demand'] = segment['demand']
+                prediction['days'] = segment['days'] or prediction['days']
+            prediction['support'] = segment['count']
+
+        return {
+            'ratio': math.exp(prediction['mean']),
+            'error': math.sqrt(prediction['variance'] * (1 + 1 / prediction['support'])),
+            'support': prediction['support'],
+            'demand': prediction['demand'],
+            'days': prediction['days'],
+        }
+
+def get_model(cursor):
+    """Get the pricing model, trained again after LOCAL_PRICING_MODEL_TTL_MINUTES"""
+    global _model, _model_trained_at
+
+    ttl = timedelta(minutes=int(os.environ.get('LOCAL_PRICING_MODEL_TTL_MINUTES', '60')))
+    if _model is None or datetime.now() - _model_trained_at > ttl:
+        cursor.execute(TRAINING_SQL, (int(os.environ.get('LOCAL_PRICING_HISTORY_DAYS', '180')),))
+        _model = PricingModel(cursor.fetchall())
+        _model_trained_at = datetime.now()
+        logger.info(f"Trained local pricing model on {_model.size} items ({len(_model.segments)} segments)")
+
+    return _model
+
+def price_item(model, msrp, quantity, price_category, condition, brand, thresholds=None):
+    """
+    Price an item locally if it is cheap enough or the model is confident enough
+
+    Returns:
+        analysis dict (like analyze_item_with_ai), or None if the item needs the full path
+    """
+    max_value, max_error, min_history = thresholds or get_thresholds()
+    msrp = float(msrp or 0)
+    if model.size < min_history or msrp <= 0:
+        return None
+
+    prediction = model.predict(msrp, price_category, condition, brand)
+    if not prediction or not prediction['days']:
+        return None
+    if msrp * (quantity or 1) >= max_value and prediction['error'] > max_error:
+        return None
+
+    days_min, days_max = prediction['days']
+    return {
+        'estimatedSalePrice': round(msrp * prediction['ratio'], 2),
+        'demand': prediction['demand'],
+        'salesTime': format_sales_days(days_min or days_max, days_max),
+        'reasoning': (f"Local pricing model: {prediction['ratio']:.0%} of MSRP from {prediction['support']} "
+                      f"similar analyzed items (about ±{prediction['error']:.0%})"),
+    }
+
+def price_pending_items(cursor, manifest_id):
+    """
+    Price the pending items of a manifest that do not need the AI path
+
+    Args:
+        cursor: database cursor (the caller commits)
+        manifest_id: manifest whose pending items are priced
+
+    Returns:
+        set of ids of the items priced locally (and now processed)
+    """
+    model = get_model(cursor)
+    thresholds = get_thresholds()
+    if model.size < thresholds[2]:
+        logger.info(f"Local pricing skipped: {model.size} items of history, {thresholds[2]} needed")
+        return set()
+
+    cursor.execute(PENDING_ITEMS_SQL, (manifest_id,))
+    updates = []
+    for item_id, msrp, quantity, price_category, condition, brand in cursor.fetchall():
+        analysis = price_item(model, msrp, quantity, price_category, condition, brand, thresholds)
+        if analysis:
+            price = analysis['estimatedSalePrice']
+            days_min, days_max = parse_sales_days(analysis['salesTime'])
+            updates.append((
+                price,
+                price - price * 0.30,  # Same profit as item_processor: purchase at 30% of the sale price
+                analysis['demand'],
+                analysis['salesTime'],
+                days_min,
+                days_max,
+                analysis['reasoning'],
+                item_id
+            ))
+
+    if updates:
+        cursor.executemany(SAVE_PRICE_SQL, updates)
+
+    logger.info(f"Priced {len(updates)} items of manifest {manifest_id} locally")
+    return {update[-1] for update in updates}
@@ -0,0 +1,275 @@
+"""
+Manifest Files Module
+
+Turns an uploaded manifest file into CSV text for parse_manifest_csv. Vendors send
+plain CSV (UTF-8 or Windows-1252, detected from the first bytes), gzipped CSV,
+zipped CSV and Excel workbooks:
+- .csv.gz / .gz: decompressed while decoding, no copy of the inflated bytes is kept
+- .zip: the first CSV (or workbook) member, streamed out of the archive
+- .xlsx: read-only workbook, rows streamed from the first sheet (needs openpyxl)
+
+The parsers take text, so the result is the whole decoded CSV text in memory, limited
+to MAX_MANIFEST_MB.
+"""
+
+import csv
+import io
+import base64
+import codecs
+import os
+import gzip
+import zipfile
+import binascii
+import logging
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Files that are not CSV text (compressed or workbook)
+BINARY_EXTENSIONS = ('.gz', '.zip', '.xlsx')
+
+# Read size when streaming decoded bytes, and bytes used to detect the encoding
+READ_CHUNK_BYTES = 1024 * 1024
+ENCODING_SAMPLE_BYTES = 64 * 1024
+
+# Bytes with no character in Windows-1252
+CP1252_UNDEFINED_BYTES = (0x81, 0x8D, 0x8F, 0x90, 0x9D)
+
+_openpyxl = None
+
+def get_openpyxl():
+    """
+    Import openpyxl on first use (optional - .xlsx manifests are rejected without it)
+
+    Returns:
+        openpyxl module, or None if it is not available
+    """
+    global _openpyxl
+
+    if _openpyxl is None:
+        try:
+            import openpyxl
+            _openpyxl = openpyxl
+        except ImportError:
+            _openpyxl = False
+
+    return _openpyxl or None
+
+def get_max_manifest_chars():
+    """Get the limit on the decompressed manifest size (protects against zip bombs)"""
+    return int(os.environ.get('MAX_MANIFEST_MB', '500')) * 1024 * 1024
+
+def is_binary_manifest(filename):
+    """Check if a manifest file is sent as binary (compressed or workbook)"""
+    return (filename or '').lower().endswith(BINARY_EXTENSIONS)
+
+def detect_encoding(sample):
+    """
+    Detect the encoding of a CSV from its first bytes
+
+    Args:
+        sample: first bytes of the file
+
+    Returns:
+        codec name (BOMs are stripped by the utf-8-sig and utf-16 codecs)
+    """
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+
+    # Incremental decode, the sample may end in the middle of a character
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+
+    # Windows-1252 (Excel on Windows) leaves 5 bytes undefined, latin-1 decodes anything
+    if any(byte in sample for byte in CP1252_UNDEFINED_BYTES):
+        return 'latin-1'
+    return 'cp1252'
+
+def read_csv_stream(binary_stream):
+    """
+    Decode a CSV byte stream incrementally, detecting the encoding from its first bytes
+
+    Raises:
+        ValueError: if the text is larger than MAX_MANIFEST_MB
+    """
+    limit = get_max_manifest_chars()
+    sample = binary_stream.read(ENCODING_SAMPLE_BYTES)
+    encoding = detect_encoding(sample)
+    if encoding not in ('utf-8', 'utf-8-sig'):
+        logger.info(f"Manifest encoding detected as {encoding}")
+
+    decoder = codecs.getincrementaldecoder(encoding)()
+    chunks = []
+    size = 0
+    offset = 0
+    data = sample
+
+    while data:
+        state = decoder.getstate()
+        try:
+            text = decoder.decode(data)
+        except UnicodeDecodeError as e:
+            # UTF-8 sample, but a non UTF-8 byte further down: keep the text decoded up to
+            # it, the rest is Windows-1252
+            position = e.start - (len(e.object) - len(data))
+            logger.warning(f"Invalid UTF-8 at byte {offset + position}, decoding the rest as cp1252")
+            decoder.setstate(state)
+            text = decoder.decode(data[:position]) if position > 0 else ''
+            decoder = codecs.getincrementaldecoder('cp1252')(errors='replace')
+            text += decoder.decode(e.object[e.start:])
+
+        size += len(text)
+        if size > limit:
+            raise ValueError(f"Manifest is larger than {limit // (1024 * 1024)} MB uncompressed")
+        chunks.append(text)
+        offset += len(data)
+        data = binary_stream.read(READ_CHUNK_BYTES)
+
+    try:
+        chunks.append(decoder.decode(b'', final=True))
+    except UnicodeDecodeError:
+        # File ends in the middle of a UTF-8 character
+        chunks.append('\ufffd')
+
+    return ''.join(chunks)
+
+class Base64Reader(io.RawIOBase):
+    """Binary stream over base64 text, decoded one chunk at a time"""
+
+    def __init__(self, encoded):
+        # Chunks must start on a 4-character boundary, drop line breaks (MIME style base64)
+        self.encoded = ''.join(encoded.split()) if '\n' in encoded else encoded
+        self.position = 0
+        self.buffer = b''
+
+    def readable(self):
+        return True
+
+    def readinto(self, target):
+        while not self.buffer and self.position < len(self.encoded):
+            # 4 base64 characters = 3 bytes
+            end = self.position + READ_CHUNK_BYTES // 3 * 4
+            self.buffer = base64.b64decode(self.encoded[self.position:end])
+            self.position = end
+
+        size = min(len(target), len(self.buffer))
+        target[:size] = self.buffer[:size]
+        self.buffer = self.buffer[size:]
+        return size
+
+def read_xlsx_stream(binary_stream):
+    """
+    Convert the first sheet of a workbook to CSV text, one row at a time
+
+    Raises:
+        ValueError: if openpyxl is not available
+    """
+    openpyxl = get_openpyxl()
+    if not openpyxl:
+        raise ValueError("Excel manifests need openpyxl, upload the manifest as CSV")
+
+    # Read-only mode parses the sheet XML as rows are iterated instead of building the workbook
+    workbook = openpyxl.load_workbook(binary_stream, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        limit = get_max_manifest_chars()
+        out = io.StringIO()
+        writer = csv.writer(out, lineterminator='\n')
+
+        for row in sheet.iter_rows(values_only=True):
+            # Skip rows with no values (formatting only)
+            if not any(value is not None and value != '' for value in row):
+                continue
+            writer.writerow(['' if value is None else value for value in row])
+            if out.tell() > limit:
+                raise ValueError(f"Manifest is larger than {limit // (1024 * 1024)} MB uncompressed")
+
+        return out.getvalue()
+    finally:
+        workbook.close()
+
+def read_zip_member(data):
+    """Read the first CSV or workbook member of a zip archive"""
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        for info in archive.infolist():
+            # Skip folders and macOS metadata
+            if info.is_dir() or info.filename.startswith('__MACOSX/') or os.path.basename(info.filename).startswith('.'):
+                continue
+
+            name = info.filename.lower()
+            if name.endswith(('.csv', '.txt')):
+                logger.info(f"Reading {info.filename} from zip archive")
+                with archive.open(info) as member:
+                    return read_csv_stream(member)
+
+            if name.endswith('.xlsx'):
+                logger.info(f"Reading {info.filename} from zip archive")
+                # openpyxl needs a seekable file, and a workbook is itself compressed
+                return read_xlsx_stream(io.BytesIO(archive.read(info)))
+
+        raise ValueError("Zip archive has no CSV or Excel manifest")
+
+def read_manifest_file(data, filename):
+    """
+    Get the CSV text of an uploaded manifest file
+
+    Args:
+        data: file bytes
+        filename: uploaded file name (its extension picks the reader)
+
+    Returns:
+        CSV text
+
+    Raises:
+        ValueError: if the file cannot be read
+    """
+    name = (filename or '').lower()
+
+    try:
+        if name.endswith('.gz'):
+            return read_csv_stream(gzip.GzipFile(fileobj=io.BytesIO(data)))
+
+        if name.endswith('.zip'):
+            return read_zip_member(data)
+
+        if name.endswith('.xlsx'):
+            return read_xlsx_stream(io.BytesIO(data))
+
+        return read_csv_stream(io.BytesIO(data))
+
+    except (OSError, EOFError, zipfile.BadZipFile) as e:
+        raise ValueError(f"Could not read {filename}: {str(e)}")
+
+def read_manifest_base64(encoded, filename):
+    """
+    Get the CSV text of an uploaded manifest file sent base64-encoded
+
+    Args:
+        encoded: base64 text of the file
+        filename: uploaded file name (its extension picks the reader)
+
+    Returns:
+        CSV text
+
+    Raises:
+        ValueError: if the file cannot be read
+    """
+    name = (filename or '').lower()
+
+    # Zip archives and workbooks need random access, the others are decoded as they are read
+    if name.endswith(('.zip', '.xlsx')):
+        return read_manifest_file(base64.b64decode(encoded), filename)
+
+    try:
+        stream = io.BufferedReader(Base64Reader(encoded), READ_CHUNK_BYTES)
+        if name.endswith('.gz'):
+            stream = gzip.GzipFile(fileobj=stream)
+        return read_csv_stream(stream)
+
+    except (OSError, EOFError, binascii.Error) as e:
+        raise ValueError(f"Could not read {filename}: {str(e)}")
@@ -0,0 +1,110 @@
+"""
+Manifest Summary Module
+
+Summary and chart numbers of a manifest computed inside Postgres: one GROUP BY
+GROUPING SETS query over the numeric sales_days_min/max columns and the stored
+title_category returns a few dozen rows, whatever the number of items:
+- Revenue timeline buckets (same bucketing as csv_processor.generate_charts)
+- Category breakdown, in order of first appearance
+- Demand counts
+- Units per sales_days_max (for the 80% sell-out time)
+- Totals
+"""
+
+import logging
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+TIMELINE_MONTHS = 12
+
+# GROUPING() bitmask of each grouping set (month_index, title_category, demand, sales_days_max)
+TIMELINE_SET = 0b0111
+CATEGORY_SET = 0b1011
+DEMAND_SET = 0b1101
+SALES_DAYS_SET = 0b1110
+TOTALS_SET = 0b1111
+
+MANIFEST_AGGREGATES_SQL = """
+    WITH bucketed AS (
+        SELECT
+            -- Month in which the middle of the sales time range falls, month 6 if unknown
+            CASE
+                WHEN sales_days_max > 0
+                THEN LEAST(GREATEST(CEIL((COALESCE(NULLIF(sales_days_min, 0), sales_days_max) + sales_days_max) / 60.0)::INTEGER - 1, 0), 11)
+                ELSE 5
+            END AS month_index,
+            title_category,
+            demand,
+            sales_days_max,
+            COALESCE(estimated_sale_price, 0) AS estimated_sale_price,
+            COALESCE(quantity, 1) AS quantity,
+            COALESCE(msrp, 0) AS msrp,
+            created_at
+        FROM items
+        WHERE manifest_id = %s
+    )
+    SELECT
+        GROUPING(month_index, title_category, demand, sales_days_max) AS grouping_set,
+        month_index, title_category, demand, sales_days_max,
+        COUNT(*),
+        SUM(estimated_sale_price),
+        SUM(quantity),
+        SUM(msrp),
+        MIN(created_at)
+    FROM bucketed
+    GROUP BY GROUPING SETS ((month_index), (title_category), (demand), (sales_days_max), ())
+"""
+
+def query_manifest_aggregates(cursor, manifest_id):
+    """
+    Compute the summary and chart numbers of a manifest in the database
+
+    Args:
+        cursor: database cursor
+        manifest_id: manifest to summarize
+
+    Returns:
+        dict with:
+        - revenue_timeline: estimated revenue per month (12 values, not cumulative)
+        - categories: list of (title_category, item count), the category is None for
+          items stored before title categories existed
+        - demand: {demand: item count}
+        - units_by_days: list of {'sales_days_max', 'quantity'} rows
+        - total_items, total_msrp, total_revenue: per item (not multiplied by quantity)
+    """
+    cursor.execute(MANIFEST_AGGREGATES_SQL, (manifest_id,))
+
+    aggregates = {
+        'revenue_timeline': [0.0] * TIMELINE_MONTHS,
+        'categories': [],
+        'demand': {},
+        'units_by_days': [],
+        'total_items': 0,
+        'total_msrp': 0.0,
+        'total_revenue': 0.0,
+    }
+    categories = []
+
+    for (grouping_set, month_index, title_category, demand, sales_days_max,
+         count, revenue, quantity, msrp, first_created_at) in cursor.fetchall():
+        if grouping_set == TIMELINE_SET:
+            aggregates['revenue_timeline'][month_index] = float(revenue or 0)
+        elif grouping_set == CATEGORY_SET:
+            categories.append((first_created_at, title_category, count))
+        elif grouping_set == DEMAND_SET:
+            aggregates['demand'][demand] = count
+        elif grouping_set == SALES_DAYS_SET:
+            if sales_days_max and sales_days_max > 0:
+                aggregates['units_by_days'].append({'sales_days_max': sales_days_max, 'quantity': quantity})
+        elif grouping_set == TOTALS_SET:
+            aggregates['total_items'] = count
+            aggregates['total_msrp'] = float(msrp or 0)
+            aggregates['total_revenue'] = float(revenue or 0)
+
+    # Order of first appearance, like a breakdown built while looping over the items
+    categories.sort(key=lambda category: (category[0] is None, category[0] or 0))
+    aggregates['categories'] = [(title_category, count) for _, title_category, count in categories]
+
+    logger.info(f"Aggregated {aggregates['total_items']} items of manifest {manifest_id} in the database")
+    return aggregates
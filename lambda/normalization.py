@@ -0,0 +1,140 @@
+"""
+Normalization Module
+
+Text, price and quantity normalization shared by the CSV parsers and data enrichment.
+All patterns are compiled once at import.
+"""
+
+import re
+
+# Text cleaning (whitespace is collapsed with str.split, which splits on the same characters as \s)
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+SPECIAL_CHARS_RE = re.compile(r'[^\w\s\-.,()\/]+')
+
+# Every model pattern needs 3 digits in a row, titles without them are skipped
+MODEL_NUMBER_HINT_RE = re.compile(r'\d{3}')
+
+# Common model patterns, tried in order
+MODEL_NUMBER_PATTERNS = (
+    re.compile(r'\b[A-Z]{2,}\-?\d{3,}\b'),  # e.g., WH-1000XM4, HP-2550
+    re.compile(r'\b[A-Z]\d{3,}[A-Z]?\b'),   # e.g., T480s, X1
+    re.compile(r'\b\d{3,}[A-Z]{1,3}\b'),    # e.g., 3070Ti, 5600X
+)
+
+# Prices and quantities
+NON_PRICE_CHARS_RE = re.compile(r'[^\d.]')
+NON_DIGITS_RE = re.compile(r'[^\d]')
+UPC_SEPARATORS_RE = re.compile(r'[\s-]')
+
+# Sales time estimates ("1-3 months", "2-4 weeks", "10 days"): days per unit, checked in order
+SALES_TIME_NUMBER_RE = re.compile(r'\d+')
+SALES_TIME_UNITS = (('month', 30), ('week', 7), ('day', 1))
+
+def normalize_text(text):
+    """Clean and normalize text"""
+    if not text:
+        return ""
+
+    # Remove HTML tags
+    text = str(text)
+    if '<' in text:
+        text = HTML_TAG_RE.sub('', text)
+
+    # Remove extra whitespace
+    text = ' '.join(text.split())
+
+    # Remove special characters but keep alphanumeric, spaces, and basic punctuation
+    return SPECIAL_CHARS_RE.sub('', text)
+
+def extract_model_number(title, brand=None):
+    """Extract model number from title"""
+    if not title or not MODEL_NUMBER_HINT_RE.search(title):
+        return None
+
+    for pattern in MODEL_NUMBER_PATTERNS:
+        match = pattern.search(title)
+        if match:
+            return match.group(0)
+
+    return None
+
+def parse_price(value):
+    """
+    Parse a price cell like "$1,234.56"
+
+    Returns:
+        float, or None if the cell has no valid price
+    """
+    if value is None:
+        return None
+
+    value = str(value).strip()
+
+    # Most cells are plain numbers, skip the regex for them
+    if value.replace('.', '', 1).isdigit():
+        return float(value)
+
+    try:
+        return float(NON_PRICE_CHARS_RE.sub('', value))
+    except ValueError:
+        return None
+
+def parse_quantity(value):
+    """
+    Parse a quantity cell, keeping digits only
+
+    Returns:
+        int, or None if the cell has no digits
+    """
+    if value is None:
+        return None
+
+    value = str(value).strip()
+    if value.isdigit():
+        return int(value)
+
+    cleaned = NON_DIGITS_RE.sub('', value)
+    return int(cleaned) if cleaned else None
+
+def clean_upc(value):
+    """Remove spaces and dashes from a UPC/EAN"""
+    return UPC_SEPARATORS_RE.sub('', str(value))
+
+def parse_sales_days(sales_time):
+    """
+    Parse a sales time estimate like "2-4 weeks" to a range of days
+
+    Returns:
+        (min days, max days) tuple, or None if the estimate has no unit or number
+    """
+    if not sales_time:
+        return None
+
+    sales_time = str(sales_time)
+    lowered = sales_time.lower()
+
+    for unit, unit_days in SALES_TIME_UNITS:
+        if unit in lowered:
+            numbers = [int(number) for number in SALES_TIME_NUMBER_RE.findall(sales_time)]
+            if not numbers:
+                return None
+            return min(numbers) * unit_days, max(numbers) * unit_days
+
+    return None
+
+def format_sales_days(days_min, days_max):
+    """
+    Format a range of days as a sales time estimate that parse_sales_days reads back
+
+    Returns:
+        estimate like "3-10 days", "2-4 weeks" or "2-3 months"
+    """
+    days_min, days_max = max(round(days_min), 1), max(round(days_max), 1)
+
+    for unit, unit_days in SALES_TIME_UNITS:
+        # Months from 3 months, weeks from 3 weeks
+        if days_max >= unit_days * 3 or unit_days == 1:
+            low = max(round(days_min / unit_days), 1)
+            high = max(round(days_max / unit_days), low)
+            text = str(low) if low == high else f"{low}-{high}"
+            return f"{text} {unit}" + ('' if high == 1 else 's')
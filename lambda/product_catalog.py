@@ -0,0 +1,428 @@
+"""
+Product Catalog Module
+
+Global catalog of enriched products (table `products`, keyed by ASIN) used as an
+enrichment cache across uploads. Recurring SKUs are enriched once and re-served
+from the catalog afterwards:
+- Lookup by ASIN, then UPC, model number and normalized title
+- Per-field staleness timestamps (prices expire sooner than descriptive fields)
+- In-memory cache per Lambda container, filled in one query per manifest and capped
+  at CATALOG_CACHE_MAX_KEYS keys (least recently used keys are evicted)
+
+Lookups that found nothing are remembered too (table `lookup_misses`, per source),
+so known-unmatched products skip the external lookups until the miss expires; in
+memory, at most CATALOG_MISS_CACHE_MAX_KEYS misses are kept (oldest evicted first).
+"""
+
+import re
+import os
+import json
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Catalog fields and the enrichment keys they are filled from
+CATALOG_FIELDS = {
+    'title': 'title',
+    'brand': 'brand',
+    'model': 'model',
+    'upc': 'upc',
+    'category': 'category',
+    'list_price': 'list_price',
+    'current_market_price': 'current_price',
+    'image_url': 'image_url',
+    'features': 'features',
+}
+
+# Prices move, descriptive fields don't
+PRICE_FIELDS = {'list_price', 'current_market_price'}
+
+# Anything but letters and digits separates title key words
+TITLE_KEY_SEPARATORS_RE = re.compile(r'[^a-z0-9]+')
+
+# Identifiers don't go stale
+KEY_FIELDS = {'model', 'upc'}
+
+# Lookup keys in priority order
+LOOKUP_KEYS = ['asin', 'upc', 'model', 'normalized_title']
+
+# In-memory cache: (key, value) -> catalog row dict, least recently used first
+_catalog_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+# Known misses: (source, key) -> when the lookup last found nothing, oldest first
+_miss_cache = OrderedDict()
+_miss_lock = threading.Lock()
+
+# Products enriched from external sources and new misses, waiting to be written back
+_pending_writes = []
+_pending_misses = []
+_pending_lock = threading.Lock()
+
+def is_catalog_enabled():
+    """Check if the product catalog is enabled"""
+    return os.environ.get('ENABLE_PRODUCT_CATALOG', 'true').lower() == 'true'
+
+def get_field_ttl(field):
+    """Get how long a catalog field stays fresh"""
+    if field in PRICE_FIELDS:
+        return timedelta(hours=int(os.environ.get('CATALOG_PRICE_TTL_HOURS', '24')))
+    return timedelta(days=int(os.environ.get('CATALOG_TTL_DAYS', '90')))
+
+def get_miss_ttl():
+    """Get how long a lookup that found nothing is trusted (shorter than catalog fields)"""
+    return timedelta(days=int(os.environ.get('CATALOG_MISS_TTL_DAYS', '7')))
+
+def get_cache_max_keys():
+    """Get the number of lookup keys kept in the in-memory cache"""
+    return int(os.environ.get('CATALOG_CACHE_MAX_KEYS', '100000'))
+
+def get_miss_cache_max_keys():
+    """Get the number of lookup misses kept in the in-memory cache"""
+    return int(os.environ.get('CATALOG_MISS_CACHE_MAX_KEYS', '100000'))
+
+def _remember_miss(cache_key, missed_at):
+    """Cache a lookup miss, evicting the oldest misses"""
+    with _miss_lock:
+        _miss_cache[cache_key] = missed_at
+        _miss_cache.move_to_end(cache_key)
+
+        max_keys = get_miss_cache_max_keys()
+        while len(_miss_cache) > max_keys:
+            _miss_cache.popitem(last=False)
+
+def _cache_get(key):
+    """Get a cached catalog row, marking it as recently used"""
+    with _cache_lock:
+        row = _catalog_cache.get(key)
+        if row is not None:
+            _catalog_cache.move_to_end(key)
+        return row
+
+def _cache_put(cache_key, row, replace=True):
+    """Cache a catalog row under a lookup key, evicting the least recently used keys"""
+    with _cache_lock:
+        if replace or cache_key not in _catalog_cache:
+            _catalog_cache[cache_key] = row
+        _catalog_cache.move_to_end(cache_key)
+
+        max_keys = get_cache_max_keys()
+        while len(_catalog_cache) > max_keys:
+            _catalog_cache.popitem(last=False)
+
+def normalize_title_key(title):
+    """Normalize a title into a catalog lookup key"""
+    if not title:
+        return None
+
+    key = TITLE_KEY_SEPARATORS_RE.sub(' ', str(title).lower()).strip()
+    return key or None
+
+def get_lookup_keys(raw_item):
+    """
+    Get catalog lookup keys for a raw item, in priority order
+
+    Extracts the model number from the title, so callers compute the keys once per
+    item and pass them to prefetch_products and lookup_product
+    """
+    from data_enrichment import extract_model_number, get_item_upc
+
+    model = raw_item.get('model') or extract_model_number(raw_item.get('title'))
+    values = {
+        'asin': raw_item.get('asin'),
+        'upc': get_item_upc(raw_item),
+        'model': model,
+        'normalized_title': normalize_title_key(raw_item.get('title')),
+    }
+    return [(key, values[key]) for key in LOOKUP_KEYS if values[key]]
+
+def _cache_row(row, replace=False):
+    """Add a catalog row to the in-memory cache under all its lookup keys"""
+    if replace:
+        # Merge refreshed fields into the row we already have for this ASIN
+        existing = _cache_get(('asin', row['asin'])) or {}
+        field_updated_at = dict(existing.get('field_updated_at') or {})
+        field_updated_at.update(row.get('field_updated_at') or {})
+        row = {**existing, **{k: v for k, v in row.items() if v is not None}}
+        row['field_updated_at'] = field_updated_at
+
+    for key in LOOKUP_KEYS:
+        if row.get(key):
+            _cache_put((key, row[key]), row, replace)
+
+def prefetch_products(raw_items, lookup_keys=None):
+    """
+    Load catalog entries for all items of a manifest into the in-memory cache (one query)
+
+    Args:
+        raw_items: list of raw item dicts
+        lookup_keys: get_lookup_keys() of each item, computed here if not given
+
+    Returns:
+        number of items with a catalog entry
+    """
+    if not is_catalog_enabled() or not raw_items:
+        return 0
+
+    if lookup_keys is None:
+        lookup_keys = [get_lookup_keys(raw_item) for raw_item in raw_items]
+
+    wanted = {key: set() for key in LOOKUP_KEYS}
+    for item_keys in lookup_keys:
+        for key, value in item_keys:
+            if (key, value) not in _catalog_cache:
+                wanted[key].add(value)
+
+    if any(wanted.values()):
+        try:
+            from csv_processor import get_db_connection
+            conn = get_db_connection()
+            if not conn:
+                return 0
+
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT asin, upc, model, normalized_title, title, brand, category,
+                       list_price, current_market_price, image_url, features, field_updated_at
+                FROM products
+                WHERE asin = ANY(%s) OR upc = ANY(%s) OR model = ANY(%s) OR normalized_title = ANY(%s)
+            """, tuple(list(wanted[key]) for key in LOOKUP_KEYS))
+
+            columns = [column[0] for column in cursor.description]
+            for row in cursor.fetchall():
+                _cache_row(dict(zip(columns, row)))
+
+            cursor.execute("""
+                SELECT source, lookup_key, missed_at
+                FROM lookup_misses
+                WHERE lookup_key = ANY(%s) AND missed_at > %s
+            """, ([value for key in LOOKUP_KEYS for value in wanted[key]],
+                  datetime.utcnow() - get_miss_ttl()))
+
+            for source, lookup_key, missed_at in cursor.fetchall():
+                _remember_miss((source, lookup_key), missed_at)
+
+            cursor.close()
+            conn.close()
+
+        except Exception as e:
+            logger.warning(f"Product catalog prefetch failed: {str(e)}")
+            return 0
+
+    found = sum(1 for raw_item, item_keys in zip(raw_items, lookup_keys) if lookup_product(raw_item, item_keys))
+    logger.info(f"Product catalog has {found}/{len(raw_items)} items")
+    return found
+
+def lookup_product(raw_item, lookup_keys=None):
+    """
+    Find a raw item in the catalog (in-memory cache only, see prefetch_products)
+
+    Args:
+        raw_item: raw item dict
+        lookup_keys: get_lookup_keys(raw_item), computed here if not given
+
+    Returns:
+        dict shaped like external enrichment data with the fresh fields only, plus
+        'stale' (True if any stored field needs refreshing), or None if not found
+    """
+    if not is_catalog_enabled():
+        return None
+
+    if lookup_keys is None:
+        lookup_keys = get_lookup_keys(raw_item)
+
+    row = None
+    for key, value in lookup_keys:
+        row = _cache_get((key, value))
+        if row:
+            break
+
+    if not row:
+        return None
+
+    now = datetime.utcnow()
+    field_updated_at = row.get('field_updated_at') or {}
+    if isinstance(field_updated_at, str):
+        field_updated_at = json.loads(field_updated_at)
+
+    product = {'asin': row['asin'], 'stale': False, 'enrichment_source': 'Product Catalog'}
+    for field, data_key in CATALOG_FIELDS.items():
+        value = row.get(field)
+        if value is None:
+            continue
+
+        updated_at = field_updated_at.get(field)
+        expired = not updated_at or now - datetime.fromisoformat(updated_at) > get_field_ttl(field)
+        if expired and field not in KEY_FIELDS:
+            product['stale'] = True
+            continue
+
+        if field in PRICE_FIELDS:
+            value = float(value)
+        elif field == 'features':
+            value = json.loads(value)
+        product[data_key] = value
+
+    return product
+
+def record_product(raw_item, enriched, external_data):
+    """
+    Queue an enriched product for write-back to the catalog (see flush_products)
+
+    Args:
+        raw_item: raw item dict, its title becomes the normalized title key
+        enriched: enriched item dict
+        external_data: data the item was enriched with, only these fields get refreshed
+    """
+    if not is_catalog_enabled() or not enriched.get('asin') or not external_data:
+        return
+
+    if external_data.get('enrichment_source') == 'Product Catalog':
+        return
+
+    now = datetime.utcnow().isoformat()
+    product = {
+        'asin': enriched['asin'],
+        'normalized_title': normalize_title_key(raw_item.get('title')),
+        'field_updated_at': {},
+    }
+    from data_enrichment import get_item_upc
+
+    for field, data_key in CATALOG_FIELDS.items():
+        if field == 'upc':
+            # Same normalized code as the lookup keys
+            value = get_item_upc(raw_item)
+        elif field in KEY_FIELDS:
+            value = enriched.get(field)
+        else:
+            value = external_data.get(data_key)
+        product[field] = value or None
+        if value and field not in KEY_FIELDS:
+            product['field_updated_at'][field] = now
+
+    with _pending_lock:
+        _pending_writes.append(product)
+
+    features = json.dumps(product['features']) if product['features'] else None
+    _cache_row({**product, 'features': features}, replace=True)
+
+def is_known_miss(source, key):
+    """
+    Check if a lookup is known to find nothing (in-memory cache only, see prefetch_products)
+
+    Args:
+        source: lookup source, e.g. 'amazon_upc', 'upc_database', 'amazon_search', 'ai_asin'
+        key: UPC or normalized title key the lookup was made with
+
+    Returns:
+        True if the same lookup found nothing within the miss TTL
+    """
+    if not is_catalog_enabled() or not key:
+        return False
+
+    with _miss_lock:
+        missed_at = _miss_cache.get((source, key))
+        if missed_at is None:
+            return False
+        if datetime.utcnow() - missed_at > get_miss_ttl():
+            del _miss_cache[(source, key)]
+            return False
+        return True
+
+def record_miss(source, key):
+    """
+    Remember that a lookup found nothing (written back by flush_products)
+
+    Only record genuine misses - not errors or timeouts, those should be retried
+
+    Args:
+        source: lookup source
+        key: UPC or normalized title key the lookup was made with
+    """
+    if not is_catalog_enabled() or not key:
+        return
+
+    missed_at = datetime.utcnow()
+    _remember_miss((source, key), missed_at)
+    with _pending_lock:
+        _pending_misses.append((source, key, missed_at))
+
+def flush_products():
+    """
+    Write queued products and lookup misses to the catalog in a single transaction
+
+    Returns:
+        number of products written
+    """
+    global _pending_writes, _pending_misses
+
+    with _pending_lock:
+        products, _pending_writes = _pending_writes, []
+        misses, _pending_misses = _pending_misses, []
+
+    if not products and not misses:
+        return 0
+
+    try:
+        from csv_processor import get_db_connection
+        conn = get_db_connection()
+        if not conn:
+            return 0
+
+        cursor = conn.cursor()
+        if products:
+            cursor.executemany("""
+                INSERT INTO products (
+                    asin, upc, model, normalized_title, title, brand, category,
+                    list_price, current_market_price, image_url, features, field_updated_at
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                ON CONFLICT (asin) DO UPDATE SET
+                    upc = COALESCE(EXCLUDED.upc, products.upc),
+                    model = COALESCE(EXCLUDED.model, products.model),
+                    normalized_title = COALESCE(EXCLUDED.normalized_title, products.normalized_title),
+                    title = COALESCE(EXCLUDED.title, products.title),
+                    brand = COALESCE(EXCLUDED.brand, products.brand),
+                    category = COALESCE(EXCLUDED.category, products.category),
+                    list_price = COALESCE(EXCLUDED.list_price, products.list_price),
+                    current_market_price = COALESCE(EXCLUDED.current_market_price, products.current_market_price),
+                    image_url = COALESCE(EXCLUDED.image_url, products.image_url),
+                    features = COALESCE(EXCLUDED.features, products.features),
+                    field_updated_at = products.field_updated_at || EXCLUDED.field_updated_at
+            """, [(
+                product['asin'],
+                product['upc'],
+                product['model'],
+                product['normalized_title'],
+                product['title'],
+                product['brand'],
+                product['category'],
+                product['list_price'],
+                product['current_market_price'],
+                product['image_url'],
+                json.dumps(product['features']) if product['features'] else None,
+                json.dumps(product['field_updated_at']),
+            ) for product in products])
+
+        if misses:
+            cursor.executemany("""
+                INSERT INTO lookup_misses (source, lookup_key, missed_at)
+                VALUES (%s, %s, %s)
+                ON CONFLICT (source, lookup_key) DO UPDATE SET
+                    missed_at = EXCLUDED.missed_at,
+                    miss_count = lookup_misses.miss_count + 1
+            """, misses)
+
+        conn.commit()
+        cursor.close()
+        conn.close()
+
+        logger.info(f"Saved {len(products)} products and {len(misses)} lookup misses to catalog")
+        return len(products)
+
+    except Exception as e:
+        logger.warning(f"Product catalog write failed: {str(e)}")
+        return 0
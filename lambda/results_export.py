@@ -0,0 +1,281 @@
+"""
+Results Export Module
+
+Exports the analyzed items of an upload to S3 and returns a presigned download URL,
+so large exports never go through the Lambda response body:
+- Rows are read with a server-side (named) cursor, a batch at a time
+- CSV (spreadsheets) or Parquet (pandas, columnar and compressed, needs pyarrow)
+- Written with an S3 multipart upload, one part per few MB of output
+
+Exports run synchronously behind API Gateway, which gives up after 29 seconds, so
+uploads of more than EXPORT_MAX_ROWS items are refused rather than cut off.
+"""
+
+import csv
+import io
+import os
+import logging
+from datetime import datetime
+from itertools import islice
+
+import boto3
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+EXPORT_FORMATS = ('csv', 'parquet')
+
+# Rows fetched per round trip from the server-side cursor (and per Parquet row group batch)
+EXPORT_BATCH_ROWS = 5000
+
+# S3 multipart parts must be at least 5 MB (except the last one)
+EXPORT_PART_BYTES = 8 * 1024 * 1024
+
+# Exported columns: (name, SQL expression, Parquet type name)
+EXPORT_COLUMNS = [
+    ('item_number', 'item_number', 'string'),
+    ('title', 'title', 'string'),
+    ('quantity', 'COALESCE(quantity, 1)', 'int64'),
+    ('msrp', 'msrp::FLOAT8', 'float64'),
+    ('estimated_sale_price', 'estimated_sale_price::FLOAT8', 'float64'),
+    ('profit', 'profit::FLOAT8', 'float64'),
+    ('demand', 'demand', 'string'),
+    ('sales_time', 'sales_time', 'string'),
+    ('sales_days_min', 'sales_days_min', 'int64'),
+    ('sales_days_max', 'sales_days_max', 'int64'),
+    ('title_category', 'title_category', 'string'),
+    ('category', 'category', 'string'),
+    ('asin', 'asin', 'string'),
+    ('model', 'model', 'string'),
+    ('condition', 'condition', 'string'),
+    ('status', 'status', 'string'),
+    ('reasoning', 'reasoning', 'string'),
+]
+
+_s3_client = None
+_pyarrow = None
+
+class ExportTooLarge(ValueError):
+    """The upload has more items than can be exported within one API request"""
+
+def get_s3_client():
+    """Get the S3 client (created on first use)"""
+    global _s3_client
+
+    if _s3_client is None:
+        _s3_client = boto3.client('s3')
+    return _s3_client
+
+def get_pyarrow():
+    """
+    Import pyarrow on first use (optional - Parquet exports are rejected without it)
+
+    Returns:
+        (pyarrow, pyarrow.parquet) tuple, or None if it is not available
+    """
+    global _pyarrow
+
+    if _pyarrow is None:
+        try:
+            import pyarrow
+            import pyarrow.parquet
+            _pyarrow = (pyarrow, pyarrow.parquet)
+        except ImportError:
+            _pyarrow = False
+
+    return _pyarrow or None
+
+def get_max_export_rows():
+    """Get the most items exported in one request (EXPORT_MAX_ROWS)"""
+    return int(os.environ.get('EXPORT_MAX_ROWS', '250000'))
+
+def get_export_bucket():
+    """Get the S3 bucket for exports"""
+    return os.environ.get('EXPORTS_BUCKET') or os.environ.get('S3_UPLOADS_BUCKET', 'arby-csv-uploads')
+
+class S3MultipartWriter(io.RawIOBase):
+    """Writable binary stream uploaded to S3 in parts as it is written"""
+
+    def __init__(self, bucket, key, content_type):
+        self.s3 = get_s3_client()
+        self.bucket = bucket
+        self.key = key
+        self.upload_id = self.s3.create_multipart_upload(
+            Bucket=bucket, Key=key, ContentType=content_type
+        )['UploadId']
+        self.parts = []
+        self.buffer = bytearray()
+        self.size = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.buffer += data
+        self.size += len(data)
+        if len(self.buffer) >= EXPORT_PART_BYTES:
+            self.upload_part()
+        return len(data)
+
+    def tell(self):
+        return self.size
+
+    def upload_part(self):
+        part_number = len(self.parts) + 1
+        response = self.s3.upload_part(
+            Bucket=self.bucket, Key=self.key, UploadId=self.upload_id,
+            PartNumber=part_number, Body=bytes(self.buffer)
+        )
+        self.parts.append({'PartNumber': part_number, 'ETag': response['ETag']})
+        self.buffer = bytearray()
+
+    def complete(self):
+        """Upload the last part and assemble the object"""
+        if self.buffer or not self.parts:
+            self.upload_part()
+        self.s3.complete_multipart_upload(
+            Bucket=self.bucket, Key=self.key, UploadId=self.upload_id,
+            MultipartUpload={'Parts': self.parts}
+        )
+
+    def abort(self):
+        """Drop the uploaded parts"""
+        try:
+            self.s3.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self.upload_id)
+        except Exception as e:
+            logger.warning(f"Could not abort multipart upload of {self.key}: {str(e)}")
+
+def iter_row_batches(rows):
+    """Group rows in lists of EXPORT_BATCH_ROWS"""
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, EXPORT_BATCH_ROWS))
+        if not batch:
+            return
+        yield batch
+
+def write_csv(batches, writer):
+    """Write row batches as CSV (UTF-8 with BOM, so Excel detects the encoding)"""
+    text = io.TextIOWrapper(writer, encoding='utf-8-sig', newline='', write_through=True)
+    csv_writer = csv.writer(text)
+    csv_writer.writerow([name for name, _, _ in EXPORT_COLUMNS])
+
+    rows = 0
+    for batch in batches:
+        csv_writer.writerows(batch)
+        rows += len(batch)
+
+    text.flush()
+    text.detach()
+    return rows
+
+def write_parquet(batches, writer):
+    """Write row batches as a zstd-compressed Parquet file, one row group per batch"""
+    pyarrow, parquet = get_pyarrow()
+    schema = pyarrow.schema([(name, getattr(pyarrow, type_name)()) for name, _, type_name in EXPORT_COLUMNS])
+
+    rows = 0
+    with parquet.ParquetWriter(pyarrow.PythonFile(writer, mode='w'), schema, compression='zstd') as parquet_writer:
+        for batch in batches:
+            columns = list(zip(*batch))
+            parquet_writer.write_table(pyarrow.Table.from_arrays(
+                [pyarrow.array(column, type=field.type) for column, field in zip(columns, schema)],
+                schema=schema
+            ))
+            rows += len(batch)
+
+    return rows
+
+EXPORT_WRITERS = {
+    'csv': (write_csv, 'text/csv'),
+    'parquet': (write_parquet, 'application/vnd.apache.parquet'),
+}
+
+def export_upload_results(upload_id, export_format='csv'):
+    """
+    Export the items of an upload to S3
+
+    Args:
+        upload_id: upload to export
+        export_format: 'csv' or 'parquet'
+
+    Returns:
+        dict with the presigned 'url', 'format', 'rows' and 'expires_in', or None if the
+        upload does not exist or the export failed
+
+    Raises:
+        ValueError: if the format is not supported
+        ExportTooLarge: if the upload has more than EXPORT_MAX_ROWS items
+    """
+    export_format = (export_format or 'csv').lower()
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format {export_format}, use one of {', '.join(EXPORT_FORMATS)}")
+    if export_format == 'parquet' and not get_pyarrow():
+        raise ValueError("Parquet exports need pyarrow, use the csv format")
+
+    from csv_processor import get_db_connection, iter_rows
+    conn = get_db_connection()
+    if not conn:
+        return None
+
+    writer = None
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT manifest_id, filename,
+                (SELECT COUNT(*) FROM items WHERE items.manifest_id = uploads.manifest_id)
+            FROM uploads
+            WHERE id = %s
+        """, (upload_id,))
+        result = cursor.fetchone()
+        cursor.close()
+        if not result or not result[0]:
+            return None
+        manifest_id, filename, total_items = result
+
+        max_rows = get_max_export_rows()
+        if total_items > max_rows:
+            raise ExportTooLarge(f"Upload has {total_items} items, exports are limited to {max_rows} items per request")
+
+        bucket = get_export_bucket()
+        stem = os.path.splitext(os.path.basename(filename or 'manifest'))[0] or 'manifest'
+        key = f"exports/{upload_id}/{datetime.now().strftime('%Y%m%d%H%M%S')}.{export_format}"
+        write, content_type = EXPORT_WRITERS[export_format]
+
+        # Server-side cursor: rows stay on the server and arrive EXPORT_BATCH_ROWS at a time
+        items = iter_rows(conn, f"""
+            SELECT {', '.join(expression for _, expression, _ in EXPORT_COLUMNS)}
+            FROM items
+            WHERE manifest_id = %s
+            ORDER BY id
+        """, (manifest_id,), itersize=EXPORT_BATCH_ROWS)
+
+        writer = S3MultipartWriter(bucket, key, content_type)
+        rows = write(iter_row_batches(items), writer)
+        writer.complete()
+
+        expires_in = int(os.environ.get('EXPORT_URL_EXPIRY_SECONDS', '3600'))
+        url = get_s3_client().generate_presigned_url(
+            'get_object',
+            Params={
+                'Bucket': bucket,
+                'Key': key,
+                'ResponseContentDisposition': f'attachment; filename="{stem}_results.{export_format}"'
+            },
+            ExpiresIn=expires_in
+        )
+
+        logger.info(f"Exported {rows} items of upload {upload_id} to s3://{bucket}/{key} ({writer.size} bytes)")
+        return {'url': url, 'format': export_format, 'rows': rows, 'expires_in': expires_in}
+
+    except ExportTooLarge:
+        raise
+
+    except Exception as e:
+        logger.error(f"Error exporting upload {upload_id}: {str(e)}")
+        if writer:
+            writer.abort()
+        return None
+
+    finally:
+        conn.close()
@@ -0,0 +1,355 @@
+"""
+Similarity Index Module
+
+TF-IDF index over the titles of previously analyzed items, returning the top-k most
+similar items of a new title in milliseconds:
+- Inverted index: token -> positions of the titles containing it; only tokens rarer
+  than COMMON_TOKEN_SHARE of the titles bring in candidates, common ones just add to
+  their scores, and only the candidates' norms are computed
+- Built incrementally: each refresh reads the items analyzed since the last one
+  (watermark on analyzed_at, id) through a server-side cursor, items analyzed again
+  are updated in place; the database is only connected to when a refresh is due
+- analyzed_at is the start of the analyzing transaction, so an item can commit after
+  later ones were read: each refresh reads again SIMILARITY_INDEX_LAG_MINUTES before
+  the watermark, the items already indexed are only updated
+- Stored as gzipped JSON in /tmp and S3, so a new Lambda container loads it instead of
+  reading the whole history
+
+Only AI analyses are indexed (not items priced locally or from a neighbor, nor
+analyses reused from other uploads), so prices are never copied from copies. A near-duplicate needs the same condition as the item it
+is priced from.
+"""
+
+import os
+import re
+import gzip
+import json
+import math
+import heapq
+import logging
+from datetime import datetime, timedelta
+
+import boto3
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+INDEX_VERSION = 2
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+# Tokens in more titles than this share (and at least COMMON_TOKEN_MIN titles) only score candidates
+COMMON_TOKEN_SHARE = 0.05
+COMMON_TOKEN_MIN = 200
+
+REFRESH_SQL = """
+    SELECT id, title, msrp::FLOAT8, estimated_sale_price::FLOAT8, demand, sales_time,
+        COALESCE(condition, 'Unknown'), analyzed_at
+    FROM items
+    WHERE status = 'processed'
+        AND COALESCE(priced_by, 'ai') = 'ai'
+        AND reused_from IS NULL
+        AND estimated_sale_price > 0
+        AND demand IN ('High', 'Medium', 'Low')
+        AND title IS NOT NULL
+        AND analyzed_at IS NOT NULL
+        AND analyzed_at >= %s
+    ORDER BY analyzed_at, id
+"""
+
+# Index of this Lambda container, when it was refreshed and how many items it got since it was saved
+_index = None
+_refreshed_at = None
+_unsaved_items = 0
+_s3_client = None
+
+def tokenize(title):
+    """Get the distinct tokens of a title"""
+    return sorted(set(TOKEN_RE.findall((title or '').lower())))
+
+class SimilarityIndex:
+    """TF-IDF inverted index of analyzed item titles"""
+
+    def __init__(self, entries=None, watermark=None):
+        # Entry: [item_id, title, msrp, estimated_sale_price, demand, sales_time, condition]
+        self.entries = []
+        self.tokens = []
+        self.positions = {}
+        self.postings = {}
+        # Token weights and title norms, computed again on the first search after a change
+        self.weights = None
+        self.norms = None
+        self.watermark = watermark or (datetime(1970, 1, 1), 0)
+        self.add(entries or [])
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, entries):
+        """Add entries, updating the ones already indexed (same item id and title)"""
+        self.weights = self.norms = None
+        for entry in entries:
+            entry = list(entry)
+            position = self.positions.get(entry[0])
+            if position is not None:
+                self.entries[position] = entry
+                continue
+
+            position = len(self.entries)
+            self.positions[entry[0]] = position
+            self.entries.append(entry)
+            tokens = tokenize(entry[1])
+            self.tokens.append(tokens)
+            for token in tokens:
+                self.postings.setdefault(token, []).append(position)
+
+    def idf(self, token):
+        """Smoothed inverse document frequency of a token"""
+        return math.log((len(self.entries) + 1) / (len(self.postings.get(token, ())) + 1)) + 1
+
+    def prepare(self):
+        """Compute the token weights and title norms"""
+        if self.weights is None:
+            self.weights = {token: self.idf(token) for token in self.postings}
+            self.norms = [math.sqrt(sum(self.weights[token] ** 2 for token in tokens)) for tokens in self.tokens]
+
+    def search(self, title, k=5):
+        """
+        Find the titles most similar to a title
+
+        Returns:
+            list of up to k (cosine similarity, entry) tuples, most similar first
+        """
+        self.prepare()
+        weights = {token: self.weights[token] for token in tokenize(title) if token in self.weights}
+        if not weights:
+            return []
+
+        common = max(COMMON_TOKEN_MIN, len(self.entries) * COMMON_TOKEN_SHARE)
+        scores = {}
+        # Rare tokens first: they bring in the candidates
+        for token, weight in sorted(weights.items(), key=lambda item: -item[1]):
+            postings = self.postings[token]
+            if len(postings) <= common or not scores:
+                for position in postings:
+                    scores[position] = scores.get(position, 0.0) + weight * weight
+            else:
+                for position in scores:
+                    if token in self.tokens[position]:
+                        scores[position] += weight * weight
+
+        query_norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+        similarities = ((score / (query_norm * self.norms[position]), position) for position, score in scores.items())
+        return [(similarity, self.entries[position]) for similarity, position in heapq.nlargest(k, similarities)]
+
+    def to_bytes(self):
+        """Serialize the index (entries and watermark, postings are rebuilt on load)"""
+        return gzip.compress(json.dumps({
+            'version': INDEX_VERSION,
+            'watermark': [self.watermark[0].isoformat(), self.watermark[1]],
+            'entries': self.entries,
+        }).encode('utf-8'))
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Load a serialized index, or None if it is from another version"""
+        payload = json.loads(gzip.decompress(data).decode('utf-8'))
+        if payload.get('version') != INDEX_VERSION:
+            return None
+        analyzed_at, item_id = payload['watermark']
+        return cls(payload['entries'], (datetime.fromisoformat(analyzed_at), item_id))
+
+def get_refresh_lag():
+    """Get how far before the watermark a refresh reads again (longest analysis transaction)"""
+    return timedelta(minutes=int(os.environ.get('SIMILARITY_INDEX_LAG_MINUTES', '15')))
+
+def refresh_params(index):
+    """Get the REFRESH_SQL parameters of the index's watermark"""
+    return (index.watermark[0] - get_refresh_lag(),)
+
+def refresh_index(index, rows):
+    """
+    Add the items analyzed since the index's watermark
+
+    Args:
+        index: SimilarityIndex
+        rows: rows of REFRESH_SQL run with refresh_params(index), in order
+
+    Returns:
+        number of new or analyzed again items (not the ones read again within the lag)
+    """
+    count = 0
+    watermark = index.watermark
+    for row in rows:
+        position = index.positions.get(row[0])
+        if position is None or index.entries[position] != list(row[:7]):
+            count += 1
+        index.add([row[:7]])
+        watermark = max(watermark, (row[7], row[0]))
+
+    index.watermark = watermark
+    return count
+
+def get_s3_client():
+    """Get the S3 client (created on first use)"""
+    global _s3_client
+
+    if _s3_client is None:
+        _s3_client = boto3.client('s3')
+    return _s3_client
+
+def is_similarity_index_enabled():
+    """Check if similar items are looked up before AI analysis"""
+    return os.environ.get('ENABLE_SIMILARITY_INDEX', 'true').lower() == 'true'
+
+def get_index_location():
+    """Get the S3 bucket and key of the stored index"""
+    bucket = os.environ.get('SIMILARITY_INDEX_BUCKET') or os.environ.get('S3_UPLOADS_BUCKET', 'arby-csv-uploads')
+    return bucket, os.environ.get('SIMILARITY_INDEX_KEY', 'indexes/similar_items.json.gz')
+
+def get_local_path():
+    """Get the path of the index copy on local disk"""
+    return os.environ.get('SIMILARITY_INDEX_PATH', '/tmp/similar_items.json.gz')
+
+def load_index():
+    """Load the stored index (local copy first, then S3), or an empty index"""
+    path = get_local_path()
+    try:
+        if os.path.exists(path):
+            with open(path, 'rb') as index_file:
+                index = SimilarityIndex.from_bytes(index_file.read())
+            if index is not None:
+                return index
+    except Exception as e:
+        logger.warning(f"Could not read similarity index from {path}: {str(e)}")
+
+    bucket, key = get_index_location()
+    try:
+        data = get_s3_client().get_object(Bucket=bucket, Key=key)['Body'].read()
+        with open(path, 'wb') as index_file:
+            index_file.write(data)
+        index = SimilarityIndex.from_bytes(data)
+        if index is not None:
+            logger.info(f"Loaded similarity index of {len(index)} items from s3://{bucket}/{key}")
+            return index
+    except Exception as e:
+        logger.info(f"No stored similarity index loaded ({str(e)}), building it")
+
+    return SimilarityIndex()
+
+def save_index(index):
+    """Store the index on local disk and in S3"""
+    data = index.to_bytes()
+    with open(get_local_path(), 'wb') as index_file:
+        index_file.write(data)
+
+    bucket, key = get_index_location()
+    get_s3_client().put_object(Bucket=bucket, Key=key, Body=data, ContentType='application/gzip')
+    logger.info(f"Saved similarity index of {len(index)} items ({len(data)} bytes) to s3://{bucket}/{key}")
+
+def is_refresh_due():
+    """Check if the index was not refreshed within SIMILARITY_INDEX_REFRESH_MINUTES"""
+    refresh_after = timedelta(minutes=int(os.environ.get('SIMILARITY_INDEX_REFRESH_MINUTES', '10')))
+    return _refreshed_at is None or datetime.now() - _refreshed_at > refresh_after
+
+def get_index():
+    """Get the similarity index, refreshed from the database when a refresh is due"""
+    global _index, _refreshed_at, _unsaved_items
+
+    if _index is None:
+        _index = load_index()
+
+    if is_refresh_due():
+        from csv_processor import get_db_connection, iter_rows
+        conn = get_db_connection()
+        if not conn:
+            return _index
+        try:
+            _unsaved_items += refresh_index(_index, iter_rows(conn, REFRESH_SQL, refresh_params(_index)))
+        finally:
+            conn.close()
+        _refreshed_at = datetime.now()
+
+        if _unsaved_items >= int(os.environ.get('SIMILARITY_INDEX_SAVE_ITEMS', '500')):
+            try:
+                save_index(_index)
+                _unsaved_items = 0
+            except Exception as e:
+                logger.warning(f"Could not save similarity index: {str(e)}")
+
+    return _index
+
+def find_similar_items(title, k=None):
+    """
+    Find previously analyzed items similar to a title
+
+    Returns:
+        list of dicts with similarity, item_id, title, msrp, estimatedSalePrice, demand,
+        salesTime and condition, most similar first (empty if the index is not available)
+    """
+    if not is_similarity_index_enabled():
+        return []
+
+    k = k or int(os.environ.get('SIMILARITY_TOP_K', '5'))
+    try:
+        return [
+            {
+                'similarity': similarity,
+                'item_id': item_id,
+                'title': similar_title,
+                'msrp': msrp,
+                'estimatedSalePrice': price,
+                'demand': demand,
+                'salesTime': sales_time,
+                'condition': condition,
+            }
+            for similarity, (item_id, similar_title, msrp, price, demand, sales_time, condition)
+            in get_index().search(title, k)
+        ]
+
+    except Exception as e:
+        logger.error(f"Error finding similar items: {str(e)}")
+        return []
+
+def normalize_condition(condition):
+    """Normalize a condition for comparison"""
+    return (condition or 'Unknown').strip().lower()
+
+def price_near_duplicate(item, similar_items):
+    """
+    Price an item from its most similar item if it is a near-duplicate (similar title,
+    same condition, MSRP within SIMILARITY_MAX_MSRP_DIFF)
+
+    Returns:
+        analysis dict (like analyze_item_with_ai), or None
+    """
+    if not similar_items:
+        return None
+
+    best = similar_items[0]
+    threshold = float(os.environ.get('SIMILARITY_DUPLICATE_THRESHOLD', '0.9'))
+    max_msrp_diff = float(os.environ.get('SIMILARITY_MAX_MSRP_DIFF', '0.1'))
+    msrp = float(item.get('msrp') or 0)
+    if best['similarity'] < threshold or msrp <= 0 or not best['msrp']:
+        return None
+    if abs(msrp - best['msrp']) > best['msrp'] * max_msrp_diff:
+        return None
+    if normalize_condition(item.get('condition')) != normalize_condition(best.get('condition')):
+        return None
+
+    return {
+        'estimatedSalePrice': round(best['estimatedSalePrice'] * msrp / best['msrp'], 2),
+        'demand': best['demand'],
+        'salesTime': best['salesTime'],
+        'reasoning': (f"Priced from a near-identical item analyzed before ({best['similarity']:.0%} similar): "
+                      f"{best['title'][:80]}"),
+        'pricedBy': 'similar',
+    }
+
+def format_comparables(similar_items):
+    """Format similar items for the AI prompt"""
+    return '\n'.join(
+        f"        - {similar['title'][:100]} | MSRP ${similar['msrp'] or 0:.2f} | {similar['condition']} | "
+        f"estimated sale ${similar['estimatedSalePrice']:.2f} | {similar['demand']} demand | {similar['salesTime']}"
+        for similar in similar_items
+    )
@@ -3,7 +3,7 @@ import unittest
 from unittest import mock
 
 from amazon_paapi import AmazonApi, models
-from amazon_paapi.errors.exceptions import InvalidArgument
+from amazon_paapi.errors.exceptions import InvalidArgument, ItemsNotFound
 from amazon_paapi.helpers import requests
 
 
@@ -37,6 +37,49 @@ class TestApi(unittest.TestCase):
         response = amazon.get_items("ABCDEFGHIJ")
         self.assertTrue(isinstance(response, list))
 
+    @mock.patch.object(requests, "get_items_response")
+    def test_get_items_chunks_unique_ids(self, mocked_get_items_response):
+        mocked_get_items_response.return_value = []
+        amazon = AmazonApi("key", "secret", "tag", "ES", throttling=0)
+        amazon.get_items([f"B00000000{i}" for i in range(10)] + ["B000000000"])
+        self.assertEqual(mocked_get_items_response.call_count, 1)
+
+    @mock.patch.object(requests, "get_items_response")
+    def test_iter_items(self, mocked_get_items_response):
+        items_ids = [f"B00000000{i}" for i in range(10)] + ["B000000010"]
+        mocked_get_items_response.side_effect = [
+            [models.Item(asin=asin) for asin in reversed(items_ids[:10])],
+            [models.Item(asin=items_ids[10])],
+        ]
+        amazon = AmazonApi("key", "secret", "tag", "ES", throttling=0)
+        iterator = amazon.iter_items(items_ids)
+
+        self.assertEqual(next(iterator).asin, items_ids[0])
+        self.assertEqual(mocked_get_items_response.call_count, 1)
+        self.assertEqual([item.asin for item in iterator], items_ids[1:])
+        self.assertEqual(mocked_get_items_response.call_count, 2)
+
+    @mock.patch.object(requests, "get_items_request")
+    @mock.patch.object(requests, "get_items_response")
+    def test_get_items_by_external_ids(
+        self, mocked_get_items_response, mocked_get_items_request
+    ):
+        upcs = [f"0000000000{i:02d}" for i in range(12)]
+        item = models.Item(asin="B000000001")
+        item.item_info = mock.Mock()
+        item.item_info.external_ids.up_cs.display_values = [upcs[11]]
+        mocked_get_items_response.side_effect = [ItemsNotFound("foo"), [item]]
+        amazon = AmazonApi("key", "secret", "tag", "ES", throttling=0)
+        response = amazon.get_items_by_external_ids(
+            upcs, models.ItemIdType.UPC, resource_profile=["ItemInfo.Title"]
+        )
+
+        self.assertEqual(response, {upcs[11]: item})
+        self.assertEqual(mocked_get_items_request.call_count, 2)
+        _, kwargs = mocked_get_items_request.call_args
+        self.assertEqual(kwargs["item_id_type"], "UPC")
+        self.assertIn("ItemInfo.ExternalIds", kwargs["resource_profile"])
+
     @mock.patch.object(requests, "get_search_items_response")
     def test_search_items(self, mocked_get_search_items_response):
         mocked_response = models.SearchResult()
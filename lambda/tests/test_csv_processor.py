@@ -0,0 +1,346 @@
+import csv
+import io
+import logging
+import os
+import unittest
+from unittest import mock
+
+# csv_processor creates its AWS clients at import
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+import csv_processor
+
+
+def mock_connection(rows):
+    cursor = mock.Mock()
+    cursor.fetchall.return_value = rows
+    conn = mock.Mock()
+    conn.cursor.return_value = cursor
+    return conn
+
+
+class TestIterRows(unittest.TestCase):
+    def test_named_cursor_rows(self):
+        row = ("A1", "Drill", "99.00", 2, "40.00", "10.00", "High", "1-2 weeks", "Sells fast", "Tools", 7, 14)
+        cursor = mock.MagicMock()
+        cursor.__iter__.return_value = iter([row])
+        conn = mock.Mock()
+        conn.cursor.return_value = cursor
+
+        rows = csv_processor.iter_rows(conn, "SELECT 1 WHERE manifest_id = %s", (5,), itersize=100)
+        conn.cursor.assert_not_called()  # nothing runs before the first row is read
+        items = list(map(csv_processor.status_item_from_row, rows))
+
+        self.assertTrue(conn.cursor.call_args.kwargs["name"].startswith("read_"))
+        self.assertEqual(cursor.itersize, 100)
+        cursor.execute.assert_called_once_with("SELECT 1 WHERE manifest_id = %s", (5,))
+        cursor.close.assert_called_once_with()
+        self.assertEqual(len(items), 1)
+        self.assertEqual((items[0]["item_number"], items[0]["msrp"], items[0]["quantity"], items[0]["profit"]),
+                         ("A1", 99.0, 2, 10.0))
+        self.assertEqual(items[0]["analysis"]["estimatedSalePrice"], 40.0)
+        self.assertEqual((items[0]["analysis"]["salesDaysMin"], items[0]["analysis"]["salesDaysMax"]), (7, 14))
+
+    def test_cursor_closed_on_error(self):
+        cursor = mock.MagicMock()
+        cursor.execute.side_effect = RuntimeError("canceling statement")
+        conn = mock.Mock()
+        conn.cursor.return_value = cursor
+
+        with self.assertRaises(RuntimeError):
+            list(csv_processor.iter_rows(conn, "SELECT 1", ()))
+
+        self.assertEqual(cursor.itersize, csv_processor.SERVER_CURSOR_ROWS)
+        cursor.close.assert_called_once_with()
+
+
+class TestSelloutTime(unittest.TestCase):
+    def test_weighted_by_quantity(self):
+        rows = [{"sales_days_max": 7, "quantity": 70}, {"sales_days_max": 28, "quantity": 10},
+                {"sales_days_max": 90, "quantity": 20}]
+
+        # The 81st of 100 units is the first one past the 28 days
+        self.assertEqual(csv_processor.calculate_80_percent_sellout_time(rows), "3 months")
+        rows[0]["quantity"] = 71
+        self.assertEqual(csv_processor.calculate_80_percent_sellout_time(rows), "4 weeks")
+        rows[2]["quantity"] = 30
+        self.assertEqual(csv_processor.calculate_80_percent_sellout_time(rows), "3 months")
+
+    def test_matches_one_entry_per_unit(self):
+        rows = [{"sales_days_max": days, "quantity": quantity}
+                for days, quantity in ((3, 2), (10, 1), (21, 4), (10, 3), (45, 1), (120, 2))]
+        units = sorted(row["sales_days_max"] for row in rows for _ in range(row["quantity"]))
+
+        self.assertEqual(csv_processor.calculate_80_percent_sellout_time(rows), "6 weeks")
+        self.assertEqual(units[int(len(units) * 0.8)], 45)
+
+    def test_missing_values(self):
+        rows = [{"sales_days_max": 5, "quantity": None}, {"sales_days_max": None, "quantity": 9},
+                {"sales_days_max": 60, "quantity": 0}]
+
+        self.assertEqual(csv_processor.calculate_80_percent_sellout_time(rows), "5 days")
+        self.assertIsNone(csv_processor.calculate_80_percent_sellout_time(rows[1:]))
+        self.assertIsNone(csv_processor.calculate_80_percent_sellout_time([]))
+
+
+class TestSplitPriorityTiers(unittest.TestCase):
+    def test_value_share_cutoff(self):
+        item_values = [(1, 10.0), (2, 500.0), (3, 300.0), (4, 150.0), (5, 40.0)]
+
+        ordered_ids, priority_count = csv_processor.split_priority_tiers(item_values, 0.8)
+
+        self.assertEqual(ordered_ids, [2, 3, 4, 5, 1])
+        # 500 + 300 = 800 of 1000 covers 80%
+        self.assertEqual(priority_count, 2)
+
+    def test_cutoff_inside_an_item(self):
+        _, priority_count = csv_processor.split_priority_tiers([(1, 500.0), (2, 299.0), (3, 201.0)], 0.8)
+
+        self.assertEqual(priority_count, 3)
+
+    def test_zero_total_value(self):
+        ordered_ids, priority_count = csv_processor.split_priority_tiers([(1, 0.0), (2, 0.0)], 0.8)
+
+        self.assertEqual(ordered_ids, [1, 2])
+        self.assertEqual(priority_count, 0)
+
+    def test_ties_keep_original_order(self):
+        ordered_ids, priority_count = csv_processor.split_priority_tiers([(3, 100.0), (1, 100.0), (2, 100.0)], 0.5)
+
+        self.assertEqual(ordered_ids, [3, 1, 2])
+        self.assertEqual(priority_count, 2)
+
+    def test_empty(self):
+        self.assertEqual(csv_processor.split_priority_tiers([], 0.8), ([], 0))
+
+
+class TestPrioritizeItems(unittest.TestCase):
+    def test_orders_by_value(self):
+        conn = mock_connection([(1, 10, 1, "Other"), (2, 100, 2, "Other"), (3, 50, 1, "Other")])
+        with mock.patch.object(csv_processor, "get_db_connection", return_value=conn):
+            self.assertEqual(csv_processor.prioritize_items("m1", [1, 2, 3]), ([2, 3, 1], 2))
+
+    def test_unknown_ids_queued_last(self):
+        conn = mock_connection([(1, 10, 1, "Other"), (2, 100, 1, "Other")])
+        with mock.patch.object(csv_processor, "get_db_connection", return_value=conn):
+            ordered_ids, _ = csv_processor.prioritize_items("m1", [9, 1, 2, 8])
+
+        self.assertEqual(ordered_ids, [2, 1, 9, 8])
+
+    def test_unknown_ids_queued_last_in_early_estimate_mode(self):
+        conn = mock_connection([(1, 10, 1, "Other"), (2, 100, 1, "Other")])
+        with mock.patch.object(csv_processor, "get_db_connection", return_value=conn):
+            ordered_ids, priority_count = csv_processor.prioritize_items("m1", [9, 1, 2], early_estimate=True)
+
+        self.assertEqual(sorted(ordered_ids[:2]), [1, 2])
+        self.assertEqual(ordered_ids[2:], [9])
+        self.assertEqual(priority_count, 2)
+
+    def test_no_connection(self):
+        with mock.patch.object(csv_processor, "get_db_connection", return_value=None):
+            self.assertEqual(csv_processor.prioritize_items("m1", [3, 1, 3]), ([3, 1], 0))
+
+
+UNIVERSAL_MANIFESTS = [
+    # Unknown headers, prices and quantities in several notations
+    "Lot Ref,Item Code,Title,Retail,Units,Category,Brand,Grade\n"
+    "L1,G10001,Dayton Widget 1 123X,19.99,2,Tools,Dayton,New\n"
+    "L1,G10002,\"Drill, Cordless 20V\",\"$1,234.50\",ten,Tools,DeWalt,Used\n"
+    "L1,,  Drill Driver  ,N/A,,Home,,none\n"
+    "\n"
+    "L2,null,,25,1,Office,HP,Damaged\n"
+    "L2,G10005,Sony Headphones,0,2.0,Electronics,Sony,Like New\n",
+    # Short rows and extra cells
+    "SKU,Description,MSRP,Qty,Notes\n"
+    "A1,Fan 115V,40.00,3\n"
+    "A2,Heater,$99,1,shelf 4,extra\n"
+    "A3,Cabinet,12.5\n"
+    ",,,\n",
+]
+
+
+class TestColumnarParse(unittest.TestCase):
+    def setUp(self):
+        # The row parser logs a warning per invalid row
+        logging.disable(logging.WARNING)
+        self.addCleanup(logging.disable, logging.NOTSET)
+
+    def parse(self, content, min_rows):
+        with mock.patch.dict(os.environ, {"CSV_PARSE_MODE": "auto", "COLUMNAR_PARSE_MIN_ROWS": str(min_rows)}):
+            return csv_processor.parse_universal_csv(io.StringIO(content), content)
+
+    def test_same_items_as_row_parser(self):
+        for content in UNIVERSAL_MANIFESTS:
+            with self.subTest(headers=content.splitlines()[0]):
+                with mock.patch.object(csv_processor, "parse_universal_csv_columnar",
+                                       wraps=csv_processor.parse_universal_csv_columnar) as columnar:
+                    expected = self.parse(content, 1000000)
+                    self.assertFalse(columnar.called)
+                    items = self.parse(content, 1)
+                    self.assertTrue(columnar.called)
+
+                self.assertTrue(expected)
+                self.assertEqual(items, expected)
+
+    def test_use_columnar_parse(self):
+        with mock.patch.dict(os.environ, {"CSV_PARSE_MODE": "auto", "COLUMNAR_PARSE_MIN_ROWS": "3"}):
+            self.assertFalse(csv_processor.use_columnar_parse("h\n1\n"))
+            self.assertTrue(csv_processor.use_columnar_parse("h\n1\n2\n"))
+        with mock.patch.dict(os.environ, {"CSV_PARSE_MODE": "row", "COLUMNAR_PARSE_MIN_ROWS": "1"}):
+            self.assertFalse(csv_processor.use_columnar_parse("h\n1\n2\n"))
+
+
+def vendor_item(item_number, title, msrp, quantity=1, notes=None, pallet=None):
+    return {"item_number": item_number, "title": title, "msrp": msrp, "quantity": quantity,
+            "notes": notes, "pallet": pallet}
+
+
+# Format, header row, sample row, expected item
+VENDOR_SAMPLES = [
+    ("grainger", "Grainger Item #,Description,Grainger $,Notes,Pallet",
+     "1A234,Motor 1/2 HP,$125.50,Boxed,P7",
+     vendor_item("1A234", "Motor 1/2 HP", 125.5, notes="Boxed", pallet="P7")),
+    ("liquidation", "UPC,Product Description,Retail Price,Total Retail Price,Category,Qty",
+     "012345678905,Coffee Maker,$49.99,$99.98,Kitchen,2",
+     vendor_item("012345678905", "Coffee Maker", 49.99, 2, "Category: Kitchen", "Qty: 2")),
+    ("staples", "Description,Model,Retail Price,Ext Retail Price,Quantity,Restriction",
+     "Desk Chair,SPL-100,$199.00,$398.00,2 ea,Oversize",
+     vendor_item("SPL-100", "Desk Chair", 199.0, 2, "Model: SPL-100, Restriction: Oversize", "Qty: 2")),
+    ("direct_liquidation", "Item Title,Retail Price,SKU,Brand,Quantity",
+     "Air Fryer,89.99,DL-5,Ninja,3",
+     vendor_item("DL-5", "Air Fryer", 89.99, 3, "Brand: Ninja", "Qty: 3")),
+    ("department_store", "SKU,Product Name,MSRP,Extended MSRP,Brand,Condition,Quantity",
+     "DS-1,Wool Coat,$250,$500,Calvin,New,2",
+     vendor_item("DS-1", "Wool Coat", 250.0, 2, "Brand: Calvin, Condition: New", "Qty: 2")),
+    ("electronics", "Model,Description,Retail Price,Total Retail,Condition,Qty",
+     "XB-900,Speaker,$149.99,$299.98,Refurbished,2",
+     vendor_item("XB-900", "Speaker", 149.99, 2, "Model: XB-900, Condition: Refurbished", "Qty: 2")),
+    ("costco", "Item Number,Description,Quantity,Sell Price,Extended Sell,Salvage Percent",
+     "C123,Vacuum,1,$299.99,$299.99,15",
+     vendor_item("C123", "Vacuum", 299.99, 1, "Salvage: 15.0%", "Qty: 1")),
+    ("generic_product", "SKU,Name,Price,Notes,Lot",
+     "G1,Lamp,20,Scuffed,L9",
+     vendor_item("G1", "Lamp", 20.0, notes="Scuffed", pallet="L9")),
+    ("parts", "Part,Description,Cost,Condition,Bin",
+     "PN-7,Gasket,3.25,New,B12",
+     vendor_item("PN-7", "Gasket", 3.25, notes="New", pallet="B12")),
+]
+
+
+class TestParseVendorFormat(unittest.TestCase):
+    def parse(self, format_name, content):
+        return csv_processor.parse_vendor_format(io.StringIO(content), content, format_name)
+
+    def test_sample_rows(self):
+        self.assertEqual({sample[0] for sample in VENDOR_SAMPLES}, set(csv_processor.VENDOR_FORMATS))
+        for format_name, headers, row, expected in VENDOR_SAMPLES:
+            with self.subTest(format_name=format_name):
+                self.assertEqual(self.parse(format_name, f"{headers}\n{row}\n"), [expected])
+
+    def test_extra_trailing_cell_ignored(self):
+        for format_name, headers, row, expected in VENDOR_SAMPLES:
+            with self.subTest(format_name=format_name):
+                self.assertEqual(self.parse(format_name, f"{headers}\n{row},extra cell\n"), [expected])
+
+    def test_rows_without_msrp_or_required_fields_skipped(self):
+        content = "SKU,Name,Price\nG1,Lamp,0\nG2,,5\n,Fan,5\nG4,Desk,N/A\nG5,Chair,12\n"
+
+        self.assertEqual(self.parse("generic_product", content), [vendor_item("G5", "Chair", 12.0)])
+
+    def test_generated_item_numbers(self):
+        content = "Description,Model,Retail Price\nFan,,10\nDesk,D1,20\nLamp,,30\n"
+
+        items = self.parse("staples", content)
+
+        self.assertEqual([item["item_number"] for item in items], ["item_1", "D1", "item_3"])
+
+
+class TestResolveManifestFormat(unittest.TestCase):
+    def setUp(self):
+        for name in ("lookup_header_format", "record_header_format"):
+            patcher = mock.patch.object(csv_processor.header_registry, name, return_value=None)
+            setattr(self, name, patcher.start())
+            self.addCleanup(patcher.stop)
+
+    def test_confident_detection_recorded(self):
+        for first_line, expected in (("SKU,Product Name,MSRP,Condition", "department_store"),
+                                     ("Code,Title,Price", "generic_product"),
+                                     ("Ref,Widget Title,Retail", "universal")):
+            with self.subTest(first_line=first_line):
+                format_name, column_map = csv_processor.resolve_manifest_format(first_line)
+
+                self.assertEqual(format_name, expected)
+                self.record_header_format.assert_called_with(first_line.split(","), format_name, column_map)
+
+    def test_weak_detection_not_recorded(self):
+        # First data row of a headerless file, and a header row without an MSRP column
+        for first_line in ("A1,Cordless Drill,Scuffed box", "SKU,Product Name,Brand"):
+            with self.subTest(first_line=first_line):
+                csv_processor.resolve_manifest_format(first_line)
+
+        self.record_header_format.assert_not_called()
+
+
+SPLIT_MANIFESTS = [
+    "SKU,Description,MSRP\nA1,Fan,10\nA2,Heater,20\n\nA3,Cabinet,30\nA4,Chair,40\nA5,Desk,50\n",
+    # Quoted fields with newlines and commas, CRLF line ends, blank rows, no final newline
+    "SKU,Description,MSRP\r\n"
+    "A1,\"Fan\r\n115V, 3 speed\",10\r\n"
+    "\r\n"
+    "A2,\"Heater \"\"XL\"\"\",20\r\n"
+    "A3,\"Cabinet\n\n2 doors\",30\r\n"
+    "A4,Chair,40\r\n"
+    "A5,\"Desk\nOak\",50",
+]
+
+
+class TestSplitCsvRows(unittest.TestCase):
+    def test_chunks_parse_like_the_whole_file(self):
+        for content in SPLIT_MANIFESTS:
+            expected = list(csv.reader(io.StringIO(content)))
+            for chunk_count in (1, 2, 3, 10):
+                with self.subTest(content=content[:30], chunk_count=chunk_count):
+                    header, chunks = csv_processor.split_csv_rows(content, chunk_count)
+
+                    self.assertEqual(header + "".join(text for text, _ in chunks), content)
+                    self.assertLessEqual(len(chunks), chunk_count)
+                    rows = list(csv.reader(io.StringIO(header)))
+                    for text, row_count in chunks:
+                        chunk_rows = list(csv.reader(io.StringIO(text)))
+                        self.assertEqual(row_count, sum(1 for row in chunk_rows if row))
+                        rows += chunk_rows
+                    self.assertEqual(rows, expected)
+
+    def test_header_only(self):
+        self.assertEqual(csv_processor.split_csv_rows("SKU,MSRP\n", 2), ("SKU,MSRP\n", []))
+        self.assertEqual(csv_processor.split_csv_rows("", 2), ("", []))
+
+
+class TestParseCsvParallel(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.WARNING)
+        self.addCleanup(logging.disable, logging.NOTSET)
+
+    def test_same_items_as_sequential_parse(self):
+        content = "SKU,Description,MSRP,Qty\n" + "".join(
+            f"{'' if i % 3 else f'A{i}'},\"Item {i}\nline 2\",{i + 1}.50,{i % 4 + 1}\n" for i in range(40)
+        )
+        parser = csv_processor.parse_universal_csv
+
+        items = csv_processor.parse_csv_parallel(content, "universal", parser, 3)
+
+        self.assertEqual(items, parser(io.StringIO(content), content))
+        self.assertEqual(len(items), 40)
+
+    def test_single_vcpu_parses_sequentially(self):
+        content = "SKU,MSRP\n" + "A,1\n" * 10
+        with mock.patch.object(csv_processor, "get_available_cpus", return_value=1), \
+                mock.patch.dict(os.environ, {"PARALLEL_PARSE_MIN_ROWS": "1", "PARSE_WORKERS": "4"}):
+            self.assertEqual(csv_processor.get_parse_workers(content), 1)
+        with mock.patch.object(csv_processor, "get_available_cpus", return_value=2), \
+                mock.patch.dict(os.environ, {"PARALLEL_PARSE_MIN_ROWS": "1", "PARSE_WORKERS": "4"}):
+            self.assertEqual(csv_processor.get_parse_workers(content), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import unittest
+from unittest import mock
+
+import data_enrichment
+
+RAW_ITEM = {"item_number": "A1", "title": "Dayton 1/2 HP Motor 115V", "msrp": 120.0, "quantity": 1}
+
+SEARCH_RESULT = {
+    "asin": "B000MOTOR1", "title": "DAYTON 1/2 HP General Purpose Motor, 115V", "brand": "Dayton",
+    "list_price": 125.0, "current_price": 99.0, "image_url": None, "category": "Motors", "features": [],
+    "enrichment_source": "Amazon Title Search",
+}
+
+
+class TestEnrichProduct(unittest.TestCase):
+    def setUp(self):
+        for name, value in (("lookup_product", None), ("record_product", None)):
+            patcher = mock.patch.object(data_enrichment.product_catalog, name, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_title_search_without_upc_match(self):
+        with mock.patch.object(data_enrichment, "search_amazon_by_title", return_value=SEARCH_RESULT) as search:
+            enriched = data_enrichment.enrich_product(RAW_ITEM)
+
+        search.assert_called_once_with("Dayton 1/2 HP Motor 115V", None)
+        self.assertTrue(enriched["enriched"])
+        self.assertEqual(enriched["enrichment_source"], "Amazon Title Search")
+        self.assertEqual((enriched["asin"], enriched["current_market_price"]), ("B000MOTOR1", 99.0))
+
+    def test_no_title_search_after_upc_match(self):
+        amazon_data = dict(SEARCH_RESULT, enrichment_source="Amazon UPC Lookup")
+        with mock.patch.object(data_enrichment, "search_amazon_by_title") as search:
+            enriched = data_enrichment.enrich_product(RAW_ITEM, amazon_data)
+
+        search.assert_not_called()
+        self.assertEqual(enriched["enrichment_source"], "Amazon UPC Lookup")
+
+    def test_title_search_disabled(self):
+        with mock.patch.dict(os.environ, {"ENABLE_AMAZON_TITLE_SEARCH": "false"}), \
+                mock.patch.object(data_enrichment, "search_amazon_by_title") as search:
+            enriched = data_enrichment.enrich_product(RAW_ITEM)
+
+        search.assert_not_called()
+        self.assertFalse(enriched["enriched"])
+
+    def test_upc_database_before_title_search(self):
+        found = {"title": "Dayton 1/2 HP Motor", "brand": "Dayton", "category": "Motors", "image_url": None,
+                 "upc": "012345678905", "enrichment_source": "UPC Database"}
+        with mock.patch.dict(os.environ, {"ENABLE_UPC_DATABASE_LOOKUP": "true"}), \
+                mock.patch.object(data_enrichment, "lookup_upc_database", return_value=found) as lookup, \
+                mock.patch.object(data_enrichment, "search_amazon_by_title") as search:
+            enriched = data_enrichment.enrich_product(dict(RAW_ITEM, upc="0-12345-67890-5"))
+
+        lookup.assert_called_once_with("012345678905")
+        search.assert_not_called()
+        self.assertEqual((enriched["enrichment_source"], enriched["brand"]), ("UPC Database", "Dayton"))
+
+    def test_upc_database_disabled_by_default(self):
+        with mock.patch.object(data_enrichment, "lookup_upc_database") as lookup, \
+                mock.patch.object(data_enrichment, "search_amazon_by_title", return_value=None):
+            data_enrichment.enrich_product(dict(RAW_ITEM, upc="012345678905"))
+
+        lookup.assert_not_called()
+
+
+class TestLookupUpcDatabase(unittest.TestCase):
+    def test_known_miss_skips_request(self):
+        with mock.patch.object(data_enrichment.product_catalog, "is_known_miss", return_value=True), \
+                mock.patch.object(data_enrichment.requests, "get") as get:
+            self.assertIsNone(data_enrichment.lookup_upc_database("012345678905"))
+
+        get.assert_not_called()
+
+    def test_not_found_recorded_as_miss(self):
+        response = mock.Mock(status_code=200)
+        response.json.return_value = {"code": "OK", "items": []}
+        with mock.patch.object(data_enrichment.product_catalog, "is_known_miss", return_value=False), \
+                mock.patch.object(data_enrichment.product_catalog, "record_miss") as record_miss, \
+                mock.patch.object(data_enrichment.requests, "get", return_value=response):
+            self.assertIsNone(data_enrichment.lookup_upc_database("012345678905"))
+
+        record_miss.assert_called_once_with("upc_database", "012345678905")
+
+
+class TestSearchAmazonByTitle(unittest.TestCase):
+    def test_known_miss_skips_request(self):
+        with mock.patch.object(data_enrichment.product_catalog, "is_known_miss", return_value=True), \
+                mock.patch.object(data_enrichment, "get_amazon_client") as get_amazon_client:
+            self.assertIsNone(data_enrichment.search_amazon_by_title("Dayton Motor"))
+
+        get_amazon_client.assert_not_called()
+
+    def test_no_result_recorded_as_miss(self):
+        amazon = mock.Mock()
+        amazon.search_items.return_value = mock.Mock(items=[])
+        with mock.patch.object(data_enrichment.product_catalog, "is_known_miss", return_value=False), \
+                mock.patch.object(data_enrichment.product_catalog, "record_miss") as record_miss, \
+                mock.patch.object(data_enrichment, "get_amazon_client", return_value=(amazon, mock.Mock())):
+            self.assertIsNone(data_enrichment.search_amazon_by_title("Dayton Motor!", "Dayton"))
+
+        self.assertEqual(amazon.search_items.call_args.kwargs["keywords"], "Dayton Dayton Motor!")
+        record_miss.assert_called_once_with("amazon_search", "dayton motor")
+
+
+if __name__ == "__main__":
+    unittest.main()
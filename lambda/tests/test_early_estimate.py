@@ -0,0 +1,83 @@
+import random
+import unittest
+from unittest import mock
+
+import early_estimate
+
+
+def make_items(count, seed=7):
+    rng = random.Random(seed)
+    items = []
+    for item_id in range(count):
+        msrp = round(rng.lognormvariate(4, 1.2), 2)
+        category = rng.choice(["Air Tools", "Motors & Pumps", "Other"])
+        price = msrp * {"Air Tools": 0.5, "Motors & Pumps": 0.3, "Other": 0.2}[category] * rng.uniform(0.6, 1.4)
+        items.append((item_id, msrp, rng.choice([1, 1, 2]), category, price))
+    return items
+
+
+def strata_rows(items, analyzed):
+    strata = {}
+    for item_id, msrp, quantity, category, price in items:
+        x, y = msrp * quantity, price * quantity
+        row = strata.setdefault((early_estimate.msrp_band(msrp), category), [0, 0.0, 0, 0.0, 0.0, 0.0, 0.0, 0.0])
+        row[0] += 1
+        row[1] += x
+        if item_id in analyzed:
+            for column, value in zip(range(2, 8), (1, x, y, x * x, y * y, x * y)):
+                row[column] += value
+    return [(band, category, *row) for (band, category), row in strata.items()]
+
+
+class TestOrderForEstimate(unittest.TestCase):
+    def test_every_stratum_first(self):
+        items = [item[:4] for item in make_items(500)]
+        order = early_estimate.order_for_estimate(items, seed=1)
+
+        self.assertEqual(sorted(order), list(range(500)))
+        strata = {(early_estimate.msrp_band(msrp), category) for _, msrp, _, category in items}
+        head = {(early_estimate.msrp_band(items[item_id][1]), items[item_id][3]) for item_id in order[:len(strata)]}
+        self.assertEqual(head, strata)
+
+    def test_msrp_band_matches_sql_bounds(self):
+        self.assertEqual(early_estimate.msrp_band(None), 0)
+        self.assertEqual(early_estimate.msrp_band(24.99), 0)
+        self.assertEqual(early_estimate.msrp_band(25), 1)
+        self.assertEqual(early_estimate.msrp_band(2000), len(early_estimate.MSRP_BANDS))
+
+
+class TestEstimateFromStrata(unittest.TestCase):
+    def test_no_estimate_before_two_items(self):
+        items = make_items(50)
+        self.assertIsNone(early_estimate.estimate_from_strata(strata_rows(items, {0})))
+
+    def test_interval_tightens_and_is_exact_when_done(self):
+        items = make_items(3000)
+        truth = sum(price * quantity for _, _, quantity, _, price in items)
+        order = early_estimate.order_for_estimate([item[:4] for item in items], seed=3)
+
+        widths = []
+        for count in (100, 500, 1500):
+            estimate = early_estimate.estimate_from_strata(strata_rows(items, set(order[:count])))
+            self.assertLessEqual(estimate["low"], truth)
+            self.assertGreaterEqual(estimate["high"], truth)
+            widths.append(estimate["high"] - estimate["low"])
+        self.assertEqual(widths, sorted(widths, reverse=True))
+
+        final = early_estimate.estimate_from_strata(strata_rows(items, set(order)))
+        self.assertAlmostEqual(final["projectedRevenue"], truth, places=6)
+        self.assertAlmostEqual(final["high"] - final["low"], 0, places=6)
+
+    def test_query(self):
+        cursor = mock.Mock()
+        cursor.fetchall.return_value = [(1, "Other", 4, 400.0, 2, 200.0, 50.0, 20000.0, 1300.0, 5000.0)]
+
+        estimate = early_estimate.query_revenue_estimate(cursor, "manifest-1")
+
+        cursor.execute.assert_called_once_with(early_estimate.STRATA_SQL, ("manifest-1",))
+        self.assertAlmostEqual(estimate["projectedRevenue"], 100.0)
+        self.assertEqual(estimate["sampledItems"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+import header_registry
+
+
+class TestHeaderRegistry(unittest.TestCase):
+    def setUp(self):
+        header_registry._registry = None
+        # No database: the registry works from the seeds and what it learns in memory
+        csv_processor = mock.Mock(get_db_connection=mock.Mock(return_value=None))
+        patcher = mock.patch.dict(sys.modules, {"csv_processor": csv_processor})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(setattr, header_registry, "_registry", None)
+        patcher = mock.patch.object(header_registry, "_seen", set())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_fingerprint_normalized(self):
+        self.assertEqual(
+            header_registry.get_header_fingerprint(["\ufeffSKU", " Product Name "]),
+            header_registry.get_header_fingerprint(["sku", "product name"]),
+        )
+
+    def test_fingerprint_order(self):
+        self.assertNotEqual(
+            header_registry.get_header_fingerprint(["a", "b"]),
+            header_registry.get_header_fingerprint(["b", "a"]),
+        )
+
+    def test_lookup_seed(self):
+        headers = ["Item Number", "Description", "Quantity", "Sell Price", "Extended Sell", "Salvage Percent"]
+        self.assertEqual(header_registry.lookup_header_format(headers), ("costco", None))
+
+    def test_lookup_unknown(self):
+        self.assertIsNone(header_registry.lookup_header_format(["Foo", "Bar"]))
+
+    def test_record_and_lookup(self):
+        header_registry.record_header_format(["Code", "Name"], "universal", {"item_number": "Code", "title": "Name"})
+        self.assertEqual(
+            header_registry.lookup_header_format(["CODE", "name"]),
+            ("universal", {"item_number": "CODE", "title": "name"}),
+        )
+
+    def test_is_header_row(self):
+        self.assertTrue(header_registry.is_header_row(["SKU", "Product Name", "MSRP", "Model 3"]))
+        self.assertFalse(header_registry.is_header_row(["A1", "Drill", "$1,299.00"]))
+        self.assertFalse(header_registry.is_header_row(["012345678905", "Drill", "12"]))
+        self.assertFalse(header_registry.is_header_row(["Drill", "15%"]))
+        self.assertFalse(header_registry.is_header_row(["", " "]))
+
+    def test_data_row_not_learned(self):
+        self.assertFalse(header_registry.record_header_format(["A1", "Drill", "99.00"], "universal", {"title": "Drill"}))
+        self.assertIsNone(header_registry.lookup_header_format(["A1", "Drill", "99.00"]))
+
+
+class TestHeaderRegistryExpiry(unittest.TestCase):
+    def setUp(self):
+        header_registry._registry = None
+        self.addCleanup(setattr, header_registry, "_registry", None)
+        patcher = mock.patch.object(header_registry, "_seen", set())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.cursor = mock.Mock()
+        self.cursor.fetchall.return_value = [
+            (header_registry.get_header_fingerprint(["code", "name"]), "universal", '{"title": "name"}'),
+        ]
+        conn = mock.Mock()
+        conn.cursor.return_value = self.cursor
+        csv_processor = mock.Mock(get_db_connection=mock.Mock(return_value=conn))
+        patcher = mock.patch.dict(sys.modules, {"csv_processor": csv_processor})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_loads_recently_seen_rows(self):
+        with mock.patch.dict(os.environ, {"HEADER_FORMAT_TTL_DAYS": "30", "HEADER_REGISTRY_MAX_ROWS": "100"}):
+            header_registry.load_registry()
+
+        query, params = self.cursor.execute.call_args.args
+        self.assertIn("WHERE last_seen_at >=", query)
+        self.assertEqual(params, (30, 100))
+
+    def test_lookup_touches_learned_row_once(self):
+        for _ in range(2):
+            self.assertEqual(header_registry.lookup_header_format(["Code", "Name"]), ("universal", {"title": "Name"}))
+        header_registry.lookup_header_format(
+            ["Item Number", "Description", "Quantity", "Sell Price", "Extended Sell", "Salvage Percent"])
+
+        updates = [call for call in self.cursor.execute.call_args_list if "UPDATE header_formats" in call.args[0]]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(updates[0].args[1], (header_registry.get_header_fingerprint(["code", "name"]),))
+
+    def test_record_purges_expired_rows(self):
+        header_registry.record_header_format(["Code", "Title", "Price"], "universal", {"title": "Title"})
+
+        queries = [call.args[0] for call in self.cursor.execute.call_args_list]
+        self.assertTrue(queries[-2].startswith("DELETE FROM header_formats WHERE last_seen_at <"))
+        self.assertIn("DO UPDATE SET last_seen_at = CURRENT_TIMESTAMP", queries[-1])
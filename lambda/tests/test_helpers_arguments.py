@@ -6,6 +6,7 @@ from amazon_paapi.helpers.arguments import (
     check_search_mandatory_args,
     check_search_pagination_args,
     check_variations_args,
+    get_external_ids,
     get_items_ids,
 )
 
@@ -55,6 +56,22 @@ class TestHelpersArguments(unittest.TestCase):
         with self.assertRaises(InvalidArgument):
             get_items_ids(34)
 
+    def test_get_external_ids_from_string(self):
+        result = get_external_ids("0123-4567-8905, 885909950805", "UPC")
+        self.assertEqual(["012345678905", "885909950805"], result)
+
+    def test_get_external_ids_isbn_check_digit(self):
+        result = get_external_ids(["080442957x"], "ISBN")
+        self.assertEqual(["080442957X"], result)
+
+    def test_get_external_ids_invalid_id(self):
+        with self.assertRaises(InvalidArgument):
+            get_external_ids(["ABC123"], "UPC")
+
+    def test_get_external_ids_invalid_type(self):
+        with self.assertRaises(InvalidArgument):
+            get_external_ids(["012345678905"], "ASIN")
+
     def test_check_search_mandatory_args_correct(self):
         check_search_mandatory_args(actor="John Doe")
 
@@ -1,7 +1,7 @@
 import unittest
 from unittest import mock
 
-from amazon_paapi.helpers.items import sort_items
+from amazon_paapi.helpers.items import map_items_by_external_id, sort_items
 
 
 class MockedItem(mock.MagicMock):
@@ -10,6 +10,13 @@ class MockedItem(mock.MagicMock):
         self.asin = asin
 
 
+def mocked_item_with_upcs(asin, upcs):
+    item = MockedItem(asin)
+    item.item_info = mock.Mock()
+    item.item_info.external_ids.up_cs.display_values = upcs
+    return item
+
+
 class TestHelpersItems(unittest.TestCase):
     def setUp(self):
         self.mocked_items = [
@@ -40,3 +47,32 @@ class TestHelpersItems(unittest.TestCase):
     def test_sort_items_include_repeated(self):
         sorted_items = sort_items(self.mocked_items, self.mocked_items_ids, True)
         self.assertEqual(sorted_items[1].asin, sorted_items[5].asin)
+
+    def test_sort_items_keeps_first_match(self):
+        first = MockedItem("A")
+        sorted_items = sort_items([first, MockedItem("A")], ["A"], False)
+        self.assertIs(sorted_items[0], first)
+
+    def test_sort_items_large_list(self):
+        items_ids = [f"ASIN{i}" for i in range(2000)]
+        items = [MockedItem(asin) for asin in reversed(items_ids)]
+        sorted_items = sort_items(items, items_ids, False)
+        self.assertEqual([item.asin for item in sorted_items], items_ids)
+
+    def test_map_items_by_external_id(self):
+        items = [
+            mocked_item_with_upcs("A", ["0885909950805"]),
+            mocked_item_with_upcs("B", ["012345678905", "012345678912"]),
+        ]
+        items_ids = ["012345678912", "885909950805", "999999999999"]
+        mapped = map_items_by_external_id(items, items_ids, "UPC")
+
+        self.assertEqual(mapped["012345678912"].asin, "B")
+        self.assertEqual(mapped["885909950805"].asin, "A")
+        self.assertNotIn("999999999999", mapped)
+
+    def test_map_items_by_external_id_single_item_without_ids(self):
+        item = MockedItem("A")
+        item.item_info = None
+        mapped = map_items_by_external_id([item], ["012345678905"], "UPC")
+        self.assertIs(mapped["012345678905"], item)
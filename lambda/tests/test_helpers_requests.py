@@ -10,6 +10,9 @@ from amazon_paapi.errors import (
     TooManyRequests,
 )
 from amazon_paapi.helpers import requests
+from amazon_paapi.models import ResourceProfile
+from amazon_paapi.sdk.models.get_items_resource import GetItemsResource
+from amazon_paapi.sdk.models.search_items_resource import SearchItemsResource
 from amazon_paapi.sdk.rest import ApiException
 
 
@@ -28,6 +31,17 @@ class TestRequests(unittest.TestCase):
         with self.assertRaises(MalformedRequest):
             requests.get_items_request(Mock(), ["test"])
 
+    @patch.object(requests, "GetItemsRequest")
+    def test_get_items_request_resource_profile(self, mock_get_items_request):
+        requests.get_items_request(
+            Mock(), ["test"], resource_profile=ResourceProfile.PRICE
+        )
+        resources = mock_get_items_request.call_args.kwargs["resources"]
+
+        self.assertIn("ItemInfo.Title", resources)
+        self.assertIn("Offers.Listings.Price", resources)
+        self.assertNotIn("Images.Primary.Large", resources)
+
     @patch.object(requests, "SearchItemsRequest")
     def test_search_items_request(self, mock_search_items_request):
         mock_search_items_request.return_value = "foo"
@@ -160,6 +174,46 @@ class TestRequests(unittest.TestCase):
         with self.assertRaises(ItemsNotFound):
             requests.get_browse_nodes_response(amazon_api, Mock())
 
+    def test_get_request_resources_full(self):
+        resources = requests._get_request_resources(SearchItemsResource)
+
+        self.assertIn("Images.Primary.Large", resources)
+        self.assertIn("Offers.Listings.Price", resources)
+
+    def test_get_request_resources_profile(self):
+        resources = requests._get_request_resources(
+            GetItemsResource, ResourceProfile.PRICE_IMAGES
+        )
+
+        self.assertEqual(
+            sorted(resources),
+            [
+                "Images.Primary.Large",
+                "Images.Primary.Medium",
+                "Images.Primary.Small",
+                "ItemInfo.Title",
+                "Offers.Listings.Price",
+                "Offers.Listings.SavingBasis",
+            ],
+        )
+
+    def test_get_request_resources_cached(self):
+        requests._get_cached_resources.cache_clear()
+        first = requests._get_request_resources(GetItemsResource)
+        second = requests._get_request_resources(GetItemsResource)
+
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+        self.assertEqual(requests._get_cached_resources.cache_info().hits, 1)
+
+    def test_get_request_resources_invalid_profile(self):
+        with self.assertRaises(InvalidArgument):
+            requests._get_request_resources(GetItemsResource, 10)
+
+    def test_get_request_resources_unmatched_profile(self):
+        with self.assertRaises(InvalidArgument):
+            requests._get_request_resources(GetItemsResource, ["Unknown.Resource"])
+
     def test_manage_response_exceptions_too_many_requests(self):
         error = Mock(spec=ApiException, status=429)
         with self.assertRaises(TooManyRequests):
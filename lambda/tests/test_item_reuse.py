@@ -0,0 +1,50 @@
+import unittest
+from unittest import mock
+
+import item_reuse
+
+ITEM = {"asin": "B000TEST01", "title": "DAYTON Motor 1/2 HP", "msrp": 199.0, "condition": "New"}
+
+
+class TestItemFingerprint(unittest.TestCase):
+    def test_stable_across_formatting(self):
+        same = dict(ITEM, asin=" b000test01 ", msrp="199.00", condition="new")
+        self.assertEqual(item_reuse.item_fingerprint(ITEM), item_reuse.item_fingerprint(same))
+
+    def test_changes_with_msrp_and_condition(self):
+        fingerprint = item_reuse.item_fingerprint(ITEM)
+        self.assertNotEqual(fingerprint, item_reuse.item_fingerprint(dict(ITEM, msrp=189.0)))
+        self.assertNotEqual(fingerprint, item_reuse.item_fingerprint(dict(ITEM, condition="Used")))
+
+    def test_title_identity(self):
+        item = {"title": "Safety Glasses, Clear", "msrp": 5}
+        self.assertEqual(
+            item_reuse.item_fingerprint(item),
+            item_reuse.item_fingerprint({"title": "SAFETY GLASSES  clear", "msrp": 5.0}),
+        )
+
+    def test_no_identity(self):
+        self.assertIsNone(item_reuse.item_fingerprint({"msrp": 10}))
+
+
+class TestCopyFreshAnalyses(unittest.TestCase):
+    def test_returns_reused_ids(self):
+        cursor = mock.Mock()
+        cursor.fetchall.return_value = [(3,), (7,)]
+
+        with mock.patch.dict("os.environ", {"ITEM_REUSE_MAX_AGE_HOURS": "6"}):
+            reused = item_reuse.copy_fresh_analyses(cursor, "manifest-1")
+
+        self.assertEqual(reused, {3, 7})
+        cursor.execute.assert_called_once_with(
+            item_reuse.COPY_ANALYSES_SQL, {"manifest_id": "manifest-1", "max_age_hours": 6.0}
+        )
+
+    def test_copies_point_to_the_original_analysis(self):
+        # A copy of a copy still points to the item the analysis was made for
+        self.assertIn("reused_from = COALESCE(source.reused_from, source.id)", item_reuse.COPY_ANALYSES_SQL)
+        self.assertNotIn("reused_from", item_reuse.REUSED_COLUMNS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import math
+import unittest
+from unittest import mock
+
+import local_pricing
+
+THRESHOLDS = (20.0, 0.1, 100)
+
+
+def segment_row(key, count, ratio, variance, demand="Medium", days=(14, 28)):
+    grouping = {0: 0b1111, 1: 0b0111, 2: 0b0011, 3: 0b0001, 4: 0b0000}[len(key)]
+    key = tuple(key) + (None,) * (4 - len(key))
+    return (grouping, *key, count, math.log(ratio), variance, demand, days[0], days[1])
+
+
+MODEL_ROWS = [
+    segment_row((), 1000, 0.30, 0.20),
+    segment_row(("Tools",), 300, 0.40, 0.05, demand="High"),
+    segment_row(("Tools", 1), 200, 0.45, 0.004, demand="High", days=(7, 14)),
+    segment_row(("Tools", 1, "New"), 150, 0.50, 0.002, demand="High", days=(7, 14)),
+    segment_row(("Tools", 1, "New", "dewalt"), 5, 0.90, 0.001),
+]
+
+
+class TestPricingModel(unittest.TestCase):
+    def test_shrinks_towards_parents(self):
+        model = local_pricing.PricingModel(MODEL_ROWS)
+        prediction = model.predict(50, "Tools", "New", "DeWalt")
+
+        self.assertEqual(model.size, 1000)
+        self.assertEqual(prediction["support"], 5)
+        # The 5-item brand segment moves the ratio only part of the way to 90%
+        self.assertGreater(prediction["ratio"], 0.50)
+        self.assertLess(prediction["ratio"], 0.65)
+        self.assertEqual(prediction["demand"], "High")
+        self.assertEqual(prediction["days"], (7, 14))
+
+    def test_unknown_segment_uses_history(self):
+        prediction = local_pricing.PricingModel(MODEL_ROWS).predict(5000, "Storage", None, None)
+        self.assertAlmostEqual(prediction["ratio"], 0.30)
+        self.assertEqual(prediction["support"], 1000)
+
+    def test_empty_history(self):
+        self.assertIsNone(local_pricing.PricingModel([]).predict(10, "Tools", "New", None))
+
+
+class TestPriceItem(unittest.TestCase):
+    def setUp(self):
+        self.model = local_pricing.PricingModel(MODEL_ROWS)
+
+    def test_low_value_item(self):
+        analysis = local_pricing.price_item(self.model, 5, 2, "Storage", None, None, THRESHOLDS)
+        self.assertAlmostEqual(analysis["estimatedSalePrice"], 1.5)
+        self.assertEqual(analysis["salesTime"], "2-4 weeks")
+        self.assertTrue(analysis["reasoning"].startswith("Local pricing model"))
+
+    def test_confident_segment(self):
+        analysis = local_pricing.price_item(self.model, 50, 10, "Tools", "New", None, THRESHOLDS)
+        self.assertIsNotNone(analysis)
+        self.assertEqual(analysis["demand"], "High")
+
+    def test_valuable_uncertain_item_needs_ai(self):
+        self.assertIsNone(local_pricing.price_item(self.model, 800, 1, "Storage", None, None, THRESHOLDS))
+
+    def test_not_enough_history(self):
+        self.assertIsNone(local_pricing.price_item(self.model, 5, 1, "Tools", None, None, (20.0, 0.1, 5000)))
+
+
+class TestTrainingSql(unittest.TestCase):
+    def test_history_excludes_copies(self):
+        history = local_pricing.TRAINING_SQL.split("FROM items", 1)[1].split(")\n    SELECT", 1)[0]
+
+        # Reused analyses keep priced_by = 'ai', the copy itself must not count again
+        self.assertIn("COALESCE(priced_by, 'ai') = 'ai'", history)
+        self.assertIn("reused_from IS NULL", history)
+
+
+class TestPricePendingItems(unittest.TestCase):
+    def setUp(self):
+        local_pricing._model = None
+
+    def tearDown(self):
+        local_pricing._model = None
+
+    def test_prices_and_saves(self):
+        cursor = mock.Mock()
+        cursor.fetchall.side_effect = [MODEL_ROWS, [(1, 5, 1, "Storage", None, None), (2, 800, 1, "Storage", None, None)]]
+
+        with mock.patch.object(local_pricing, "get_thresholds", return_value=THRESHOLDS):
+            priced = local_pricing.price_pending_items(cursor, "manifest-1")
+
+        self.assertEqual(priced, {1})
+        sql, updates = cursor.executemany.call_args.args
+        self.assertEqual(sql, local_pricing.SAVE_PRICE_SQL)
+        self.assertEqual(updates, [(1.5, 1.05, "Medium", "2-4 weeks", 14, 28, mock.ANY, 1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import base64
+import gzip
+import io
+import os
+import unittest
+import zipfile
+from unittest import mock
+
+import manifest_files
+
+CSV_TEXT = "SKU,Product Name,MSRP\nA1,Drill,99.00\n"
+
+
+def make_zip(members):
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return out.getvalue()
+
+
+class TestReadManifestFile(unittest.TestCase):
+    def test_is_binary_manifest(self):
+        self.assertTrue(manifest_files.is_binary_manifest("Manifest.CSV.GZ"))
+        self.assertTrue(manifest_files.is_binary_manifest("manifest.xlsx"))
+        self.assertFalse(manifest_files.is_binary_manifest("manifest.csv"))
+        self.assertFalse(manifest_files.is_binary_manifest(None))
+
+    def test_csv(self):
+        data = ("\ufeff" + CSV_TEXT).encode("utf-8")
+        self.assertEqual(manifest_files.read_manifest_file(data, "manifest.csv"), CSV_TEXT)
+
+    def test_gzip(self):
+        data = gzip.compress(CSV_TEXT.encode("utf-8"))
+        self.assertEqual(manifest_files.read_manifest_file(data, "manifest.csv.gz"), CSV_TEXT)
+
+    def test_zip_skips_metadata(self):
+        data = make_zip({"__MACOSX/._manifest.csv": b"junk", "docs/readme.pdf": b"pdf", "manifest.csv": CSV_TEXT})
+        self.assertEqual(manifest_files.read_manifest_file(data, "manifest.zip"), CSV_TEXT)
+
+    def test_zip_without_manifest(self):
+        with self.assertRaises(ValueError):
+            manifest_files.read_manifest_file(make_zip({"readme.pdf": b"pdf"}), "manifest.zip")
+
+    def test_corrupt_gzip(self):
+        with self.assertRaises(ValueError):
+            manifest_files.read_manifest_file(b"not gzip", "manifest.csv.gz")
+
+    def test_size_limit(self):
+        data = gzip.compress(b"x" * (2 * 1024 * 1024))
+        with mock.patch.dict(os.environ, {"MAX_MANIFEST_MB": "1"}):
+            with self.assertRaises(ValueError):
+                manifest_files.read_manifest_file(data, "manifest.csv.gz")
+
+    def test_base64_gzip(self):
+        encoded = base64.b64encode(gzip.compress(CSV_TEXT.encode("utf-8"))).decode("ascii")
+        self.assertEqual(manifest_files.read_manifest_base64(encoded, "manifest.csv.gz"), CSV_TEXT)
+
+    def test_base64_chunks(self):
+        text = "SKU,Title\n" + "".join(f"{i},Caf\u00e9 {i}\n" for i in range(50000))
+        encoded = base64.b64encode(text.encode("utf-8")).decode("ascii")
+        with mock.patch.object(manifest_files, "READ_CHUNK_BYTES", 999):
+            self.assertEqual(manifest_files.read_manifest_base64(encoded, "manifest.csv"), text)
+
+    def test_base64_invalid(self):
+        with self.assertRaises(ValueError):
+            manifest_files.read_manifest_base64("abc", "manifest.csv")
+
+    @unittest.skipUnless(manifest_files.get_openpyxl(), "openpyxl is not installed")
+    def test_xlsx(self):
+        workbook = manifest_files.get_openpyxl().Workbook()
+        sheet = workbook.active
+        sheet.append(["SKU", "Product Name", "MSRP"])
+        sheet.append([None, None, None])
+        sheet.append(["A1", "Drill", 99.0])
+        out = io.BytesIO()
+        workbook.save(out)
+        self.assertEqual(
+            manifest_files.read_manifest_file(out.getvalue(), "manifest.xlsx"),
+            "SKU,Product Name,MSRP\nA1,Drill,99.0\n",
+        )
+
+
+class TestEncoding(unittest.TestCase):
+    def test_detect_encoding(self):
+        self.assertEqual(manifest_files.detect_encoding(b"plain ascii"), "utf-8")
+        self.assertEqual(manifest_files.detect_encoding("caf\u00e9".encode("utf-8")[:-1]), "utf-8")
+        self.assertEqual(manifest_files.detect_encoding(b"\xef\xbb\xbfSKU"), "utf-8-sig")
+        self.assertEqual(manifest_files.detect_encoding(b"\xff\xfeS\x00"), "utf-16")
+        self.assertEqual(manifest_files.detect_encoding("caf\u00e9 \u2013".encode("cp1252")), "cp1252")
+        self.assertEqual(manifest_files.detect_encoding(b"caf\xe9 \x81 "), "latin-1")
+
+    def test_cp1252(self):
+        text = "Title,MSRP\nCaf\u00e9 \u2013 Table\u2122,10\n"
+        self.assertEqual(manifest_files.read_manifest_file(text.encode("cp1252"), "manifest.csv"), text)
+
+    def test_utf16(self):
+        self.assertEqual(manifest_files.read_manifest_file(CSV_TEXT.encode("utf-16"), "manifest.csv"), CSV_TEXT)
+
+    def test_cp1252_after_sample(self):
+        text = "Title,MSRP\n" + "Drill,10\n" * 20000 + "Caf\u00e9,12\n"
+        self.assertEqual(manifest_files.read_manifest_file(text.encode("cp1252"), "manifest.csv"), text)
+
+    def test_utf8_kept_before_invalid_byte(self):
+        utf8_part = "Title,MSRP\n" + "Drill,10\n" * 20000 + "Caf\u00e9 \u2013 Table,11\n"
+        data = utf8_part.encode("utf-8") + "Caf\u00e9,12\n".encode("cp1252")
+        self.assertEqual(manifest_files.read_manifest_file(data, "manifest.csv"), utf8_part + "Caf\u00e9,12\n")
+
+        data = b"\xef\xbb\xbf" + data
+        for chunk_bytes in (1, 3, 7):
+            with self.subTest(chunk_bytes=chunk_bytes), \
+                    mock.patch.object(manifest_files, "ENCODING_SAMPLE_BYTES", 16), \
+                    mock.patch.object(manifest_files, "READ_CHUNK_BYTES", chunk_bytes):
+                self.assertEqual(manifest_files.read_manifest_file(data[:40] + data[-150:], "manifest.csv"),
+                                 (data[3:40] + data[-150:-8]).decode("utf-8") + "Caf\u00e9,12\n")
@@ -0,0 +1,37 @@
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from unittest import mock
+
+import manifest_summary
+
+
+def row(grouping_set, month=None, category=None, demand=None, days=None, count=0, revenue=None,
+        quantity=None, msrp=None, created_at=None):
+    return (grouping_set, month, category, demand, days, count, revenue, quantity, msrp, created_at)
+
+
+class TestQueryManifestAggregates(unittest.TestCase):
+    def test_rows_by_grouping_set(self):
+        cursor = mock.Mock()
+        cursor.fetchall.return_value = [
+            row(manifest_summary.TIMELINE_SET, month=0, count=2, revenue=Decimal("30.00")),
+            row(manifest_summary.TIMELINE_SET, month=5, count=1, revenue=Decimal("12.50")),
+            row(manifest_summary.CATEGORY_SET, category="Other", count=1, created_at=datetime(2024, 1, 2)),
+            row(manifest_summary.CATEGORY_SET, category="Air Tools", count=2, created_at=datetime(2024, 1, 1)),
+            row(manifest_summary.DEMAND_SET, demand="High", count=2),
+            row(manifest_summary.SALES_DAYS_SET, days=28, quantity=7),
+            row(manifest_summary.SALES_DAYS_SET, days=None, quantity=1),
+            row(manifest_summary.TOTALS_SET, count=3, revenue=Decimal("42.50"), msrp=Decimal("300.00")),
+        ]
+
+        aggregates = manifest_summary.query_manifest_aggregates(cursor, "manifest-1")
+
+        cursor.execute.assert_called_once_with(manifest_summary.MANIFEST_AGGREGATES_SQL, ("manifest-1",))
+        self.assertEqual(aggregates["revenue_timeline"], [30.0, 0, 0, 0, 0, 12.5, 0, 0, 0, 0, 0, 0])
+        self.assertEqual(aggregates["categories"], [("Air Tools", 2), ("Other", 1)])
+        self.assertEqual(aggregates["demand"], {"High": 2})
+        self.assertEqual(aggregates["units_by_days"], [{"sales_days_max": 28, "quantity": 7}])
+        self.assertEqual(aggregates["total_items"], 3)
+        self.assertEqual(aggregates["total_msrp"], 300.0)
+        self.assertEqual(aggregates["total_revenue"], 42.5)
@@ -0,0 +1,69 @@
+import unittest
+
+import normalization
+
+
+class TestNormalizeText(unittest.TestCase):
+    def test_normalize_text(self):
+        self.assertEqual(
+            normalization.normalize_text("  <b>DAYTON</b>\t1/2 HP  Motor® (115V) "),
+            "DAYTON 1/2 HP Motor (115V)",
+        )
+
+    def test_normalize_text_empty(self):
+        self.assertEqual(normalization.normalize_text(None), "")
+        self.assertEqual(normalization.normalize_text(""), "")
+
+
+class TestExtractModelNumber(unittest.TestCase):
+    def test_extract_model_number(self):
+        self.assertEqual(normalization.extract_model_number("HP-2550 Printer"), "HP-2550")
+        self.assertEqual(normalization.extract_model_number("AMD 5600X CPU"), "5600X")
+
+    def test_extract_model_number_not_found(self):
+        self.assertIsNone(normalization.extract_model_number("Safety Glasses"))
+        self.assertIsNone(normalization.extract_model_number(None))
+
+
+class TestParsePrice(unittest.TestCase):
+    def test_parse_price(self):
+        self.assertEqual(normalization.parse_price("$1,234.56"), 1234.56)
+        self.assertEqual(normalization.parse_price(" 12.5 "), 12.5)
+        self.assertEqual(normalization.parse_price(7), 7.0)
+
+    def test_parse_price_invalid(self):
+        self.assertIsNone(normalization.parse_price(""))
+        self.assertIsNone(normalization.parse_price("N/A"))
+        self.assertIsNone(normalization.parse_price("1.2.3"))
+        self.assertIsNone(normalization.parse_price(None))
+
+
+class TestParseQuantity(unittest.TestCase):
+    def test_parse_quantity(self):
+        self.assertEqual(normalization.parse_quantity("12"), 12)
+        self.assertEqual(normalization.parse_quantity("3 ea"), 3)
+
+    def test_parse_quantity_invalid(self):
+        self.assertIsNone(normalization.parse_quantity("N/A"))
+        self.assertIsNone(normalization.parse_quantity(None))
+
+
+class TestParseSalesDays(unittest.TestCase):
+    def test_parse_sales_days(self):
+        self.assertEqual(normalization.parse_sales_days("2-4 weeks"), (14, 28))
+        self.assertEqual(normalization.parse_sales_days("1-3 Months"), (30, 90))
+        self.assertEqual(normalization.parse_sales_days("10 days"), (10, 10))
+
+    def test_parse_sales_days_unknown(self):
+        self.assertIsNone(normalization.parse_sales_days("N/A"))
+        self.assertIsNone(normalization.parse_sales_days("a few weeks"))
+        self.assertIsNone(normalization.parse_sales_days(None))
+
+    def test_format_sales_days(self):
+        self.assertEqual(normalization.format_sales_days(14, 28), "2-4 weeks")
+        self.assertEqual(normalization.format_sales_days(30, 90), "1-3 months")
+        self.assertEqual(normalization.format_sales_days(3, 10), "3-10 days")
+        self.assertEqual(normalization.format_sales_days(0.4, 0.6), "1 day")
+        for days in ((14, 28), (30, 90), (3, 10), (45, 60)):
+            parsed = normalization.parse_sales_days(normalization.format_sales_days(*days))
+            self.assertLessEqual(abs(parsed[1] - days[1]), 7)
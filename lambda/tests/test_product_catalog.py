@@ -0,0 +1,172 @@
+import os
+import sys
+import unittest
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from unittest import mock
+
+import product_catalog
+
+
+COLUMNS = ("asin", "upc", "model", "normalized_title", "title", "brand", "category",
+           "list_price", "current_market_price", "image_url", "features", "field_updated_at")
+
+
+def catalog_row(asin, **fields):
+    row = dict.fromkeys(COLUMNS)
+    row.update(asin=asin, field_updated_at={})
+    row.update(fields)
+    return row
+
+
+class CatalogTestCase(unittest.TestCase):
+    def setUp(self):
+        for name, value in (("_catalog_cache", OrderedDict()), ("_miss_cache", OrderedDict()),
+                            ("_pending_writes", []), ("_pending_misses", [])):
+            patcher = mock.patch.object(product_catalog, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.cursor = mock.Mock()
+        self.cursor.description = [(column,) for column in COLUMNS]
+        self.cursor.fetchall.return_value = []
+        conn = mock.Mock()
+        conn.cursor.return_value = self.cursor
+        csv_processor = mock.Mock(get_db_connection=mock.Mock(return_value=conn))
+        patcher = mock.patch.dict(sys.modules, {"csv_processor": csv_processor})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TestGetLookupKeys(unittest.TestCase):
+    def test_priority(self):
+        raw_item = {"asin": "B000123", "upc": "0-12345-67890-5", "model": "DCD771C2", "title": "DeWalt Drill!"}
+
+        self.assertEqual(product_catalog.get_lookup_keys(raw_item), [
+            ("asin", "B000123"),
+            ("upc", "012345678905"),
+            ("model", "DCD771C2"),
+            ("normalized_title", "dewalt drill"),
+        ])
+
+    def test_missing_keys_skipped(self):
+        raw_item = {"upc": "123", "title": "Safety Glasses"}
+
+        self.assertEqual(product_catalog.get_lookup_keys(raw_item), [("normalized_title", "safety glasses")])
+
+
+class TestPrefetchProducts(CatalogTestCase):
+    def test_one_query_for_all_items(self):
+        self.cursor.fetchall.side_effect = [[tuple(catalog_row("B1", upc="012345678905").values())], []]
+        raw_items = [{"upc": "012345678905", "title": "Drill"}, {"asin": "B2", "title": "Saw"}]
+
+        product_catalog.prefetch_products(raw_items)
+
+        self.assertEqual(self.cursor.execute.call_count, 2)  # products, lookup misses
+        asins, upcs, models, titles = self.cursor.execute.call_args_list[0].args[1]
+        self.assertEqual(asins, ["B2"])
+        self.assertEqual(upcs, ["012345678905"])
+        self.assertEqual(sorted(titles), ["drill", "saw"])
+        self.assertEqual(product_catalog.lookup_product({"upc": "012345678905"})["asin"], "B1")
+
+    def test_given_lookup_keys_used(self):
+        raw_items = [{"title": "Milwaukee HD-2550 Hammer Drill"}]
+        lookup_keys = [product_catalog.get_lookup_keys(raw_items[0])]
+
+        with mock.patch.object(product_catalog, "get_lookup_keys") as get_lookup_keys:
+            product_catalog.prefetch_products(raw_items, lookup_keys)
+            product_catalog.lookup_product(raw_items[0], lookup_keys[0])
+
+        get_lookup_keys.assert_not_called()
+        asins, upcs, models, titles = self.cursor.execute.call_args_list[0].args[1]
+        self.assertEqual((models, titles), (["HD-2550"], ["milwaukee hd 2550 hammer drill"]))
+
+    def test_cached_keys_not_queried(self):
+        product_catalog._cache_row(catalog_row("B1", normalized_title="drill"))
+
+        product_catalog.prefetch_products([{"asin": "B1", "title": "Drill"}])
+
+        self.cursor.execute.assert_not_called()
+
+
+class TestCacheRow(CatalogTestCase):
+    def test_first_row_kept_without_replace(self):
+        product_catalog._cache_row(catalog_row("B1", model="M1", title="First"))
+        product_catalog._cache_row(catalog_row("B2", model="M1", title="Second"))
+
+        self.assertEqual(product_catalog._cache_get(("model", "M1"))["title"], "First")
+
+    def test_replace_merges_fields(self):
+        product_catalog._cache_row(catalog_row("B1", model="M1", title="Drill", brand="DeWalt",
+                                               field_updated_at={"title": "2026-01-01T00:00:00"}))
+        product_catalog._cache_row(catalog_row("B1", model="M1", title=None, list_price=99.0,
+                                               field_updated_at={"list_price": "2026-02-01T00:00:00"}), replace=True)
+
+        row = product_catalog._cache_get(("model", "M1"))
+        self.assertEqual((row["title"], row["brand"], row["list_price"]), ("Drill", "DeWalt", 99.0))
+        self.assertEqual(row["field_updated_at"],
+                         {"title": "2026-01-01T00:00:00", "list_price": "2026-02-01T00:00:00"})
+        self.assertIs(product_catalog._cache_get(("asin", "B1")), row)
+
+    def test_least_recently_used_keys_evicted(self):
+        with mock.patch.dict(os.environ, {"CATALOG_CACHE_MAX_KEYS": "2"}):
+            product_catalog._cache_row(catalog_row("B1"))
+            product_catalog._cache_row(catalog_row("B2"))
+            product_catalog._cache_get(("asin", "B1"))
+            product_catalog._cache_row(catalog_row("B3"))
+
+        self.assertEqual(list(product_catalog._catalog_cache), [("asin", "B1"), ("asin", "B3")])
+
+
+class TestLookupMisses(CatalogTestCase):
+    def test_miss_known_within_ttl(self):
+        product_catalog.record_miss("amazon_upc", "012345678905")
+
+        self.assertTrue(product_catalog.is_known_miss("amazon_upc", "012345678905"))
+        self.assertFalse(product_catalog.is_known_miss("upc_database", "012345678905"))
+        self.assertFalse(product_catalog.is_known_miss("amazon_upc", None))
+
+    def test_miss_expires(self):
+        product_catalog._miss_cache[("amazon_upc", "012345678905")] = datetime.utcnow() - timedelta(days=8)
+        product_catalog._miss_cache[("amazon_upc", "012345678912")] = datetime.utcnow() - timedelta(days=8)
+
+        with mock.patch.dict(os.environ, {"CATALOG_MISS_TTL_DAYS": "10"}):
+            self.assertTrue(product_catalog.is_known_miss("amazon_upc", "012345678905"))
+        self.assertFalse(product_catalog.is_known_miss("amazon_upc", "012345678905"))
+        # Expired misses are dropped from the cache
+        self.assertEqual(list(product_catalog._miss_cache), [("amazon_upc", "012345678912")])
+
+    def test_oldest_misses_evicted(self):
+        with mock.patch.dict(os.environ, {"CATALOG_MISS_CACHE_MAX_KEYS": "2"}):
+            for key in ("a", "b", "a", "c"):
+                product_catalog.record_miss("amazon_search", key)
+
+        self.assertEqual(list(product_catalog._miss_cache), [("amazon_search", "a"), ("amazon_search", "c")])
+        self.assertEqual(len(product_catalog._pending_misses), 4)
+
+    def test_prefetch_loads_recent_misses(self):
+        missed_at = datetime.utcnow()
+        self.cursor.fetchall.side_effect = [[], [("amazon_search", "drill", missed_at)]]
+
+        product_catalog.prefetch_products([{"title": "Drill"}])
+
+        lookup_keys, since = self.cursor.execute.call_args_list[1].args[1]
+        self.assertEqual(lookup_keys, ["drill"])
+        self.assertAlmostEqual((missed_at - since).total_seconds(), timedelta(days=7).total_seconds(), delta=60)
+        self.assertTrue(product_catalog.is_known_miss("amazon_search", "drill"))
+
+    def test_repeated_miss_upserted(self):
+        product_catalog.record_miss("amazon_upc", "012345678905")
+        product_catalog.record_miss("amazon_upc", "012345678905")
+
+        product_catalog.flush_products()
+
+        query, misses = self.cursor.executemany.call_args.args
+        self.assertIn("ON CONFLICT (source, lookup_key) DO UPDATE", query)
+        self.assertIn("miss_count = lookup_misses.miss_count + 1", query)
+        self.assertEqual([miss[:2] for miss in misses], [("amazon_upc", "012345678905")] * 2)
+        self.assertEqual(product_catalog._pending_misses, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
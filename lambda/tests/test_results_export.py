@@ -0,0 +1,99 @@
+import csv
+import io
+import os
+import sys
+import unittest
+from unittest import mock
+
+import results_export
+
+
+def make_s3():
+    s3 = mock.Mock()
+    s3.create_multipart_upload.return_value = {"UploadId": "upload-1"}
+    s3.upload_part.side_effect = lambda **kwargs: {"ETag": f"etag-{kwargs['PartNumber']}"}
+    return s3
+
+
+class TestS3MultipartWriter(unittest.TestCase):
+    def test_parts(self):
+        s3 = make_s3()
+        with mock.patch.object(results_export, "get_s3_client", return_value=s3), \
+                mock.patch.object(results_export, "EXPORT_PART_BYTES", 10):
+            writer = results_export.S3MultipartWriter("bucket", "exports/1/a.csv", "text/csv")
+            writer.write(b"0123456789ab")
+            writer.write(b"cd")
+            writer.complete()
+
+        bodies = [call.kwargs["Body"] for call in s3.upload_part.call_args_list]
+        self.assertEqual(bodies, [b"0123456789ab", b"cd"])
+        self.assertEqual(writer.size, 14)
+        s3.complete_multipart_upload.assert_called_once_with(
+            Bucket="bucket", Key="exports/1/a.csv", UploadId="upload-1",
+            MultipartUpload={"Parts": [{"PartNumber": 1, "ETag": "etag-1"}, {"PartNumber": 2, "ETag": "etag-2"}]},
+        )
+
+    def test_empty_export_uploads_one_part(self):
+        s3 = make_s3()
+        with mock.patch.object(results_export, "get_s3_client", return_value=s3):
+            results_export.S3MultipartWriter("bucket", "key", "text/csv").complete()
+
+        self.assertEqual(s3.upload_part.call_count, 1)
+
+
+class TestIterRowBatches(unittest.TestCase):
+    def test_batches(self):
+        rows = ((i,) for i in range(7))
+        with mock.patch.object(results_export, "EXPORT_BATCH_ROWS", 3):
+            batches = list(results_export.iter_row_batches(rows))
+
+        self.assertEqual([len(batch) for batch in batches], [3, 3, 1])
+        self.assertEqual(batches[2], [(6,)])
+
+
+class TestWriteCsv(unittest.TestCase):
+    def test_batches(self):
+        out = io.BytesIO()
+        width = len(results_export.EXPORT_COLUMNS)
+        batches = [[("A1", "Café, \"Drill\"") + (None,) * (width - 2)], [("A2", "Saw") + (1,) * (width - 2)]]
+
+        self.assertEqual(results_export.write_csv(iter(batches), out), 2)
+
+        data = out.getvalue()
+        self.assertTrue(data.startswith(b"\xef\xbb\xbf"))
+        rows = list(csv.reader(io.StringIO(data.decode("utf-8-sig"))))
+        self.assertEqual(rows[0], [name for name, _, _ in results_export.EXPORT_COLUMNS])
+        self.assertEqual(rows[1][:3], ["A1", "Café, \"Drill\"", ""])
+        self.assertEqual(rows[2][:3], ["A2", "Saw", "1"])
+
+
+class TestExportUploadResults(unittest.TestCase):
+    def test_unsupported_format(self):
+        with self.assertRaises(ValueError):
+            results_export.export_upload_results("upload-1", "xlsx")
+
+    def test_too_many_items(self):
+        cursor = mock.Mock()
+        cursor.fetchone.return_value = (7, "manifest.csv", 11)
+        conn = mock.Mock()
+        conn.cursor.return_value = cursor
+        s3 = make_s3()
+        csv_processor = mock.Mock(get_db_connection=mock.Mock(return_value=conn))
+
+        with mock.patch.dict(sys.modules, {"csv_processor": csv_processor}), \
+                mock.patch.dict(os.environ, {"EXPORT_MAX_ROWS": "10"}), \
+                mock.patch.object(results_export, "get_s3_client", return_value=s3):
+            with self.assertRaises(results_export.ExportTooLarge):
+                results_export.export_upload_results("upload-1")
+
+        s3.create_multipart_upload.assert_not_called()
+        conn.close.assert_called_once_with()
+
+    def test_parquet_without_pyarrow(self):
+        with mock.patch.object(results_export, "get_pyarrow", return_value=None):
+            with self.assertRaises(ValueError):
+                results_export.export_upload_results("upload-1", "parquet")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+from unittest import mock
+
+from amazon_paapi import sdk
+from amazon_paapi.sdk import models
+from amazon_paapi.sdk.api_client import ApiClient
+from amazon_paapi.sdk.models.get_items_request import GetItemsRequest
+
+
+class TestSdkLazyImports(unittest.TestCase):
+    def test_models_attribute(self):
+        self.assertIs(models.GetItemsRequest, GetItemsRequest)
+        self.assertIs(sdk.GetItemsRequest, GetItemsRequest)
+
+    def test_models_dir(self):
+        self.assertIn("WebsiteSalesRank", dir(models))
+        self.assertIn("DefaultApi", dir(sdk))
+
+    def test_models_unknown_attribute(self):
+        with self.assertRaises(AttributeError):
+            models.UnknownModel  # noqa: B018
+
+        with self.assertRaises(AttributeError):
+            sdk.UnknownModel  # noqa: B018
+
+
+class TestApiClientPool(unittest.TestCase):
+    def tearDown(self):
+        ApiClient.close_pool()
+
+    def test_pool_not_created_for_sync_clients(self):
+        ApiClient("key", "secret", "host", "region")
+        self.assertIsNone(ApiClient._pool)
+
+    def test_pool_shared_between_clients(self):
+        first = ApiClient("key", "secret", "host", "region")
+        second = ApiClient("key", "secret", "host", "region")
+        self.assertIs(first.pool, second.pool)
+
+    @mock.patch.object(ApiClient, "_ApiClient__call_api", return_value="foo")
+    def test_async_request(self, mocked_call_api):
+        client = ApiClient("key", "secret", "host", "region")
+        thread = client.call_api("/path", "POST", "api", async_req=True)
+        self.assertEqual(thread.get(), "foo")
+
+    def test_context_manager_closes_pool(self):
+        with ApiClient("key", "secret", "host", "region") as client:
+            pool = client.pool
+
+        self.assertIsNone(ApiClient._pool)
+        self.assertIsNot(client.pool, pool)
@@ -0,0 +1,164 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+import similarity_index
+from similarity_index import SimilarityIndex
+
+
+def entry(item_id, title, msrp=100.0, price=40.0, condition="New"):
+    return [item_id, title, msrp, price, "Medium", "2-4 weeks", condition]
+
+
+ENTRIES = [
+    entry(1, "DAYTON 1/2 HP Motor 115V 3450 RPM"),
+    entry(2, "DAYTON 1/2 HP Motor 230V 1725 RPM"),
+    entry(3, "Milwaukee M18 Drill Driver Kit"),
+    entry(4, "Fluke 117 Digital Multimeter"),
+]
+
+
+class TestSimilarityIndex(unittest.TestCase):
+    def test_search(self):
+        index = SimilarityIndex(ENTRIES)
+
+        results = index.search("dayton motor 1/2 hp 115v 3450 rpm", k=2)
+
+        self.assertEqual([found[0] for _, found in results], [1, 2])
+        self.assertAlmostEqual(results[0][0], 1.0)
+        self.assertLess(results[1][0], results[0][0])
+
+    def test_no_match(self):
+        self.assertEqual(SimilarityIndex(ENTRIES).search("Nitrile Gloves"), [])
+        self.assertEqual(SimilarityIndex().search("Motor"), [])
+
+    def test_common_tokens_only_score_candidates(self):
+        entries = [entry(i, f"Widget {i}") for i in range(300)] + [entry(999, "Widget Gizmo")]
+        index = SimilarityIndex(entries)
+
+        results = index.search("widget gizmo", k=3)
+
+        self.assertEqual(results[0][1][0], 999)
+        self.assertEqual(len(results), 1)
+
+    def test_add_updates_existing_item(self):
+        index = SimilarityIndex(ENTRIES)
+        index.add([entry(4, "Fluke 117 Digital Multimeter", price=55.0)])
+
+        self.assertEqual(len(index), 4)
+        self.assertEqual(index.search("Fluke 117")[0][1][3], 55.0)
+
+    def test_serialization(self):
+        index = SimilarityIndex(ENTRIES, (datetime(2026, 5, 1, 12, 30), 4))
+
+        loaded = SimilarityIndex.from_bytes(index.to_bytes())
+
+        self.assertEqual(loaded.entries, index.entries)
+        self.assertEqual(loaded.watermark, index.watermark)
+        self.assertEqual(loaded.search("Milwaukee drill")[0][1][0], 3)
+
+
+class TestRefreshIndex(unittest.TestCase):
+    def test_adds_rows_and_moves_watermark(self):
+        analyzed_at = datetime(2026, 5, 1)
+        index = SimilarityIndex()
+        self.assertEqual(similarity_index.refresh_params(index), (datetime(1969, 12, 31, 23, 45),))
+
+        rows = (tuple(found) + (analyzed_at,) for found in ENTRIES[:3])
+        self.assertEqual(similarity_index.refresh_index(index, rows), 3)
+
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.entries[0], ENTRIES[0])
+        self.assertEqual(index.watermark, (analyzed_at, 3))
+        self.assertEqual(similarity_index.refresh_params(index), (analyzed_at - timedelta(minutes=15),))
+
+    def test_late_commit_before_watermark(self):
+        index = SimilarityIndex([ENTRIES[0]], (datetime(2026, 5, 1, 12, 0), 1))
+        # Item 4 started analyzing before item 1 but committed after the last refresh
+        rows = [tuple(ENTRIES[3]) + (datetime(2026, 5, 1, 11, 55),),
+                tuple(ENTRIES[0]) + (datetime(2026, 5, 1, 12, 0),)]
+
+        self.assertEqual(similarity_index.refresh_index(index, rows), 1)
+
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.search("Fluke multimeter")[0][1][0], 4)
+        self.assertEqual(index.watermark, (datetime(2026, 5, 1, 12, 0), 1))
+
+
+class TestGetIndex(unittest.TestCase):
+    def test_no_refresh_within_interval(self):
+        loaded = SimilarityIndex(ENTRIES)
+        with mock.patch.object(similarity_index, "_index", loaded), \
+                mock.patch.object(similarity_index, "_refreshed_at", datetime.now()), \
+                mock.patch.object(similarity_index, "refresh_index") as refresh_index:
+            self.assertIs(similarity_index.get_index(), loaded)
+
+        refresh_index.assert_not_called()
+
+
+class TestLoadIndex(unittest.TestCase):
+    def test_local_copy_first(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "index.json.gz")
+            with open(path, "wb") as index_file:
+                index_file.write(SimilarityIndex(ENTRIES).to_bytes())
+            s3 = mock.Mock()
+
+            with mock.patch.dict(os.environ, {"SIMILARITY_INDEX_PATH": path}), \
+                    mock.patch.object(similarity_index, "get_s3_client", return_value=s3):
+                index = similarity_index.load_index()
+
+        self.assertEqual(len(index), 4)
+        s3.get_object.assert_not_called()
+
+    def test_empty_index_without_stored_copy(self):
+        with tempfile.TemporaryDirectory() as directory:
+            s3 = mock.Mock()
+            s3.get_object.side_effect = Exception("NoSuchKey")
+
+            with mock.patch.dict(os.environ, {"SIMILARITY_INDEX_PATH": os.path.join(directory, "missing.gz")}), \
+                    mock.patch.object(similarity_index, "get_s3_client", return_value=s3):
+                index = similarity_index.load_index()
+
+        self.assertEqual(len(index), 0)
+
+
+def similar(similarity, msrp=100.0, price=40.0, condition="New"):
+    return {"similarity": similarity, "item_id": 7, "title": "DAYTON 1/2 HP Motor", "msrp": msrp,
+            "estimatedSalePrice": price, "demand": "High", "salesTime": "1-2 weeks", "condition": condition}
+
+
+class TestPriceNearDuplicate(unittest.TestCase):
+    def test_scales_price_by_msrp(self):
+        analysis = similarity_index.price_near_duplicate({"msrp": 105.0, "condition": "new "}, [similar(0.95)])
+
+        self.assertEqual(analysis["estimatedSalePrice"], 42.0)
+        self.assertEqual(analysis["demand"], "High")
+        self.assertEqual(analysis["pricedBy"], "similar")
+
+    def test_condition_must_match(self):
+        item = {"msrp": 100.0, "condition": "Used - Damaged"}
+        self.assertIsNone(similarity_index.price_near_duplicate(item, [similar(0.99)]))
+        self.assertIsNone(similarity_index.price_near_duplicate({"msrp": 100.0}, [similar(0.99)]))
+        self.assertIsNotNone(similarity_index.price_near_duplicate({"msrp": 100.0}, [similar(0.99, condition="Unknown")]))
+
+    def test_not_similar_enough(self):
+        self.assertIsNone(similarity_index.price_near_duplicate({"msrp": 100.0}, [similar(0.8)]))
+        self.assertIsNone(similarity_index.price_near_duplicate({"msrp": 100.0}, []))
+
+    def test_msrp_too_different(self):
+        self.assertIsNone(similarity_index.price_near_duplicate({"msrp": 150.0, "condition": "New"}, [similar(0.99)]))
+        self.assertIsNone(similarity_index.price_near_duplicate({"msrp": 0, "condition": "New"}, [similar(0.99)]))
+        self.assertIsNone(similarity_index.price_near_duplicate({"msrp": 100.0, "condition": "New"}, [similar(0.99, msrp=None)]))
+
+
+class TestFindSimilarItems(unittest.TestCase):
+    def test_disabled(self):
+        with mock.patch.dict(os.environ, {"ENABLE_SIMILARITY_INDEX": "false"}):
+            self.assertEqual(similarity_index.find_similar_items("Motor"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+
+import title_classifier
+
+
+def legacy_classify(title, categories, default):
+    title = title.lower()
+    for category, keywords in categories:
+        if any(keyword in title for keyword in keywords):
+            return category
+    return default
+
+
+TITLES = [
+    "DAYTON 1/2 HP Motor",
+    "Speedaire Air Compressor",
+    "Wall Cabinet, Steel",
+    "Bottle Jack 12 Ton",
+    "Pressure Washer 3000 PSI",
+    "Office Chair",
+    "Drum Pump\nStainless",
+    "vacuumotor assembly",
+    "",
+    None,
+]
+
+
+class TestTitleClassifier(unittest.TestCase):
+    def test_matches_keyword_chains(self):
+        for field, (categories, default) in title_classifier.TAXONOMIES.items():
+            self.assertEqual(
+                title_classifier.classify_titles(TITLES, field),
+                [legacy_classify(title or "", categories, default) for title in TITLES],
+            )
+
+    def test_first_category_wins(self):
+        self.assertEqual(title_classifier.classify_titles(["Cabinet Fan"], "title_category"), ["Motors & Pumps"])
+        self.assertEqual(title_classifier.classify_titles(["Office Chair"], "price_category"), ["Climate Control"])
+
+    def test_empty(self):
+        self.assertEqual(title_classifier.classify_titles([], "title_category"), [])
+
+    def test_classify_items_keeps_stored(self):
+        items = [{"title": "Motor", "title_category": "Other"}, {"title": "Shop Vacuum"}]
+        title_classifier.classify_items(items)
+        self.assertEqual([item["title_category"] for item in items], ["Other", "Air Tools"])
+        self.assertEqual([item["price_category"] for item in items], ["Motors & Blowers", "Power Equipment"])
+
+    def test_get_price_category(self):
+        self.assertEqual(title_classifier.get_price_category({"title": "Band Saw"}), "Tools")
+        self.assertEqual(title_classifier.get_price_category({"title": "Band Saw", "price_category": "General"}), "General")
@@ -0,0 +1,146 @@
+"""
+Title Classifier Module
+
+Keyword classification of item titles, shared by chart generation and mock pricing.
+Each taxonomy is an ordered list of (category, keywords): a title belongs to the first
+category with a keyword in its lowercased title (substring match), like the original
+any(keyword in title) chains. A whole manifest is classified at once: the titles are
+joined into one text and each keyword is searched once in it (keywords shared by the
+taxonomies only once), instead of every keyword in every title.
+
+Categories are computed once when items are inserted and stored on the item row
+(items.title_category and items.price_category).
+"""
+
+import re
+from bisect import bisect_right
+from functools import partial
+from itertools import accumulate
+
+# Chart category breakdown (generate_charts)
+CHART_CATEGORIES = [
+    ('Air Tools', ['compressor', 'vacuum', 'pressure']),
+    ('Motors & Pumps', ['motor', 'pump', 'fan']),
+    ('Storage & Enclosures', ['cabinet', 'storage', 'enclosure']),
+    ('Lifting Equipment', ['jack', 'lift', 'crane']),
+]
+CHART_DEFAULT = 'Other'
+
+# Liquidation pricing groups (analyze_item_mock)
+PRICE_CATEGORIES = [
+    ('Power Equipment', ['compressor', 'vacuum', 'pressure washer', 'generator']),
+    ('Motors & Blowers', ['motor', 'pump', 'fan', 'blower']),
+    ('Storage', ['cabinet', 'storage', 'enclosure', 'box']),
+    ('Tools', ['tool', 'drill', 'saw', 'grinder']),
+    ('Climate Control', ['heater', 'cooler', 'air', 'ventilation']),
+    ('Tanks & Containers', ['tank', 'drum', 'container', 'barrel']),
+]
+PRICE_DEFAULT = 'General'
+
+TAXONOMIES = {
+    'title_category': (CHART_CATEGORIES, CHART_DEFAULT),
+    'price_category': (PRICE_CATEGORIES, PRICE_DEFAULT),
+}
+
+# Compiled keyword patterns (literal patterns use a fast substring search)
+KEYWORD_PATTERNS = {
+    keyword: re.compile(re.escape(keyword))
+    for categories, _ in TAXONOMIES.values()
+    for _, keywords in categories
+    for keyword in keywords
+}
+
+class TitleIndex:
+    """Titles of a manifest joined into one lowercased text, searched once per keyword"""
+
+    def __init__(self, titles):
+        # Keywords have no newline, so no match spans two titles
+        lines = [(title or '').lower().replace('\n', ' ') for title in titles]
+        self.text = '\n'.join(lines)
+        self.size = len(lines)
+        # Title of a text position = number of title starts at or before it, minus one
+        starts = list(accumulate(map(len, lines), lambda start, length: start + length + 1, initial=0))
+        self.locate = partial(bisect_right, starts)
+        self.matches = {}
+
+    def titles_with(self, keyword):
+        """Get the (1-based) indexes of the titles containing a keyword"""
+        if keyword not in self.matches:
+            positions = [match.start() for match in KEYWORD_PATTERNS[keyword].finditer(self.text)]
+            self.matches[keyword] = list(map(self.locate, positions))
+        return self.matches[keyword]
+
+    def classify(self, categories, default):
+        """
+        Classify every title of the index
+
+        Args:
+            categories: ordered list of (category, keywords)
+            default: category of titles without a keyword
+
+        Returns:
+            list of category names, in title order
+        """
+        # Lowest ranked categories last, so they overwrite the others
+        ranks = {}
+        for rank in range(len(categories) - 1, -1, -1):
+            for keyword in categories[rank][1]:
+                ranks.update(dict.fromkeys(self.titles_with(keyword), rank))
+
+        names = [name for name, _ in categories] + [default]
+        default_rank = len(categories)
+        return [names[ranks.get(index, default_rank)] for index in range(1, self.size + 1)]
+
+def classify_titles(titles, field):
+    """
+    Classify titles in one of the taxonomies
+
+    Args:
+        titles: list of titles (None for no title)
+        field: taxonomy, 'title_category' (charts) or 'price_category' (pricing)
+
+    Returns:
+        list of category names, in the same order
+    """
+    return TitleIndex(titles).classify(*TAXONOMIES[field]) if titles else []
+
+def classify_stored(items, fields):
+    """
+    Get the stored categories of items, classifying the ones without them at once
+
+    Returns:
+        {field: list of category names, in item order}
+    """
+    result = {field: [item.get(field) for item in items] for field in fields}
+    missing = sorted({index for categories in result.values() for index, category in enumerate(categories) if not category})
+    if missing:
+        index = TitleIndex([items[position].get('title') for position in missing])
+        for field, categories in result.items():
+            for position, category in zip(missing, index.classify(*TAXONOMIES[field])):
+                categories[position] = categories[position] or category
+
+    return result
+
+def classify_items(items):
+    """
+    Set title_category and price_category on items, classifying the whole manifest at once
+
+    Args:
+        items: list of item dicts (modified in place)
+
+    Returns:
+        the same items
+    """
+    for field, categories in classify_stored(items, TAXONOMIES).items():
+        for item, category in zip(items, categories):
+            item[field] = category
+
+    return items
+
+def get_title_categories(items):
+    """Get the chart category of each item (stored or classified from its title)"""
+    return classify_stored(items, ['title_category'])['title_category']
+
+def get_price_category(item):
+    """Get the pricing category of an item (stored or classified from its title)"""
+    return item.get('price_category') or classify_titles([item.get('title')], 'price_category')[0]